@@ -0,0 +1,40 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+# ------------------------------------------------------------------------------
+import argparse
+import os
+import time
+
+import numpy as np
+
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import array_payloads
+
+
+if __name__ == '__main__':
+    '''
+        Compares decoding the text of an inline ARRAY node at once with decoding
+        it in chunks by worker threads (array_payloads.decode_text_array)
+
+        e.g. python benchmark_text_array_decoding.py --rows 2000 --columns 2000 --workers 8
+    '''
+    arguments_parser = argparse.ArgumentParser()
+    arguments_parser.add_argument('--rows', type=int, default=2000)
+    arguments_parser.add_argument('--columns', type=int, default=2000)
+    arguments_parser.add_argument('--workers', type=int, default=os.cpu_count())
+    arguments = arguments_parser.parse_args()
+
+    values = np.random.default_rng(0).random((arguments.rows, arguments.columns))
+    # one row per line, comma-separated values
+    text = ',\n'.join(', '.join(str(value) for value in row) for row in values)
+    print('text: {:.1f} MB, workers: {}'.format(len(text) / 2 ** 20, arguments.workers))
+
+    for label, chunk_size in (('at once', len(text) + 1),
+                              ('chunks', array_payloads.TEXT_ARRAY_CHUNK_SIZE)):
+        start = time.perf_counter()
+        array = array_payloads.decode_text_array(text, sep=',', shape=values.shape,
+                                                 chunk_size=chunk_size, max_workers=arguments.workers)
+        elapsed = time.perf_counter() - start
+        assert np.array_equal(array, values)
+        print('{:<8} {:6.2f} s'.format(label, elapsed))
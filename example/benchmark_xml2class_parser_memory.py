@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+# ------------------------------------------------------------------------------
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml2class_parser import Xml2ClassParser
+
+
+def write_parameters_xml(xml_path_filename, arrays_count, array_length):
+    """
+        Writes a scientific parameters XML file containing inline ARRAY nodes
+        grouped into models, as the ones loaded by Xml2ClassParser
+    """
+    values_text = ' '.join(str(value) for value in np.random.default_rng(0).random(array_length))
+    with open(xml_path_filename, 'w') as xml_file:
+        xml_file.write('<parameters>\n')
+        for model_index in range(arrays_count // 2):
+            xml_file.write('<model_{0} model="model_{0}">\n'.format(model_index))
+            xml_file.write('<weights datatype="ARRAY" sep=" ">{}</weights>\n'.format(values_text))
+            xml_file.write('<delays datatype="ARRAY" sep=" ">{}</delays>\n'.format(values_text))
+            xml_file.write('<threshold datatype="FLOAT">-55.0</threshold>\n')
+            xml_file.write('</model_{}>\n'.format(model_index))
+        xml_file.write('</parameters>\n')
+
+
+class Xml2ClassParserKeepingWholeTree(Xml2ClassParser):
+    """
+        Reference: the same parser without releasing the processed elements,
+        i.e. the whole XML tree remains in memory until the parsing ends
+    """
+
+    def _Xml2ClassParser__iterparse_releasing_elements(self, source):
+        # NOTE: overrides the private method, which Xml2ClassParser calls through its mangled name
+        return iterparse(source=source, events=['start', 'end'])
+
+
+def measure(function, *args):
+    """
+    :return: (elapsed seconds, peak of the traced memory in bytes)
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+if __name__ == '__main__':
+    '''
+        Reports the peak memory (tracemalloc) of parsing a scientific parameters
+        XML file with Xml2ClassParser, which releases each processed element,
+        compared with the same parser keeping the whole XML tree in memory
+
+        e.g. python benchmark_xml2class_parser_memory.py --arrays 40 --length 100000
+    '''
+    arguments_parser = argparse.ArgumentParser()
+    arguments_parser.add_argument('--arrays', type=int, default=40, help='number of inline ARRAY nodes')
+    arguments_parser.add_argument('--length', type=int, default=100000, help='values per ARRAY node')
+    arguments = arguments_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        xml_path_filename = os.path.join(temporary_directory, 'parameters.xml')
+        write_parameters_xml(xml_path_filename, arrays_count=arguments.arrays, array_length=arguments.length)
+        xml_file_size = os.path.getsize(xml_path_filename)
+        arrays_size = (arguments.arrays // 2) * 2 * arguments.length * np.dtype('float').itemsize
+
+        print('XML file: {:.1f} MB, extracted arrays: {:.1f} MB'.format(xml_file_size / 2 ** 20,
+                                                                         arrays_size / 2 ** 20))
+        for label, function in (('whole tree kept', Xml2ClassParserKeepingWholeTree),
+                                ('elements released', Xml2ClassParser)):
+            elapsed, peak = measure(function, xml_path_filename)
+            print('{:<18} peak: {:8.1f} MB  time: {:6.2f} s'.format(label, peak / 2 ** 20, elapsed))
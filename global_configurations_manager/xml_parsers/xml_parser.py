@@ -22,12 +22,14 @@ class Parser:
         ElementTree instance
         """
         try:
-            # self.__xmltree = ElementTree.parse(file)
-            cls.__xmltree = ElementTree.parse(file)
+            # NOTE: the tree is returned from a local reference, since the class
+            # attribute could be overwritten meanwhile by another thread
+            xmltree = ElementTree.parse(file)
         except FileNotFoundError as e:
             raise e  # TODO: a better exception handling
         else:
-            return cls.__xmltree
+            cls.__xmltree = xmltree
+            return xmltree
 
     # @classmethod
     def __build_nested_nodes(self, parent_element):
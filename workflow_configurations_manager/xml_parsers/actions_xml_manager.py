@@ -11,7 +11,11 @@
 #       Team: Multi-scale Simulation and Design
 #
 # ------------------------------------------------------------------------------
+import collections
+import concurrent.futures
 import os
+import queue
+import xml
 
 # Co-Simulator's imports
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
@@ -19,9 +23,56 @@ from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import ex
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import utils
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import variables
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_converters
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_schemas
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
 
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_manager import XmlManager
+from EBRAINS_ConfigManager.global_configurations_manager.xml_parsers.xml_parser import Parser
+
+
+# Result of dissecting an Action XML file before transforming its references into run-time values
+ActionTemplate = collections.namedtuple('ActionTemplate', ['xml_path_filename',
+                                                           'variables_dict',
+                                                           'sci_params_xml_path_filename',
+                                                           'popen_arguments_list'])
+
+# Plan entry transformed into run-time values, see ActionsXmlManager.iter_resolved_actions
+ResolvedAction = collections.namedtuple('ResolvedAction', ['action_id',
+                                                           'return_code',
+                                                           'sci_params_xml_path_filename',
+                                                           'popen_arguments_list'])
+
+
+def load_action_xml_into_dict(action_xml_path_filename):
+    """
+        Loads an Action XML file into a dictionary, mimicking XmlManager.load_xml_into_dict
+        NOTE: It is defined at module level to be run by worker processes
+
+    :param action_xml_path_filename: The Action XML PATH+FILENAME
+    :return:
+        A tuple (return code, dictionary representing the <co_simulation_action> section,
+                 list of xml_schema.Diagnostic found validating it)
+    """
+    if not os.path.isfile(action_xml_path_filename):
+        return enums.XmlManagerReturnCodes.XML_FILE_NOT_FOUND, None, None
+
+    if not os.access(action_xml_path_filename, os.R_OK):
+        return enums.XmlManagerReturnCodes.XML_FILE_ACCESS_ERROR, None, None
+
+    parser = Parser()
+    try:
+        root = parser.load_xml(action_xml_path_filename).getroot()
+    except xml.etree.ElementTree.ParseError:
+        return enums.XmlManagerReturnCodes.XML_FORMAT_ERROR, None, None
+
+    component_xml = root.find(xml_tags.CO_SIM_XML_ACTION_ROOT_TAG)
+    if component_xml is None:
+        return enums.XmlManagerReturnCodes.XML_FORMAT_ERROR, None, None
+
+    return (enums.XmlManagerReturnCodes.XML_OK,
+            xml_converters.convert_xml2dict(component_xml),
+            xml_schemas.validate_component(component_xml, action_xml_path_filename))
 
 
 class ActionsXmlManager(object):
@@ -36,10 +87,8 @@ class ActionsXmlManager(object):
         IMPORTANT: __CoSimulationActionXmlManager processes each XML Action particularly
 
     """
-    __sci_params_xml_path_filenames_dict = {}
-    __actions_popen_arguments_dict = {}
-
-    def __init__(self, log_settings, configurations_manager, variables_manager, action_plan, ):
+    def __init__(self, log_settings, configurations_manager, variables_manager, action_plan,
+                 environment_snapshot=None):
         self.__log_settings = log_settings
         self.__configurations_manager = configurations_manager
         self.__logger = self.__configurations_manager.load_log_configurations(
@@ -47,11 +96,78 @@ class ActionsXmlManager(object):
             log_configurations=self.__log_settings)
         self.__variables_manager = variables_manager
         self.__action_plan = action_plan
+        # the same environment snapshot is shared by all the actions being dissected
+        if environment_snapshot is None:
+            environment_snapshot = self.__variables_manager.get_environment_snapshot()
+        self.__environment_snapshot = environment_snapshot
+
+        self.__sci_params_xml_path_filenames_dict = {}
+        self.__actions_popen_arguments_dict = {}
+        # resolved Action XML PATH+FILENAME -> (return code, ActionTemplate)
+        self.__action_templates_dict = {}
+
+        # idle Action XML managers, reused along the dissection of the Action XML files
+        # NOTE: its size is bounded by the amount of concurrent workers
+        self.__action_xml_managers_pool = queue.SimpleQueue()
+        # logger shared by all the Action XML managers, set up only once
+        self.__action_xml_managers_logger = self.__configurations_manager.load_log_configurations(
+            name='ActionXmlManager',
+            log_configurations=self.__log_settings)
 
-    def __transform_path_co_sim_variables_into_values(self, path=''):
+    def __acquire_action_xml_manager(self, action_xml_path_filename):
+        """
+            Takes an idle Action XML manager from the pool or creates a new one when the pool is empty
+
+        :param action_xml_path_filename: The Action XML PATH+FILENAME to be dissected
+        :return: Action XML manager ready to dissect the file
+        """
+        try:
+            xml_action_manager = self.__action_xml_managers_pool.get_nowait()
+        except queue.Empty:
+            return self._CoSimulationActionXmlManager(
+                log_settings=self.__log_settings,
+                configurations_manager=self.__configurations_manager,
+                xml_filename=action_xml_path_filename,
+                name='ActionXmlManager',
+                environment_snapshot=self.__environment_snapshot,
+                logger=self.__action_xml_managers_logger)
+
+        xml_action_manager.reset(xml_filename=action_xml_path_filename)
+        return xml_action_manager
+
+    def __release_action_xml_manager(self, xml_action_manager):
+        """
+            Returns the Action XML manager to the pool to be reused
+        """
+        self.__action_xml_managers_pool.put(xml_action_manager)
+
+    def __create_action_variables_scope(self, action_variables_dict=None):
+        """
+            Creates the variables scope where the references of an action will be resolved,
+            i.e. the variables declared on the <variables> section of the Action XML file
+            overlaid on top of the shared (global/plan) variables manager.
+
+        :param action_variables_dict: The variables gathered from the Action XML file
+
+        :return:
+            XML_CO_SIM_VARIABLE_ERROR: A variable references a CO_SIM_* variable not set yet
+            XML_OK: The variables manager to be used to resolve the action
+        """
+        if not action_variables_dict:
+            # nothing to be overridden, the action is resolved against the shared variables
+            return enums.XmlManagerReturnCodes.XML_OK, self.__variables_manager
+
+        action_variables_manager = self.__variables_manager.create_scope()
+        if not action_variables_manager.create_variables_from_parameters_dict(
+                input_dictionary=action_variables_dict) == enums.ParametersReturnCodes.PARAMETER_OK:
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None
+
+        return enums.XmlManagerReturnCodes.XML_OK, action_variables_manager
+
+    def __transform_path_co_sim_variables_into_values(self, variables_manager=None, path=''):
         try:
             transformed_path = \
-                utils.transform_co_simulation_variables_into_values(variables_manager=self.__variables_manager,
+                utils.transform_co_simulation_variables_into_values(variables_manager=variables_manager,
                                                                     functional_variable_value=path)
         # except KeyError:
         #     self.__logger.error('{} references to a CO_SIM_ variable not have been set yet'.format(item))
@@ -63,18 +179,21 @@ class ActionsXmlManager(object):
 
         return enums.XmlManagerReturnCodes.XML_OK, transformed_path
 
-    def __transform_popen_args_co_sim_variables_into_values(self, popen_arguments_list=None):
+    def __transform_popen_args_co_sim_variables_into_values(self, variables_manager=None, popen_arguments_list=None):
         """
             Goes through the elements in the Popen arguments list to find references to the CO_SIM_* variables,
             and transform them into the run time values
 
+        :param variables_manager: The variables (scope) used to resolve the references
+        :param popen_arguments_list: The list of arguments to be transformed in place
+
         :return:
             XML_OK: All the CO_SIM_* variables references were transformed into the corresponding run time values
         """
         for index, item in enumerate(popen_arguments_list):
             try:
                 popen_arguments_list[index] = \
-                    utils.transform_co_simulation_variables_into_values(variables_manager=self.__variables_manager,
+                    utils.transform_co_simulation_variables_into_values(variables_manager=variables_manager,
                                                                         functional_variable_value=item)
             # except KeyError:
             #     self.__logger.error('{} references to a CO_SIM_ variable not have been set yet'.format(item))
@@ -92,86 +211,334 @@ class ActionsXmlManager(object):
 
         return enums.XmlManagerReturnCodes.XML_OK
 
-    def dissect(self):
+    def __load_action_template(self, action_xml_path_filename, whole_xml_dict=None, diagnostics=()):
         """
-            Takes each XML action file reference in the XML action plan configuration file
-            and dissect them by using the nested Action XML Manager subclass
+            Dissects an Action XML file, the result (template) does not depend on the plan entry,
+            hence it could be shared by all the plan entries referencing the same file
+
+        :param action_xml_path_filename: The Action XML PATH+FILENAME
+        :param whole_xml_dict: The Action XML file already loaded as dictionary, e.g. by a worker process
+        :param diagnostics: The problems found validating the already loaded Action XML file
 
         :return:
-            XML_CO_SIM_VARIABLE_ERROR: At least a CO_SIM_* variable is not managed by the
-            XML_OK: All actions XML files were processed correctly
+            A tuple (return code, ActionTemplate)
+        """
+        xml_action_manager = self.__acquire_action_xml_manager(action_xml_path_filename)
+        try:
+            if whole_xml_dict is not None:
+                xml_action_manager.preload_xml_dict(whole_xml_dict=whole_xml_dict, diagnostics=diagnostics)
+
+            # Splitting the XML dictionary into dictionaries by XML section
+            # At the end of the dissection process,
+            # there will be an attribute (list) with the Popen arguments
+            dissect_return = xml_action_manager.dissect()
+
+            if not dissect_return == enums.XmlManagerReturnCodes.XML_OK:
+                return dissect_return, None
+
+            # NOTE: the template does not reference the per-dissect state of the manager,
+            #       since it is discarded when the manager is reused
+            return enums.XmlManagerReturnCodes.XML_OK, ActionTemplate(
+                xml_path_filename=action_xml_path_filename,
+                variables_dict=xml_action_manager.get_variables_dict(),
+                sci_params_xml_path_filename=xml_action_manager.get_sci_params_xml_path_filename(),
+                popen_arguments_list=tuple(xml_action_manager.get_popen_arguments_list()))
+        finally:
+            self.__release_action_xml_manager(xml_action_manager)
+
+    def __resolve_action_template(self, action_template):
+        """
+            Transforms the references of an action template into run-time values,
+            i.e. the plan entry specific part of the dissection
+
+        :param action_template: ActionTemplate gathered from the Action XML file
+
+        :return:
+            A tuple (return code, Scientific Parameters XML PATH+FILENAME, Popen arguments list)
+        """
+        # Post-processing steps
+        # raw values gathered from XML configuration file, they will be transformed into run-time values
+
+        # STEP 0 - Variables scope where the action references will be resolved
+        return_value, action_variables_manager = self.__create_action_variables_scope(
+            action_variables_dict=action_template.variables_dict)
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            self.__logger.error(
+                'Error found transforming into values the <variables> section of {}'.format(
+                    action_template.xml_path_filename))
+            return return_value, None, None
+
+        # STEP 1 - Scientific Parameters path+filename
+        sci_params_xml_path_filename = action_template.sci_params_xml_path_filename
+
+        return_value, transformed_path_filename = self.__transform_path_co_sim_variables_into_values(
+            variables_manager=action_variables_manager,
+            path=sci_params_xml_path_filename)
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            self.__logger.error(
+                'Error found transforming into values the CO_SIM_ variables found in {}'.format(
+                    sci_params_xml_path_filename))
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None, None
+
+        # STEP 2 - Popen arguments list
+        # Command-line argv[0..n] for Popen call, including mpirun (local VMs) srun (HPC)
+        # NOTE: a copy is taken since the list is transformed in place
+        popen_arguments_list = list(action_template.popen_arguments_list)
+        # STEP 2.1 - transform CO_SIM_* variables
+        # NOTE: the CO_SIM_* variables must have the run-time values assigned in this point,
+        # otherwise, the Co-Simulation process will not be performed properly
+        if not self.__transform_popen_args_co_sim_variables_into_values(
+                variables_manager=action_variables_manager,
+                popen_arguments_list=popen_arguments_list) == enums.XmlManagerReturnCodes.XML_OK:
+            self.__logger.error(
+                'Error found transforming into values the CO_SIM_ variables found in {}'.format(
+                    action_template.xml_path_filename))
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None, None
+
+        # STEP 2.2 - Joining those command line arguments finished with '=' with its correspoding value
+        #            e.g. '--cpu-bind=', 'none' will become '--cpu-bind=none'
+
+        joining_popen_arguments_list = []
+        for i, val in enumerate(popen_arguments_list):
+            if val.strip().startswith('-') and val.strip().endswith('='):
+                # is a command argument
+                popen_arguments_list[i + 1] = val.strip() + popen_arguments_list[i + 1]
+                continue
+            joining_popen_arguments_list.append(val)
+
+        return enums.XmlManagerReturnCodes.XML_OK, transformed_path_filename, joining_popen_arguments_list
+
+    def __get_actions_to_be_dissected(self):
+        """
+            Gathers the actions (scripts or binaries) able to be executed from the action plan
+
+        :return:
+            list of tuples (action_id, Action XML PATH+FILENAME) following the action plan order
         """
         actions_xml_file_location = \
             self.__variables_manager.get_value(variables.CO_SIM_ACTIONS_PATH)
 
+        actions_to_be_dissected = []
         for key, value in self.__action_plan.items():
             # key = action_NNN <- the identification in the action plan
             if value[xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE] == constants.CO_SIM_ACTION:
                 # taking into account only actions (scripts or binaries) able to be executed
+                actions_to_be_dissected.append((key, os.sep.join([actions_xml_file_location,
+                                                                  value[xml_tags.CO_SIM_XML_PLAN_ACTION_XML],
+                                                                  ])))
+        return actions_to_be_dissected
 
-                # current_action_id = key  # action_NNN
-                current_action_xml_path_filename = os.sep.join([actions_xml_file_location,
-                                                                value[xml_tags.CO_SIM_XML_PLAN_ACTION_XML],
-                                                                ])
+    def __submit_action_templates(self, executor, action_xml_path_filenames, dissection_mode):
+        """
+            Submits the loading of the Action XML files as templates to a pool of workers
+
+            CO_SIM_DISSECTION_THREADS: the whole dissection of each file is performed by a thread
+            CO_SIM_DISSECTION_PROCESSES: the XML files are loaded (parsed and converted into dictionaries)
+                                         by worker processes and the dissection of the dictionaries
+                                         is performed afterwards by this process, when it is required.
 
-                xml_action_manager = self._CoSimulationActionXmlManager(
-                    log_settings=self.__log_settings,
-                    configurations_manager=self.__configurations_manager,
-                    xml_filename=current_action_xml_path_filename,
-                    name='ActionXmlManager')
+        :return:
+            Dictionary containing a future by Action XML PATH+FILENAME
+        """
+        if dissection_mode == constants.CO_SIM_DISSECTION_THREADS:
+            return {action_xml_path_filename: executor.submit(self.__load_action_template, action_xml_path_filename)
+                    for action_xml_path_filename in action_xml_path_filenames}
 
-                # Splitting the XML dictionary into dictionaries by XML section
-                # At the end of the dissection process,
-                # there will be an attribute (list) with the Popen arguments
-                dissect_return = xml_action_manager.dissect()
+        # CO_SIM_DISSECTION_PROCESSES
+        return {action_xml_path_filename: executor.submit(load_action_xml_into_dict, action_xml_path_filename)
+                for action_xml_path_filename in action_xml_path_filenames}
 
-                if not dissect_return == enums.XmlManagerReturnCodes.XML_OK:
-                    self.__logger.error('Error found dissecting {}'.format(current_action_xml_path_filename))
-                    return dissect_return
+    def __gather_action_template(self, action_template_future, action_xml_path_filename, dissection_mode):
+        """
+            Waits for the loading of an Action XML file submitted to the pool of workers
+
+        :return:
+            A tuple (return code, ActionTemplate)
+        """
+        if dissection_mode == constants.CO_SIM_DISSECTION_THREADS:
+            return action_template_future.result()
+
+        # CO_SIM_DISSECTION_PROCESSES
+        return_value, whole_xml_dict, diagnostics = action_template_future.result()
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            self.__logger.error('{} cannot be loaded ({})'.format(action_xml_path_filename, return_value.name))
+            return enums.XmlManagerReturnCodes.XML_FORMAT_ERROR, None
+        return self.__load_action_template(action_xml_path_filename,
+                                           whole_xml_dict=whole_xml_dict,
+                                           diagnostics=diagnostics)
+
+    def iter_resolved_actions(self, dissection_mode=constants.CO_SIM_DISSECTION_SEQUENTIAL, max_workers=None,
+                              action_ids=None, action_templates_dict=None):
+        """
+            Takes each XML action file reference in the XML action plan configuration file,
+            dissects it and yields the plan entry as soon as it has been transformed into
+            run-time values, e.g. the first actions could be launched meanwhile the
+            following ones are still being dissected.
+
+            NOTE: Each Action XML file is dissected only once, even though it is referenced
+                  by several plan entries (e.g. N identical NEST instances), and only the
+                  transformation of its references into values is performed per plan entry.
+
+        :param dissection_mode: One of CO_SIM_DISSECTION_MODES_TUPLE, i.e. sequential,
+                                on a pool of threads or on a pool of processes
+        :param max_workers: Upper bound of workers used by the concurrent modes,
+                            CO_SIM_DISSECTION_MAX_WORKERS by default
+        :param action_ids: Plan entries to be dissected, all the actions in the plan by default,
+                           e.g. only the entries affected by a change (see DissectionWorkspace)
+        :param action_templates_dict: Action templates already dissected, keyed by resolved
+                                      Action XML PATH+FILENAME, whose files are not loaded again
 
-                # Post-processing steps
-                # raw values gathered from XML configuration file, they will be transformed into run-time values
+        :return:
+            Generator of ResolvedAction following the action plan order.
+            The sequential mode stops after the first entry not resolved properly, meanwhile the
+            concurrent modes carry on. A wrong dissection mode is yielded as a ResolvedAction
+            with no action_id and XML_VALUE_ERROR as return code.
+        """
+        if dissection_mode not in constants.CO_SIM_DISSECTION_MODES_TUPLE:
+            self.__logger.error('{} is not a valid dissection mode'.format(dissection_mode))
+            yield ResolvedAction(action_id=None,
+                                 return_code=enums.XmlManagerReturnCodes.XML_VALUE_ERROR,
+                                 sci_params_xml_path_filename=None,
+                                 popen_arguments_list=None)
+            return
+
+        actions_to_be_dissected = self.__get_actions_to_be_dissected()
+        if action_ids is not None:
+            action_ids = set(action_ids)
+            actions_to_be_dissected = [(action_id, action_xml_path_filename)
+                                       for action_id, action_xml_path_filename in actions_to_be_dissected
+                                       if action_id in action_ids]
+
+        # resolved path -> (return code, ActionTemplate)
+        # NOTE: only the successfully dissected templates are reused
+        action_templates_cache = self.__action_templates_dict = {
+            resolved_path_filename: (return_value, action_template)
+            for resolved_path_filename, (return_value, action_template) in (action_templates_dict or {}).items()
+            if return_value == enums.XmlManagerReturnCodes.XML_OK}
+
+        executor = None
+        action_template_futures = {}
+        if not dissection_mode == constants.CO_SIM_DISSECTION_SEQUENTIAL:
+            # the files are submitted beforehand, each one once, following the plan order
+            action_xml_path_filenames = [
+                resolved_path_filename for resolved_path_filename in dict.fromkeys(
+                    os.path.realpath(action_xml_path_filename) for _, action_xml_path_filename in actions_to_be_dissected)
+                if resolved_path_filename not in action_templates_cache]
+            if action_xml_path_filenames:
+                if max_workers is None:
+                    max_workers = constants.CO_SIM_DISSECTION_MAX_WORKERS
+                max_workers = max(1, min(max_workers, len(action_xml_path_filenames)))
+                if dissection_mode == constants.CO_SIM_DISSECTION_THREADS:
+                    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+                else:
+                    executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+                action_template_futures = self.__submit_action_templates(
+                    executor=executor,
+                    action_xml_path_filenames=action_xml_path_filenames,
+                    dissection_mode=dissection_mode)
 
-                # STEP 1 - Scientific Parameters path+filename
-                sci_params_xml_path_filename = xml_action_manager.get_sci_params_xml_path_filename()
+        try:
+            # resolving the plan entries following the action plan order,
+            # hence the errors are reported in the same order as the sequential mode does
+            for action_id, action_xml_path_filename in actions_to_be_dissected:
+                resolved_path_filename = os.path.realpath(action_xml_path_filename)
+                try:
+                    return_value, action_template = action_templates_cache[resolved_path_filename]
+                except KeyError:
+                    try:
+                        return_value, action_template = self.__gather_action_template(
+                            action_template_future=action_template_futures[resolved_path_filename],
+                            action_xml_path_filename=resolved_path_filename,
+                            dissection_mode=dissection_mode)
+                    except KeyError:
+                        return_value, action_template = self.__load_action_template(resolved_path_filename)
+                    action_templates_cache[resolved_path_filename] = return_value, action_template
+
+                sci_params_xml_path_filename = popen_arguments_list = None
+                if return_value == enums.XmlManagerReturnCodes.XML_OK:
+                    return_value, sci_params_xml_path_filename, popen_arguments_list = \
+                        self.__resolve_action_template(action_template)
 
-                return_value, transformed_path_filename = self.__transform_path_co_sim_variables_into_values(
-                    path=sci_params_xml_path_filename)
                 if not return_value == enums.XmlManagerReturnCodes.XML_OK:
-                    self.__logger.error(
-                        'Error found transforming into values the CO_SIM_ variables found in {}'.format(
-                            sci_params_xml_path_filename))
-                    return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR
-
-                self.__sci_params_xml_path_filenames_dict[key] = transformed_path_filename
-
-                # STEP 2 - Popen arguments list
-                # Command-line argv[0..n] for Popen call, including mpirun (local VMs) srun (HPC)
-                popen_arguments_list = xml_action_manager.get_popen_arguments_list()
-                # STEP 2.1 - transform CO_SIM_* variables
-                # NOTE: the CO_SIM_* variables must have the run-time values assigned in this point,
-                # otherwise, the Co-Simulation process will not be performed properly
-                if not self.__transform_popen_args_co_sim_variables_into_values(
-                        popen_arguments_list=popen_arguments_list) == enums.XmlManagerReturnCodes.XML_OK:
-                    self.__logger.error(
-                        'Error found transforming into values the CO_SIM_ variables found in {}'.format(
-                            current_action_xml_path_filename))
-                    return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR
-
-                # STEP 2.2 - Joining those command line arguments finished with '=' with its correspoding value
-                #            e.g. '--cpu-bind=', 'none' will become '--cpu-bind=none'
-
-                joining_popen_arguments_list = []
-                for i, val in enumerate(popen_arguments_list):
-                    if val.strip().startswith('-') and val.strip().endswith('='):
-                        # is a command argument
-                        popen_arguments_list[i + 1] = val.strip() + popen_arguments_list[i + 1]
-                        continue
-                    joining_popen_arguments_list.append(val)
-
-                self.__actions_popen_arguments_dict[key] = joining_popen_arguments_list
+                    self.__logger.error('Error found dissecting {}'.format(action_xml_path_filename))
+
+                yield ResolvedAction(action_id=action_id,
+                                     return_code=return_value,
+                                     sci_params_xml_path_filename=sci_params_xml_path_filename,
+                                     popen_arguments_list=popen_arguments_list)
+
+                if not return_value == enums.XmlManagerReturnCodes.XML_OK and \
+                        dissection_mode == constants.CO_SIM_DISSECTION_SEQUENTIAL:
+                    # stopping at the first error
+                    return
+        finally:
+            if executor is not None:
+                # e.g. the consumer stopped iterating, the files not loaded yet are discarded
+                for action_template_future in action_template_futures.values():
+                    action_template_future.cancel()
+                executor.shutdown(wait=True)
+
+    def dissect(self, dissection_mode=constants.CO_SIM_DISSECTION_SEQUENTIAL, max_workers=None,
+                action_ids=None, action_templates_dict=None):
+        """
+            Takes each XML action file reference in the XML action plan configuration file
+            and dissect them by using the nested Action XML Manager subclass,
+            i.e. it consumes the whole iter_resolved_actions generator
 
-        return enums.XmlManagerReturnCodes.XML_OK
+        :param dissection_mode: One of CO_SIM_DISSECTION_MODES_TUPLE, i.e. sequential,
+                                on a pool of threads or on a pool of processes
+        :param max_workers: Upper bound of workers used by the concurrent modes,
+                            CO_SIM_DISSECTION_MAX_WORKERS by default
+        :param action_ids: Plan entries to be dissected, all the actions in the plan by default
+        :param action_templates_dict: Action templates already dissected, keyed by resolved
+                                      Action XML PATH+FILENAME, whose files are not loaded again
+
+        :return:
+            XML_VALUE_ERROR: Wrong dissection mode
+            XML_CO_SIM_VARIABLE_ERROR: At least a CO_SIM_* variable is not managed by the
+            XML_OK: All actions XML files were processed correctly
+
+            NOTE: When several actions fail, all of them are reported following
+                  the action plan order and the return code is the one of the first of them
+        """
+        self.__sci_params_xml_path_filenames_dict = {}
+        self.__actions_popen_arguments_dict = {}
+
+        dissect_return = enums.XmlManagerReturnCodes.XML_OK
+        for resolved_action in self.iter_resolved_actions(dissection_mode=dissection_mode,
+                                                          max_workers=max_workers,
+                                                          action_ids=action_ids,
+                                                          action_templates_dict=action_templates_dict):
+            if not resolved_action.return_code == enums.XmlManagerReturnCodes.XML_OK:
+                if dissect_return == enums.XmlManagerReturnCodes.XML_OK:
+                    dissect_return = resolved_action.return_code
+                continue
+
+            if dissect_return == enums.XmlManagerReturnCodes.XML_OK:
+                self.__sci_params_xml_path_filenames_dict[resolved_action.action_id] = \
+                    resolved_action.sci_params_xml_path_filename
+                self.__actions_popen_arguments_dict[resolved_action.action_id] = \
+                    resolved_action.popen_arguments_list
+
+        return dissect_return
+
+    def get_actions_xml_path_filenames_dict(self):
+        """
+
+        :return:
+            Dictionary containing the Action XML PATH+FILENAME by Action ID,
+            taking into account only the actions able to be executed
+        """
+        return dict(self.__get_actions_to_be_dissected())
+
+    def get_action_templates_dict(self):
+        """
+
+        :return:
+            Dictionary containing the tuples (return code, ActionTemplate) gathered by the
+            last dissection, keyed by resolved Action XML PATH+FILENAME
+        """
+        return self.__action_templates_dict
 
     def get_actions_popen_arguments_dict(self):
         """
@@ -194,10 +561,67 @@ class ActionsXmlManager(object):
             XML Manager for the Co-Simulation Actions XML files
         """
 
-        __performer_dict = {}
-        __Popen_arguments_list = []
+        def __init__(self, log_settings, configurations_manager, xml_filename, name, environment_snapshot=None,
+                     logger=None):
+            super().__init__(log_settings, configurations_manager, xml_filename, name,
+                             environment_snapshot=environment_snapshot,
+                             logger=logger)
+            self.__reset_action_sections()
+
+        def __reset_action_sections(self):
+            """
+                Per-dissect state, i.e. discarded when the instance is reused
+            """
+            # dictionary representing the XML file when it has been loaded beforehand, and its diagnostics
+            self.__preloaded_xml_dict = None
+            self.__preloaded_diagnostics = []
+
+            # <action> sections
+            self.__launcher_dict = {}
+            self.__performer_dict = {}
+            self.__routine_dict = {}
 
-        __sci_params_xml_path_filename = None
+            # file containing the science parameters used to configure the simulation model
+            self.__sci_params_xml_path_filename = None
+
+            # list of arguments to be used when Popen is called
+            self.__Popen_arguments_list = []
+
+        def reset(self, xml_filename):
+            """
+                Gets the manager ready to dissect another Action XML file
+
+            :param xml_filename: The Action XML PATH+FILENAME to be dissected next
+            """
+            super().reset(xml_filename)
+            self.__reset_action_sections()
+
+        def preload_xml_dict(self, whole_xml_dict, diagnostics=()):
+            """
+                Sets the dictionary representing the Action XML file when it has already been
+                loaded (e.g. by a worker process), hence the file will not be loaded again
+
+            :param whole_xml_dict: dictionary representing the <co_simulation_action> section
+            :param diagnostics: problems found validating the file when it was loaded
+            """
+            self.__preloaded_xml_dict = whole_xml_dict
+            self.__preloaded_diagnostics = list(diagnostics)
+
+        def load_xml_into_dict(self):
+            """
+                Uses the preloaded dictionary when it was set, otherwise the XML file is loaded
+
+            :return:
+                see XmlManager.load_xml_into_dict
+            """
+            if self.__preloaded_xml_dict is None:
+                return super().load_xml_into_dict()
+
+            self._whole_xml_dict = self.__preloaded_xml_dict
+            self._diagnostics = self.__preloaded_diagnostics
+            self.__preloaded_xml_dict = None
+            self.__preloaded_diagnostics = []
+            return enums.XmlManagerReturnCodes.XML_OK
 
         def initialize_xml_elements(self):
             # TO BE DONE: there should be a global XML file where tags are defined
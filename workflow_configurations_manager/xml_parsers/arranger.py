@@ -15,6 +15,7 @@ import os
 
 # Co-Simulator imports
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import utils
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
@@ -53,6 +54,31 @@ class Arranger(object):
             self.__logger.debug(f'{directory} does not exist, going to create it')
             return self.__dir_creation(dir_to_be_created=directory)
 
+    def get_arrangement_plan(self):
+        """
+            Transforms the items to be arranged into run-time values without arranging them,
+            e.g. to be arranged later on by another process
+
+        :return:
+            A tuple (return code, list of dictionaries with the arrangement id, duty and resolved path)
+        """
+        arrangement_plan = []
+        for key, value in self.__items_to_be_arranged_dict.items():
+            # key = Arrangement XML id, e.g. arr_01
+            try:
+                transformed_arrange_what = utils.transform_co_simulation_variables_into_values(
+                    variables_manager=self.__variables_manager,
+                    functional_variable_value=value[xml_tags.CO_SIM_XML_ARRANGEMENT_WHAT])
+            except exceptions.CoSimVariableNotFound as CoSimVariableNotFound:
+                self.__logger.error(CoSimVariableNotFound)
+                return enums.ArrangerReturnCodes.NOT_OK, None
+
+            arrangement_plan.append({constants.CO_SIM_ARRANGEMENT_PLAN_ID: key,
+                                     xml_tags.CO_SIM_XML_ARRANGEMENT_DUTY: value[xml_tags.CO_SIM_XML_ARRANGEMENT_DUTY],
+                                     xml_tags.CO_SIM_XML_ARRANGEMENT_WHAT: transformed_arrange_what})
+
+        return enums.ArrangerReturnCodes.OK, arrangement_plan
+
     def arrange(self):
         arrangement_choices = {
             constants.CO_SIM_ARRANGEMENT_CHECK_BEFORE_CREATION: self.__check_and_create_dir,
@@ -0,0 +1,294 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import base64
+import bz2
+import lzma
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    # optional, compression="lz4" is then not available
+    lz4_frame = None
+
+# Co-Sim's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
+
+# Extension of the files loaded by means of numpy.load, any other file is taken as raw binary
+NPY_FILE_EXTENSION = '.npy'
+
+# Inline arrays longer than this (characters) are split into chunks decoded by worker threads
+TEXT_ARRAY_CHUNK_SIZE = 4 * 2 ** 20
+
+_WHITESPACE_SEARCH = re.compile(r'\s').search
+
+# encoding attribute of the ARRAY nodes containing binary data
+BASE64_ENCODING = 'base64'
+
+# compression attribute of the base64 encoded ARRAY nodes -> (compress, decompress) functions
+COMPRESSIONS_DICT = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+if lz4_frame is not None:
+    COMPRESSIONS_DICT['lz4'] = (lz4_frame.compress, lz4_frame.decompress)
+
+
+def parse_shape(shape_text):
+    """
+        Parses the shape attribute of an ARRAY node
+
+    :param shape_text: e.g. '1000,1000', '(1000, 1000)' or '1000'
+    :return:
+        Tuple of integers, None when shape_text is None or empty
+    """
+    if shape_text is None:
+        return None
+    shape_text = shape_text.strip().strip('()[]')
+    if not shape_text:
+        return None
+    try:
+        return tuple(int(dimension) for dimension in shape_text.split(',') if dimension.strip())
+    except ValueError:
+        raise exceptions.ArrayPayloadError(shape_text, 'wrong shape')
+
+
+def resolve_array_source(array_source, base_path=None):
+    """
+    :param array_source: The src attribute of an ARRAY node, relative paths are
+                         taken from the directory of the XML file referencing it
+    :param base_path: The directory of the XML file
+    :return: The external array file PATH+FILENAME
+    """
+    array_source = os.path.expandvars(os.path.expanduser(array_source))
+    if base_path and not os.path.isabs(array_source):
+        array_source = os.path.join(base_path, array_source)
+    return array_source
+
+
+def load_external_array(array_source, dtype=None, shape=None, offset=0, order='C', base_path=None):
+    """
+        Opens an external array payload without copying it into memory (zero copy),
+        i.e. the data are read on demand from the page cache and are shared by all
+        the processes opening the same file
+
+            .npy files: numpy.load(mmap_mode='r'), the header provides dtype and shape,
+                        when dtype or shape are specified they are checked against it
+            any other file: raw binary, numpy.memmap(mode='r'), float64 by default and
+                        one dimension when shape is not specified
+
+    :param array_source: The src attribute of the ARRAY node
+    :param dtype: The dtype attribute of the ARRAY node
+    :param shape: Tuple, the parsed shape attribute of the ARRAY node
+    :param offset: Bytes to be skipped at the beginning of a raw binary file
+    :param order: Memory layout of a raw binary file, 'C' or 'F'
+    :param base_path: The directory of the XML file referencing the payload
+
+    :return:
+        Read-only numpy array (memory-mapped)
+    """
+    array_path_filename = resolve_array_source(array_source, base_path=base_path)
+    if not os.path.isfile(array_path_filename):
+        raise exceptions.ArrayPayloadError(array_path_filename, 'file not found')
+
+    try:
+        if array_path_filename.endswith(NPY_FILE_EXTENSION):
+            array = np.load(array_path_filename, mmap_mode='r', allow_pickle=False)
+            if dtype is not None and not array.dtype == np.dtype(dtype):
+                raise exceptions.ArrayPayloadError(
+                    array_path_filename, 'dtype {} found, {} expected'.format(array.dtype, np.dtype(dtype)))
+            if shape is not None and not array.shape == tuple(shape):
+                raise exceptions.ArrayPayloadError(
+                    array_path_filename, 'shape {} found, {} expected'.format(array.shape, tuple(shape)))
+            return array
+
+        return np.memmap(array_path_filename,
+                         dtype=np.dtype(dtype if dtype is not None else 'float'),
+                         mode='r',
+                         offset=offset,
+                         shape=shape,
+                         order=order)
+    except (OSError, TypeError, ValueError) as error:
+        raise exceptions.ArrayPayloadError(array_path_filename, str(error))
+
+
+def _decode_text_chunk(text, start, end, separator, dtype):
+    """
+        Decodes the values of text[start:end], separated by whitespaces when separator is None
+
+    :raise ValueError: Empty value between separators, or a value not convertible to dtype
+    """
+    if separator is None:
+        tokens = text[start:end].split()
+    else:
+        tokens = [token.strip() for token in text[start:end].split(separator)]
+        if not all(tokens):
+            raise ValueError('empty value between {!r} separators'.format(separator))
+    if dtype.kind == 'b':
+        # as numpy.fromstring does, the booleans are written as integers, e.g. 1 0 1
+        return np.array(tokens, dtype=np.int64).astype(dtype)
+    return np.array(tokens, dtype=dtype)
+
+
+def _find_chunks_boundaries(text, chunk_size, separator):
+    """
+    :return:
+        List of (start, end) positions splitting the text into chunks of ~chunk_size
+        on the separator (on whitespaces when it is None), which is excluded from the chunks
+    """
+    boundaries = []
+    start = 0
+    while len(text) - start > chunk_size:
+        if separator is None:
+            whitespace = _WHITESPACE_SEARCH(text, start + chunk_size)
+            if whitespace is None:
+                break
+            position, separator_length = whitespace.start(), 1
+        else:
+            position, separator_length = text.find(separator, start + chunk_size), len(separator)
+            if position < 0:
+                break
+        boundaries.append((start, position))
+        start = position + separator_length
+    boundaries.append((start, len(text)))
+    return boundaries
+
+
+def decode_text_array(text, sep=None, dtype=None, shape=None, order='C',
+                      chunk_size=TEXT_ARRAY_CHUNK_SIZE, max_workers=None):
+    """
+        Decodes the text of an inline ARRAY node, whose values are separated by the sep attribute
+        surrounded by any whitespaces (including new lines, i.e. one row per line), or only by
+        whitespaces when there is no sep attribute (or it is a whitespace)
+
+            e.g. <weights datatype="ARRAY" sep="," shape="2,3">0.1, 0.2, 0.3,
+                                                              0.4, 0.5, 0.6</weights>
+
+        As numpy.fromstring does, a trailing separator is allowed but empty values are not, e.g. 1,,2
+
+        Texts longer than chunk_size are split into chunks which are decoded by worker threads
+
+    :param text: The node text
+    :param sep: The sep attribute of the ARRAY node
+    :param dtype: The dtype attribute of the ARRAY node, float64 by default
+    :param shape: Tuple, the parsed shape attribute of the ARRAY node, one dimension by default
+    :param order: Memory layout in which the values are placed into the shape, 'C' or 'F'
+    :param chunk_size: Length (characters) of the chunks decoded by the worker threads
+    :param max_workers: Number of worker threads, os.cpu_count() by default
+
+    :return:
+        numpy array
+    """
+    dtype = np.dtype(dtype if dtype is not None else 'float')
+    # the whitespaces around the separator are ignored, e.g. sep=", "
+    separator = (sep or '').strip() or None
+    text = (text or '').strip()
+    if separator is not None and text.endswith(separator):
+        text = text[:-len(separator)].rstrip()
+
+    try:
+        if not text:
+            array = np.empty(0, dtype=dtype)
+        else:
+            boundaries = _find_chunks_boundaries(text, chunk_size, separator)
+            if len(boundaries) == 1:
+                array = _decode_text_chunk(text, 0, len(text), separator, dtype)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                    array = np.concatenate(list(executor.map(
+                        lambda boundary: _decode_text_chunk(text, boundary[0], boundary[1], separator, dtype),
+                        boundaries)))
+    except (TypeError, ValueError) as error:
+        # e.g. empty value between separators, could not convert string to float
+        raise exceptions.ArrayPayloadError(text[:32], str(error))
+
+    if shape is not None:
+        try:
+            array = array.reshape(shape, order=order)
+        except ValueError as error:
+            raise exceptions.ArrayPayloadError(shape, str(error))
+    return array
+
+
+def _get_compression_functions(compression):
+    try:
+        return COMPRESSIONS_DICT[compression.lower()]
+    except KeyError:
+        raise exceptions.ArrayPayloadError(compression, 'unknown or unavailable compression, expected one of {}'.format(
+            sorted(COMPRESSIONS_DICT)))
+
+
+def decode_encoded_array(text, encoding=BASE64_ENCODING, compression=None, dtype=None, shape=None, order='C'):
+    """
+        Decodes the text of an ARRAY node containing the raw bytes of the array, base64 encoded
+        and optionally compressed, straight into a numpy array (no text parsing is involved)
+
+            e.g. <weights datatype="ARRAY" encoding="base64" compression="zlib" dtype="&lt;f8" shape="2,3">
+                    eJxjYGD4f4CBgSHd...
+                 </weights>
+
+    :param text: The node text, whitespaces and new lines are ignored
+    :param encoding: The encoding attribute of the ARRAY node, only base64 is supported
+    :param compression: The compression attribute of the ARRAY node, see COMPRESSIONS_DICT
+    :param dtype: The dtype attribute of the ARRAY node, float64 by default
+    :param shape: Tuple, the parsed shape attribute of the ARRAY node, one dimension by default
+    :param order: Memory layout of the bytes, 'C' or 'F'
+
+    :return:
+        Read-only numpy array sharing the memory of the decoded bytes
+    """
+    if not encoding.lower() == BASE64_ENCODING:
+        raise exceptions.ArrayPayloadError(encoding, 'unknown encoding, expected {}'.format(BASE64_ENCODING))
+
+    dtype = np.dtype(dtype if dtype is not None else 'float')
+    try:
+        data = base64.b64decode(text or '')
+        if compression:
+            _, decompress = _get_compression_functions(compression)
+            data = decompress(data)
+        array = np.frombuffer(data, dtype=dtype)
+    except (ValueError, OSError, RuntimeError, zlib.error, lzma.LZMAError) as error:
+        # e.g. binascii.Error (ValueError) incorrect padding, buffer size not a multiple of the element size
+        raise exceptions.ArrayPayloadError(text[:32] if text else text, str(error))
+
+    if shape is not None:
+        try:
+            array = array.reshape(shape, order=order)
+        except ValueError as error:
+            raise exceptions.ArrayPayloadError(shape, str(error))
+    return array
+
+
+def encode_array(array, compression=None, order='C'):
+    """
+        Encodes the raw bytes of a numpy array as decode_encoded_array expects them
+
+    :param array: numpy array
+    :param compression: See COMPRESSIONS_DICT, None for no compression
+    :param order: Memory layout of the bytes, 'C' or 'F'
+
+    :return:
+        base64 text (ASCII string)
+    """
+    data = np.asarray(array).tobytes(order=order)
+    if compression:
+        compress, _ = _get_compression_functions(compression)
+        data = compress(data)
+    return base64.b64encode(data).decode('ascii')
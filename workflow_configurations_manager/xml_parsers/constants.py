@@ -101,6 +101,28 @@ CO_SIM_ACTION_GOALS_TUPLE = (
     CO_SIM_ONE_WAY_INTERSCALE_HUB
 )
 
+"""
+CO_SIM_PLACEMENT_GOALS_PRIORITY_TUPLE:
+    Order in which the actions are placed onto the allocated resources by goal,
+    the goals not listed are placed at the end following the action plan order
+
+CO_SIM_PLACEMENT_SPREAD_GOALS_TUPLE:
+    Goals whose actions are placed on the node with more free CPUs (spreading),
+    the rest of the actions are packed onto the node which fits them best
+"""
+CO_SIM_PLACEMENT_GOALS_PRIORITY_TUPLE = (
+    CO_SIM_SIMULATION,
+    CO_SIM_ONE_WAY_SIMULATION,
+    CO_SIM_INTERSCALE_HUB,
+    CO_SIM_ONE_WAY_INTERSCALE_HUB,
+    CO_SIM_DATA_TRANSFORMATION,
+    CO_SIM_UNSPECIFIED_GOAL,
+)
+CO_SIM_PLACEMENT_SPREAD_GOALS_TUPLE = (
+    CO_SIM_SIMULATION,
+    CO_SIM_ONE_WAY_SIMULATION,
+)
+
 """
 CO_SIM_ACTION_LAUNCH_METHODS_TUPLE:
     Represents the different methods how Co-Simulation actions
@@ -167,6 +189,50 @@ CO_SIM_ACTION_EVENTS_TUPLE = (
     CO_SIM_WAIT_FOR_CONCURRENT_ACTIONS,
 )
 
+"""
+CO_SIM_DISSECTION_MODES_TUPLE:
+    Represents the different ways how the Actions XML files referenced
+    in the action plan could be dissected
+Meanings:
+    CO_SIM_DISSECTION_SEQUENTIAL: The actions are dissected one after another on the calling thread
+    CO_SIM_DISSECTION_THREADS: The actions are dissected on a pool of threads
+    CO_SIM_DISSECTION_PROCESSES: The Actions XML files are loaded on a pool of processes
+
+CO_SIM_DISSECTION_MAX_WORKERS:
+    Default upper bound of the pool of workers used by the concurrent dissection modes
+"""
+CO_SIM_DISSECTION_SEQUENTIAL = 'CO_SIM_DISSECTION_SEQUENTIAL'
+CO_SIM_DISSECTION_THREADS = 'CO_SIM_DISSECTION_THREADS'
+CO_SIM_DISSECTION_PROCESSES = 'CO_SIM_DISSECTION_PROCESSES'
+CO_SIM_DISSECTION_MODES_TUPLE = (
+    CO_SIM_DISSECTION_SEQUENTIAL,
+    CO_SIM_DISSECTION_THREADS,
+    CO_SIM_DISSECTION_PROCESSES,
+)
+CO_SIM_DISSECTION_MAX_WORKERS = 16
+
+"""
+CO_SIM_PLAN_BUNDLE_VERSION:
+    Version of the layout of the compiled plan bundle (JSON file) containing every
+    resolved launch input, bundles written with another version must be compiled again
+CO_SIM_PLAN_BUNDLE_*:
+    Keys of the compiled plan bundle dictionary
+"""
+CO_SIM_PLAN_BUNDLE_VERSION = 2
+CO_SIM_PLAN_BUNDLE_VERSION_KEY = 'version'
+CO_SIM_PLAN_BUNDLE_INPUTS = 'inputs'
+CO_SIM_PLAN_BUNDLE_ENVIRONMENT = 'environment'
+CO_SIM_PLAN_BUNDLE_VARIABLES = 'variables'
+CO_SIM_PLAN_BUNDLE_ACTIONS = 'actions'
+CO_SIM_PLAN_BUNDLE_POPEN_ARGUMENTS = 'popen_arguments'
+CO_SIM_PLAN_BUNDLE_SCI_PARAMS_XML = 'sci_params_xml_path_filename'
+CO_SIM_PLAN_BUNDLE_SCI_PARAMS_DIGEST = 'sci_params_digest'
+CO_SIM_PLAN_BUNDLE_CO_SIM_PARAMS = 'co_sim_params'
+CO_SIM_PLAN_BUNDLE_ARRANGEMENT = 'arrangement'
+CO_SIM_PLAN_BUNDLE_SERVICES_DEPLOYMENT = 'services_deployment'
+CO_SIM_PLAN_BUNDLE_COMM_SETTINGS = 'comm_settings'
+CO_SIM_ARRANGEMENT_PLAN_ID = 'arr_id'
+
 """
 CO_SIM_REGEX_ENVIRONMENT_VARIABLE:
     Regular expression to find references to environment variables in the 
@@ -174,6 +240,9 @@ CO_SIM_REGEX_ENVIRONMENT_VARIABLE:
 """
 CO_SIM_REGEX_ENVIRONMENT_VARIABLE: str = r'(\$\{|\})'
 CO_SIM_REGEX_CO_SIM_VARIABLE: str = r'(\{CO_SIM_|\})'
+CO_SIM_REGEX_SLURM_NODE_VARIABLE: str = r'^CO_SIM_SLURM_NODE_(\d{3,})$'
+# SLURM compressed counts, e.g. SLURM_JOB_CPUS_PER_NODE=4(x2),8
+CO_SIM_REGEX_SLURM_COUNT: str = r'^(\d+)(?:\(x(\d+)\))?$'
 
 # Co-Simulation Framework's Parameters Variables
 CO_SIM_FUNCTIONAL_PARAMETERS = 'CO_SIM_FUNCTIONAL_PARAMETERS'
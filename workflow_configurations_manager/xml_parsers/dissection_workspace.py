@@ -0,0 +1,322 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import os
+
+# Co-Simulator's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import utils
+
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.actions_xml_manager import ActionsXmlManager
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.plan_xml_manager import PlanXmlManager
+
+
+class DissectionWorkspace(object):
+    """
+        Stateful dissection of an Action Plan XML file and the Action XML files referenced by it.
+
+        The content digests of the files read are remembered, hence when the workspace is refreshed
+        only the files that changed are dissected again, and only the plan entries depending on
+        them are transformed into run-time values again, i.e. those entries:
+            - referencing an Action XML file that changed,
+            - referencing a different Action XML file than before,
+            - referencing a CO_SIM_* variable whose value changed, e.g. due to a change on the
+              <variables> section of the Action Plan XML file or on the variables manager
+              provided by the caller.
+
+        NOTE: The environment snapshot of the variables manager is kept along the whole life
+              of the workspace, hence changes on the environment are not taken into account.
+    """
+
+    def __init__(self, log_settings, configurations_manager, variables_manager, plan_xml_path_filename,
+                 dissection_mode=constants.CO_SIM_DISSECTION_SEQUENTIAL, max_workers=None):
+        self.__log_settings = log_settings
+        self.__configurations_manager = configurations_manager
+        self.__logger = self.__configurations_manager.load_log_configurations(
+            name=__name__,
+            log_configurations=self.__log_settings)
+
+        # variables set by the caller, e.g. CO_SIM_ROOT_PATH, the plan variables
+        # are set on a fork of it, hence it remains untouched
+        self.__base_variables_manager = variables_manager
+        self.__plan_xml_path_filename = plan_xml_path_filename
+        self.__dissection_mode = dissection_mode
+        self.__max_workers = max_workers
+
+        self.__plan_xml_manager = None
+        self.__variables_manager = None
+        self.__actions_xml_manager = None
+
+        # resolved PATH+FILENAME -> content digest, of the files successfully dissected
+        self.__files_digests_dict = {}
+        # variables values on which the last dissection was based
+        self.__base_variables_values = None
+        self.__variables_values = None
+        # resolved Action XML PATH+FILENAME -> (return code, ActionTemplate)
+        self.__action_templates_dict = {}
+        # action ID -> (resolved Action XML PATH+FILENAME, referenced CO_SIM_* variables names)
+        self.__actions_dependencies_dict = {}
+
+        self.__actions_popen_arguments_dict = {}
+        self.__sci_params_xml_path_filenames_dict = {}
+        # action IDs transformed into run-time values by the last refresh
+        self.__refreshed_action_ids = []
+
+    def __dissect_plan(self):
+        """
+            Dissects the Action Plan XML file and sets up the variables manager
+            where the plan entries are transformed into run-time values
+
+        :return:
+            A tuple (return code, PlanXmlManager, VariablesManager)
+        """
+        plan_xml_manager = PlanXmlManager(log_settings=self.__log_settings,
+                                          configurations_manager=self.__configurations_manager,
+                                          xml_filename=self.__plan_xml_path_filename,
+                                          name='PlanXmlManager',
+                                          environment_snapshot=self.__base_variables_manager.get_environment_snapshot())
+        return_value = plan_xml_manager.dissect()
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            return return_value, None, None
+
+        return_value, variables_manager = self.__set_up_variables_manager(plan_xml_manager)
+        return return_value, plan_xml_manager, variables_manager
+
+    def __set_up_variables_manager(self, plan_xml_manager):
+        """
+            Sets the variables and parameters of the Action Plan XML file
+            on a fork of the variables manager provided by the caller
+
+        :return:
+            A tuple (return code, VariablesManager)
+        """
+        variables_manager = self.__base_variables_manager.fork()
+
+        if not variables_manager.set_co_sim_variable_values_from_variables_dict(
+                plan_xml_manager.get_variables_dict()) == enums.VariablesReturnCodes.VARIABLE_OK:
+            self.__logger.error('Error found setting the variables of {}'.format(self.__plan_xml_path_filename))
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None
+
+        if not variables_manager.create_variables_from_parameters_dict(
+                plan_xml_manager.get_parameters_dict()) == enums.ParametersReturnCodes.PARAMETER_OK:
+            self.__logger.error('Error found creating the parameters of {}'.format(self.__plan_xml_path_filename))
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None
+
+        if not variables_manager.create_co_sim_run_time_variables() == enums.VariablesReturnCodes.VARIABLE_OK:
+            self.__logger.error('Error found creating the run-time variables')
+            return enums.XmlManagerReturnCodes.XML_CO_SIM_VARIABLE_ERROR, None
+
+        return enums.XmlManagerReturnCodes.XML_OK, variables_manager
+
+    @staticmethod
+    def __find_changed_variables_names(previous_values, current_values):
+        """
+        :return:
+            Set containing the names of the variables created, removed or whose value changed
+        """
+        return {variable_name
+                for variable_name in previous_values.keys() | current_values.keys()
+                if not previous_values.get(variable_name) == current_values.get(variable_name)}
+
+    @staticmethod
+    def __find_action_template_references(action_template):
+        """
+        :return:
+            Set containing the CO_SIM_* variables names referenced by the action template
+        """
+        referenced_variables_names = set()
+        for value in (list(action_template.variables_dict.values()) +
+                      [action_template.sci_params_xml_path_filename] +
+                      list(action_template.popen_arguments_list)):
+            if isinstance(value, str):
+                referenced_variables_names |= utils.find_co_simulation_variables_references(value)
+        return referenced_variables_names
+
+    def refresh(self):
+        """
+            Dissects the files changed since the last refresh, the first refresh dissects all of them
+
+        :return:
+            XML_OK: The action plan and the actions were dissected properly
+            Otherwise, the return code of the Action Plan or the Actions dissection
+        """
+        self.__refreshed_action_ids = []
+
+        # STEP 1 - Action Plan XML file and variables
+        plan_path_filename = os.path.realpath(self.__plan_xml_path_filename)
+        plan_digest = utils.compute_file_digest(plan_path_filename)
+        plan_changed = plan_digest is None or \
+            not plan_digest == self.__files_digests_dict.get(plan_path_filename)
+
+        base_variables_values = dict(self.__base_variables_manager.snapshot())
+        base_variables_changed = not base_variables_values == self.__base_variables_values
+
+        # None means all the variables are considered as changed
+        changed_variables_names = set()
+        if plan_changed or base_variables_changed:
+            if plan_changed:
+                # the digest is recorded again only when the dissection succeeds
+                self.__files_digests_dict.pop(plan_path_filename, None)
+                return_value, plan_xml_manager, variables_manager = self.__dissect_plan()
+            else:
+                plan_xml_manager = self.__plan_xml_manager
+                return_value, variables_manager = self.__set_up_variables_manager(plan_xml_manager)
+
+            if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+                self.__logger.error('Error found dissecting {}'.format(self.__plan_xml_path_filename))
+                return return_value
+
+            variables_values = dict(variables_manager.snapshot())
+            if self.__variables_values is None:
+                changed_variables_names = None
+            else:
+                changed_variables_names = self.__find_changed_variables_names(self.__variables_values,
+                                                                              variables_values)
+
+            self.__plan_xml_manager = plan_xml_manager
+            self.__variables_manager = variables_manager
+            self.__variables_values = variables_values
+            self.__base_variables_values = base_variables_values
+            if plan_digest is not None:
+                self.__files_digests_dict[plan_path_filename] = plan_digest
+
+            self.__actions_xml_manager = ActionsXmlManager(
+                log_settings=self.__log_settings,
+                configurations_manager=self.__configurations_manager,
+                variables_manager=self.__variables_manager,
+                action_plan=self.__plan_xml_manager.get_action_plan_dict())
+
+        # STEP 2 - Action XML files
+        actions_xml_path_filenames_dict = {
+            action_id: os.path.realpath(action_xml_path_filename)
+            for action_id, action_xml_path_filename in
+            self.__actions_xml_manager.get_actions_xml_path_filenames_dict().items()}
+
+        changed_path_filenames = set()
+        for action_path_filename in set(actions_xml_path_filenames_dict.values()):
+            action_digest = utils.compute_file_digest(action_path_filename)
+            if not action_digest == self.__files_digests_dict.get(action_path_filename):
+                changed_path_filenames.add(action_path_filename)
+
+        # STEP 3 - plan entries depending on the changes
+        action_ids_to_be_dissected = []
+        for action_id, action_path_filename in actions_xml_path_filenames_dict.items():
+            try:
+                previous_path_filename, referenced_variables_names = self.__actions_dependencies_dict[action_id]
+            except KeyError:
+                # new plan entry, or its previous dissection failed
+                action_ids_to_be_dissected.append(action_id)
+                continue
+
+            if changed_variables_names is None or \
+                    not previous_path_filename == action_path_filename or \
+                    action_path_filename in changed_path_filenames or \
+                    not referenced_variables_names.isdisjoint(changed_variables_names):
+                action_ids_to_be_dissected.append(action_id)
+
+        # discarding the outdated results and those of the entries removed from the plan
+        for action_id in list(self.__actions_dependencies_dict):
+            if action_id in action_ids_to_be_dissected or action_id not in actions_xml_path_filenames_dict:
+                del self.__actions_dependencies_dict[action_id]
+                self.__actions_popen_arguments_dict.pop(action_id, None)
+                self.__sci_params_xml_path_filenames_dict.pop(action_id, None)
+
+        for action_path_filename in changed_path_filenames:
+            self.__files_digests_dict.pop(action_path_filename, None)
+
+        self.__refreshed_action_ids = action_ids_to_be_dissected
+        if not action_ids_to_be_dissected:
+            return enums.XmlManagerReturnCodes.XML_OK
+
+        # STEP 4 - dissecting the changed files and transforming the affected entries into values
+        action_templates_dict = {action_path_filename: action_template
+                                 for action_path_filename, action_template in self.__action_templates_dict.items()
+                                 if action_path_filename not in changed_path_filenames}
+
+        return_value = self.__actions_xml_manager.dissect(dissection_mode=self.__dissection_mode,
+                                                          max_workers=self.__max_workers,
+                                                          action_ids=action_ids_to_be_dissected,
+                                                          action_templates_dict=action_templates_dict)
+
+        self.__action_templates_dict = self.__actions_xml_manager.get_action_templates_dict()
+        # NOTE: the digest is computed again since the file could have changed while being dissected,
+        #       in such case, it will be dissected again on the next refresh
+        for action_path_filename in changed_path_filenames:
+            template_return_value, action_template = \
+                self.__action_templates_dict.get(action_path_filename, (None, None))
+            if template_return_value == enums.XmlManagerReturnCodes.XML_OK:
+                self.__files_digests_dict[action_path_filename] = utils.compute_file_digest(action_path_filename)
+
+        actions_popen_arguments_dict = self.__actions_xml_manager.get_actions_popen_arguments_dict()
+        sci_params_xml_path_filenames_dict = self.__actions_xml_manager.get_actions_sci_params_xml_files_dict()
+        for action_id in action_ids_to_be_dissected:
+            if action_id not in actions_popen_arguments_dict:
+                # not dissected properly, it will be dissected again on the next refresh
+                continue
+            action_path_filename = actions_xml_path_filenames_dict[action_id]
+            _, action_template = self.__action_templates_dict[action_path_filename]
+            self.__actions_dependencies_dict[action_id] = (action_path_filename,
+                                                           self.__find_action_template_references(action_template))
+            self.__actions_popen_arguments_dict[action_id] = actions_popen_arguments_dict[action_id]
+            self.__sci_params_xml_path_filenames_dict[action_id] = sci_params_xml_path_filenames_dict[action_id]
+
+        # keeping the action plan order
+        self.__actions_popen_arguments_dict = {
+            action_id: self.__actions_popen_arguments_dict[action_id]
+            for action_id in actions_xml_path_filenames_dict if action_id in self.__actions_popen_arguments_dict}
+        self.__sci_params_xml_path_filenames_dict = {
+            action_id: self.__sci_params_xml_path_filenames_dict[action_id]
+            for action_id in actions_xml_path_filenames_dict if action_id in self.__sci_params_xml_path_filenames_dict}
+
+        return return_value
+
+    def get_plan_xml_manager(self):
+        """
+        :return: The PlanXmlManager instance of the last Action Plan XML file dissected properly
+        """
+        return self.__plan_xml_manager
+
+    def get_variables_manager(self):
+        """
+        :return: The VariablesManager where the plan entries are transformed into run-time values
+        """
+        return self.__variables_manager
+
+    def get_refreshed_action_ids(self):
+        """
+        :return: List of the action IDs transformed into run-time values by the last refresh
+        """
+        return self.__refreshed_action_ids
+
+    def get_files_digests_dict(self):
+        """
+        :return: Dictionary containing the content digest by resolved PATH+FILENAME of the files dissected
+        """
+        return dict(self.__files_digests_dict)
+
+    def get_actions_popen_arguments_dict(self):
+        """
+
+        :return:
+            Dictionary containing the popen argument list keyed by action identification in the action plan
+        """
+        return self.__actions_popen_arguments_dict
+
+    def get_actions_sci_params_xml_files_dict(self):
+        """
+
+        :return:
+            Dictionary containing the XML PATH+FILENAME of the Scientific Parameters by Action ID
+        """
+        return self.__sci_params_xml_path_filenames_dict
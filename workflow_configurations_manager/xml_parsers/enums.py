@@ -182,6 +182,20 @@ class ParametersReturnCodes(enum.Enum):
     VARIABLE_NOT_FOUND = 30
 
 
+@enum.unique
+class PlacementReturnCodes(enum.Enum):
+    """
+        Enum Class implementing the return codes from the placement planner,
+        which places the actions of the action plan onto the allocated resources
+    """
+    PLACEMENT_OK = 0
+    PLACEMENT_NOT_OK = -1
+
+    RESOURCES_NOT_FOUND = 10
+    VALUE_ERROR = 20
+    OVERSUBSCRIPTION = 30
+
+
 @enum.unique
 class VariablesReturnCodes(enum.Enum):
     """
@@ -212,3 +226,18 @@ class XmlManagerReturnCodes(enum.Enum):
     XML_TAG_ERROR = 225
     XML_VALUE_ERROR = 230
     XML_WRONG_MANAGER_ERROR = 235
+
+
+@enum.unique
+class PlanBundleReturnCodes(enum.Enum):
+    """
+        Enum Class implementing the return codes related to
+        the compiled plan bundle (see plan_bundle.PlanBundleCompiler)
+    """
+    BUNDLE_OK = 0
+    BUNDLE_NOT_OK = -1
+
+    BUNDLE_FILE_NOT_FOUND = 10
+    BUNDLE_FORMAT_ERROR = 20
+    BUNDLE_VERSION_ERROR = 30
+    BUNDLE_STALE = 40
@@ -0,0 +1,100 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import hashlib
+import json
+import os
+import types
+
+
+class EnvironmentSnapshot(object):
+    """
+        Frozen view of the environment variables referenced while dissecting
+        the Co-Simulation XML configuration files.
+
+        NOTE: Only the referenced variables are captured, the first time they are
+              looked up. Afterwards, the captured value is always returned even though
+              the environment changes, hence the resolution is deterministic along the
+              whole dissection process and its digest could be used as part of the keys
+              of cached resolved configurations.
+
+              The snapshot itself is neither hashable nor comparable, since its digest changes
+              as long as new variables are referenced, use cache_key instead once the dissection
+              is done.
+    """
+
+    def __init__(self, environ=None):
+        # source where the variables are captured from, os.environ by default
+        self.__environ = os.environ if environ is None else environ
+        # variable name -> captured value (None when the variable was not set)
+        self.__captured = {}
+        self.__digest = None
+
+    def get(self, variable_name, default=None):
+        """
+        :param variable_name: The environment variable name
+        :param default: Value returned when the variable is not set
+        :return: The captured value of the variable
+        """
+        try:
+            return self[variable_name]
+        except KeyError:
+            return default
+
+    def __getitem__(self, variable_name):
+        try:
+            value = self.__captured[variable_name]
+        except KeyError:
+            # first time the variable is referenced, capturing it
+            value = self.__environ.get(variable_name)
+            self.__captured[variable_name] = value
+            self.__digest = None
+
+        if value is None:
+            raise KeyError(variable_name)
+
+        return value
+
+    def __contains__(self, variable_name):
+        return self.get(variable_name) is not None
+
+    def get_captured_variables(self):
+        """
+        :return:
+            Read-only mapping with the captured variables,
+            those not set on the environment have None as value
+        """
+        return types.MappingProxyType(dict(self.__captured))
+
+    def digest(self):
+        """
+            Stable (across processes and runs) hash of the captured variables
+
+        :return:
+            SHA-256 hexadecimal digest of the captured names and values
+        """
+        if self.__digest is None:
+            serialized_variables = json.dumps(sorted(self.__captured.items()), separators=(',', ':'))
+            self.__digest = hashlib.sha256(serialized_variables.encode('utf-8')).hexdigest()
+
+        return self.__digest
+
+    def cache_key(self, *key_parts):
+        """
+        :param key_parts: Elements identifying the cached item, e.g. the XML filename
+        :return: A tuple to be used as key of a resolved configuration
+        """
+        return key_parts + (self.digest(),)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(captured={len(self.__captured)}, digest={self.digest()[:12]})'
@@ -44,3 +44,54 @@ class CoSimVariableNotFound(Exception):
 
     def __str__(self):
         return f'{self.co_sim_variable_name} -> {self.message}'
+
+
+class SlurmHostlistFormatError(Exception):
+    """ Exception raised when a SLURM hostlist expression cannot be parsed
+
+    Attributes:
+        hostlist_expression -- the hostlist expression causing the error, e.g. SLURM_NODELIST value
+        message -- error message
+    """
+
+    def __init__(self, hostlist_expression, message="Wrong SLURM hostlist expression"):
+        self.hostlist_expression = hostlist_expression
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.hostlist_expression} -> {self.message}'
+
+
+class ArrayPayloadError(Exception):
+    """ Exception raised when the payload of an ARRAY node cannot be loaded
+
+    Attributes:
+        array_source -- the XML node tag or the external file causing the error
+        message -- error message
+    """
+
+    def __init__(self, array_source, message="Wrong array payload"):
+        self.array_source = array_source
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.array_source} -> {self.message}'
+
+
+class XmlDatatypeError(Exception):
+    """ Exception raised when the text of an XML node cannot be converted into its datatype
+
+    Attributes:
+        node_tag -- the XML node tag causing the error
+        message -- error message
+    """
+
+    def __init__(self, node_tag, message="Wrong datatype"):
+        self.node_tag = node_tag
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.node_tag} -> {self.message}'
@@ -0,0 +1,294 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import bisect
+import itertools
+import re
+
+# Co-Simulator Imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
+
+# hostname split into <prefix><number><suffix>, the number being the last run of digits
+HOSTNAME_REGEX = re.compile(r'^(.*?)(\d+)(\D*)$')
+
+
+class HostRange(object):
+    """
+        Compact representation of a range of hostnames sharing prefix, padding and suffix
+        e.g. jwc00n[001-004]-ib -> prefix='jwc00n', first=1, last=4, width=3, suffix='-ib'
+
+        NOTE: A hostname with no number, e.g. localhost, is represented
+              as a range of one host with width=None
+    """
+    __slots__ = ('prefix', 'first', 'last', 'width', 'suffix')
+
+    def __init__(self, prefix, first, last, width=0, suffix=''):
+        self.prefix = prefix
+        self.first = first
+        self.last = last
+        self.width = width
+        self.suffix = suffix
+
+    def __len__(self):
+        return self.last - self.first + 1
+
+    def hostname(self, offset):
+        """
+        :param offset: Position of the host in the range (zero based)
+        :return: The hostname, e.g. jwc00n003
+        """
+        if self.width is None:
+            return f'{self.prefix}{self.suffix}'
+        return f'{self.prefix}{self.first + offset:0{self.width}d}{self.suffix}'
+
+    def __iter__(self):
+        for offset in range(len(self)):
+            yield self.hostname(offset)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.prefix!r}, {self.first}, {self.last}, {self.width}, {self.suffix!r})'
+
+
+class HostList(object):
+    """
+        Sequence of hostnames stored as compressed ranges,
+        the hostnames are only built when they are requested
+    """
+
+    def __init__(self, host_ranges=None):
+        self.__host_ranges = list(host_ranges) if host_ranges else []
+        # index of the first host of each range, used to find a host by position
+        self.__ranges_offsets = list(itertools.accumulate((len(host_range) for host_range in self.__host_ranges),
+                                                          initial=0))
+
+    def get_host_ranges(self):
+        return tuple(self.__host_ranges)
+
+    def __len__(self):
+        return self.__ranges_offsets[-1]
+
+    def __getitem__(self, index):
+        n_hosts = len(self)
+        if index < 0:
+            index += n_hosts
+        if not 0 <= index < n_hosts:
+            raise IndexError('hostlist index out of range')
+
+        range_index = bisect.bisect_right(self.__ranges_offsets, index) - 1
+        return self.__host_ranges[range_index].hostname(index - self.__ranges_offsets[range_index])
+
+    def __iter__(self):
+        for host_range in self.__host_ranges:
+            yield from host_range
+
+    def compress(self):
+        """
+        :return: The hostlist expression representing the hosts, e.g. jwc[01-02],jwb[10-12]
+        """
+        return ranges_to_hostlist(self.__host_ranges)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.compress()!r})'
+
+
+def _split_top_level(expression, separator=','):
+    """
+        Splits the expression by the separator found out of brackets
+    """
+    pieces = []
+    depth = 0
+    start = 0
+    for position, char in enumerate(expression):
+        if char == '[':
+            depth += 1
+            if depth > 1:
+                raise exceptions.SlurmHostlistFormatError(expression, message='Nested brackets are not allowed')
+        elif char == ']':
+            depth -= 1
+            if depth < 0:
+                raise exceptions.SlurmHostlistFormatError(expression, message='Unbalanced brackets')
+        elif char == separator and depth == 0:
+            pieces.append(expression[start:position])
+            start = position + 1
+
+    if depth != 0:
+        raise exceptions.SlurmHostlistFormatError(expression, message='Unbalanced brackets')
+
+    pieces.append(expression[start:])
+    return pieces
+
+
+def _parse_bracket_content(content, expression):
+    """
+        Parses the content of a bracket, e.g. 001-002,004
+
+    :return:
+        list of tuples (first, last, width)
+    """
+    numeric_ranges = []
+    for numeric_range in content.split(','):
+        lower, _, upper = numeric_range.strip().partition('-')
+        if not lower.isdigit() or (upper and not upper.isdigit()):
+            raise exceptions.SlurmHostlistFormatError(expression, message=f'Wrong range [{content}]')
+
+        first = int(lower)
+        last = int(upper) if upper else first
+        if last < first:
+            raise exceptions.SlurmHostlistFormatError(expression, message=f'Decreasing range [{content}]')
+
+        # SLURM pads the numbers with the width of the lower limit, e.g. [08-10] or [8-10]
+        numeric_ranges.append((first, last, len(lower)))
+
+    return numeric_ranges
+
+
+def _parse_host_expression(host_expression, expression):
+    """
+        Parses one host expression, i.e. with no top-level comma,
+        which could contain several bracket groups, e.g. rack[1-2]-node[01-04]-ib
+
+    :return:
+        list of HostRange
+    """
+    # literal pieces on even positions and bracket contents on odd positions
+    pieces = re.split(r'\[([^\]]*)\]', host_expression)
+    if len(pieces) == 1:
+        # hostname with no brackets
+        return [_literal_as_range(host_expression)]
+
+    # all the bracket groups but the last one are expanded into prefixes,
+    # the last one remains as compressed ranges
+    prefixes = [pieces[0]]
+    for position in range(1, len(pieces) - 2, 2):
+        expanded_prefixes = []
+        for prefix in prefixes:
+            for first, last, width in _parse_bracket_content(pieces[position], expression):
+                for number in range(first, last + 1):
+                    expanded_prefixes.append(f'{prefix}{number:0{width}d}{pieces[position + 1]}')
+        prefixes = expanded_prefixes
+
+    last_bracket_ranges = _parse_bracket_content(pieces[-2], expression)
+    suffix = pieces[-1]
+    return [HostRange(prefix=prefix, first=first, last=last, width=width, suffix=suffix)
+            for prefix in prefixes
+            for first, last, width in last_bracket_ranges]
+
+
+def _literal_as_range(hostname):
+    """
+        Represents a single hostname as a range of length one, when it ends
+        in a number, e.g. jsfc056, it could be compressed with others
+    """
+    match = HOSTNAME_REGEX.match(hostname)
+    if not match:
+        return HostRange(prefix=hostname, first=0, last=0, width=None, suffix='')
+    prefix, digits, suffix = match.groups()
+    number = int(digits)
+    return HostRange(prefix=prefix, first=number, last=number, width=len(digits), suffix=suffix)
+
+
+def parse_hostlist(expression):
+    """
+        Parses a SLURM hostlist expression, e.g. the SLURM_NODELIST value,
+        supporting several prefixes, different paddings and suffixes, e.g.
+            jwc[01-02],jwb[10-12]
+            jwc00n[001-002,004]
+            node[8-10]-ib,login01
+
+    :param expression: SLURM hostlist expression
+    :return: HostList representing the hosts on a compressed way
+    """
+    expression = expression.strip()
+    if not expression:
+        raise exceptions.SlurmHostlistFormatError(expression, message='Empty hostlist')
+
+    host_ranges = []
+    for host_expression in _split_top_level(expression):
+        host_expression = host_expression.strip()
+        if not host_expression:
+            raise exceptions.SlurmHostlistFormatError(expression, message='Empty host expression')
+        host_ranges.extend(_parse_host_expression(host_expression, expression))
+
+    return HostList(_merge_adjacent_ranges(host_ranges))
+
+
+def _merge_adjacent_ranges(host_ranges):
+    """
+        Joins the consecutive ranges which are contiguous, e.g. n[1-2],n3 -> n[1-3]
+    """
+    merged_ranges = []
+    for host_range in host_ranges:
+        if merged_ranges:
+            previous_range = merged_ranges[-1]
+            if previous_range.width is not None and host_range.width is not None and \
+                    previous_range.prefix == host_range.prefix and \
+                    previous_range.suffix == host_range.suffix and \
+                    previous_range.last + 1 == host_range.first and \
+                    _same_padding(previous_range, host_range):
+                previous_range.last = host_range.last
+                continue
+        merged_ranges.append(HostRange(host_range.prefix, host_range.first, host_range.last,
+                                       host_range.width, host_range.suffix))
+    return merged_ranges
+
+
+def _same_padding(previous_range, next_range):
+    """
+        Checks whether the numbers of the next range are built in the same way
+        by using the width of the previous range, e.g. [8-9] and [10-12]
+    """
+    if previous_range.width == next_range.width:
+        return True
+    # a number is built in the same way under any width not greater than its amount of digits
+    return len(str(next_range.first)) >= max(previous_range.width, next_range.width)
+
+
+def compress_hostnames(hostnames):
+    """
+        Builds the hostlist expression representing the hostnames, keeping their order
+
+    :param hostnames: iterable of hostnames, e.g. ['jwc01', 'jwc02', 'jwb10']
+    :return: SLURM hostlist expression, e.g. jwc[01-02],jwb10
+    """
+    return ranges_to_hostlist(_merge_adjacent_ranges(_literal_as_range(hostname) for hostname in hostnames))
+
+
+def ranges_to_hostlist(host_ranges):
+    """
+        Builds the hostlist expression from the ranges,
+        consecutive ranges sharing prefix and suffix are written in the same bracket
+    """
+    host_expressions = []
+    for (prefix, suffix), grouped_ranges in itertools.groupby(host_ranges,
+                                                              key=lambda host_range: (host_range.prefix,
+                                                                                      host_range.suffix)):
+        grouped_ranges = list(grouped_ranges)
+        if grouped_ranges[0].width is None:
+            # hostnames with no number
+            host_expressions.extend(host_range.hostname(0) for host_range in grouped_ranges)
+            continue
+
+        if len(grouped_ranges) == 1 and len(grouped_ranges[0]) == 1:
+            host_expressions.append(grouped_ranges[0].hostname(0))
+            continue
+
+        numeric_ranges = []
+        for host_range in grouped_ranges:
+            if len(host_range) == 1:
+                numeric_ranges.append(f'{host_range.first:0{host_range.width}d}')
+            else:
+                numeric_ranges.append(f'{host_range.first:0{host_range.width}d}-'
+                                      f'{host_range.last:0{host_range.width}d}')
+        host_expressions.append(f'{prefix}[{",".join(numeric_ranges)}]{suffix}')
+
+    return ','.join(host_expressions)
@@ -0,0 +1,261 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+# Co-Sim's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.utils import compute_file_digest
+
+# Version of the cache layout, caches written with another version are ignored
+PARAMETERS_CACHE_VERSION = 1
+
+# Suffixes of the sidecar files, e.g. parameters.xml.cache.json and parameters.xml.<digest>.npz
+PARAMETERS_CACHE_METADATA_SUFFIX = '.cache.json'
+PARAMETERS_CACHE_ARRAYS_SUFFIX = '.npz'
+
+# Size of the fixed part of a zip local file header, followed by the file name and the extra field
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def _memory_map_npz_members(npz_path_filename):
+    """
+        Memory-maps the arrays stored (not compressed) in a .npz file,
+        the compressed ones are loaded lazily by numpy on first access
+
+    :return:
+        Dictionary containing the arrays by member name
+    """
+    arrays_dict = {}
+    lazy_npz_file = None
+    with zipfile.ZipFile(npz_path_filename) as npz_zip_file, open(npz_path_filename, 'rb') as npz_file:
+        for zip_info in npz_zip_file.infolist():
+            member_name = zip_info.filename[:-len('.npy')]
+            if not zip_info.compress_type == zipfile.ZIP_STORED:
+                if lazy_npz_file is None:
+                    lazy_npz_file = np.load(npz_path_filename, allow_pickle=False)
+                arrays_dict[member_name] = lazy_npz_file[member_name]
+                continue
+
+            npz_file.seek(zip_info.header_offset)
+            local_header = npz_file.read(_ZIP_LOCAL_HEADER_SIZE)
+            file_name_length, extra_field_length = struct.unpack('<HH', local_header[26:30])
+            npz_file.seek(zip_info.header_offset + _ZIP_LOCAL_HEADER_SIZE + file_name_length + extra_field_length)
+            version = np.lib.format.read_magic(npz_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npz_file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npz_file)
+
+            if not shape or 0 in shape:
+                # numpy cannot map empty arrays
+                arrays_dict[member_name] = np.zeros(shape, dtype=dtype)
+                continue
+            arrays_dict[member_name] = np.memmap(npz_path_filename,
+                                                 dtype=dtype,
+                                                 mode='r',
+                                                 offset=npz_file.tell(),
+                                                 shape=shape,
+                                                 order='F' if fortran_order else 'C')
+    return arrays_dict
+
+
+def _external_file_signature(path_filename):
+    """
+    :return: [size, modification time] of the external payload file, None when it is not found
+    """
+    try:
+        file_stat = os.stat(path_filename)
+    except OSError:
+        return None
+    return [file_stat.st_size, file_stat.st_mtime_ns]
+
+
+def encode_parameters(value, arrays_dict):
+    """
+        Describes the dictionary parsed by Xml2ClassParser by means of JSON compatible values,
+        its arrays are moved into arrays_dict, except the ones memory-mapped from external payloads
+
+    :param value: The parameters dictionary, or any value inside it
+    :param arrays_dict: Dictionary where the arrays are placed by member name
+    :return:
+        JSON compatible description of the value
+    """
+    if isinstance(value, np.memmap) and value.filename is not None:
+        signature = _external_file_signature(value.filename)
+        if signature is not None:
+            return {'external': {'filename': value.filename,
+                                 'signature': signature,
+                                 'dtype': value.dtype.str,
+                                 'shape': list(value.shape),
+                                 'offset': value.offset,
+                                 'order': 'F' if value.flags.f_contiguous and not value.flags.c_contiguous
+                                 else 'C'}}
+    if isinstance(value, np.ndarray):
+        member_name = 'array_{}'.format(len(arrays_dict))
+        arrays_dict[member_name] = value
+        return {'array': member_name}
+    if isinstance(value, dict):
+        return {'dict': [[key, encode_parameters(item, arrays_dict)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return {'list': [encode_parameters(item, arrays_dict) for item in value]}
+    if isinstance(value, tuple):
+        return {'tuple': [encode_parameters(item, arrays_dict) for item in value]}
+    if isinstance(value, complex):
+        return {'complex': [value.real, value.imag]}
+    return {'value': value}
+
+
+def decode_parameters(encoded_value, arrays_dict):
+    """
+        Rebuilds the value described by encode_parameters
+
+    :param encoded_value: The description returned by encode_parameters
+    :param arrays_dict: Dictionary containing the arrays by member name
+    :return:
+        The parameters dictionary, or any value inside it
+
+    :raises ValueError: An external payload has changed
+    """
+    if 'value' in encoded_value:
+        return encoded_value['value']
+    if 'array' in encoded_value:
+        return arrays_dict[encoded_value['array']]
+    if 'dict' in encoded_value:
+        return {key: decode_parameters(item, arrays_dict) for key, item in encoded_value['dict']}
+    if 'list' in encoded_value:
+        return [decode_parameters(item, arrays_dict) for item in encoded_value['list']]
+    if 'tuple' in encoded_value:
+        return tuple(decode_parameters(item, arrays_dict) for item in encoded_value['tuple'])
+    if 'complex' in encoded_value:
+        return complex(*encoded_value['complex'])
+
+    external = encoded_value['external']
+    if not _external_file_signature(external['filename']) == external['signature']:
+        raise ValueError('{} has changed'.format(external['filename']))
+    return np.memmap(external['filename'],
+                     dtype=np.dtype(external['dtype']),
+                     mode='r',
+                     offset=external['offset'],
+                     shape=tuple(external['shape']),
+                     order=external['order'])
+
+
+class ParametersCache(object):
+    """
+        Sidecar cache of the dictionary parsed by Xml2ClassParser from a scientific parameters XML file,
+        keyed by the SHA-256 digest of the XML file:
+
+            <file>.cache.json: metadata, i.e. the digest and the dictionary structure holding the scalars
+            <file>.<digest>.npz: the arrays, stored without compression, hence they are memory-mapped
+                                 when loaded, i.e. read lazily on first access
+
+        The arrays memory-mapped from external payloads (src attribute) are not copied into the cache,
+        they are mapped again from their files, provided that their size and modification time remain.
+    """
+
+    def __init__(self, xml_path_filename, cache_directory=None):
+        self.__xml_path_filename = xml_path_filename
+        self.__digest = compute_file_digest(xml_path_filename)
+        if cache_directory is None:
+            cache_directory = os.path.dirname(os.path.abspath(xml_path_filename))
+        cache_path_filename_prefix = os.path.join(cache_directory, os.path.basename(xml_path_filename))
+        self.__metadata_path_filename = cache_path_filename_prefix + PARAMETERS_CACHE_METADATA_SUFFIX
+        self.__arrays_path_filename = '{}.{}{}'.format(cache_path_filename_prefix,
+                                                       self.__digest,
+                                                       PARAMETERS_CACHE_ARRAYS_SUFFIX)
+
+    def get_metadata_path_filename(self):
+        return self.__metadata_path_filename
+
+    def load(self):
+        """
+            Loads the parsed dictionary from the cache, when it was written from the current XML file
+
+        :return:
+            The parameters dictionary, None when there is no up-to-date cache
+        """
+        if self.__digest is None:
+            return None
+        try:
+            with open(self.__metadata_path_filename) as metadata_file:
+                metadata_dict = json.load(metadata_file)
+            if not (metadata_dict['version'] == PARAMETERS_CACHE_VERSION and
+                    metadata_dict['digest'] == self.__digest):
+                return None
+            arrays_dict = _memory_map_npz_members(self.__arrays_path_filename)
+            return decode_parameters(metadata_dict['parameters'], arrays_dict)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            # no cache, written by another version, or changed external payload
+            return None
+
+    def store(self, params_dict):
+        """
+            Writes the parsed dictionary into the cache, the files are replaced atomically
+            hence the concurrent readers never see a partially written cache
+
+        :param params_dict: The dictionary parsed by Xml2ClassParser
+        :return:
+            True when the cache was written, False otherwise (e.g. read-only directory)
+        """
+        if self.__digest is None:
+            return False
+
+        arrays_dict = {}
+        metadata_dict = {'version': PARAMETERS_CACHE_VERSION,
+                         'digest': self.__digest,
+                         'xml_path_filename': os.path.abspath(self.__xml_path_filename),
+                         'arrays': os.path.basename(self.__arrays_path_filename),
+                         'parameters': encode_parameters(params_dict, arrays_dict)}
+
+        previous_arrays_path_filename = None
+        try:
+            with open(self.__metadata_path_filename) as metadata_file:
+                previous_arrays_path_filename = os.path.join(os.path.dirname(self.__metadata_path_filename),
+                                                             json.load(metadata_file)['arrays'])
+        except (OSError, KeyError, ValueError):
+            pass
+
+        temporary_suffix = '.{}.tmp'.format(os.getpid())
+        temporary_path_filenames = []
+        try:
+            for path_filename, write in (
+                    (self.__arrays_path_filename,
+                     lambda cache_file: np.savez(cache_file, **arrays_dict)),
+                    (self.__metadata_path_filename,
+                     lambda cache_file: cache_file.write(json.dumps(metadata_dict).encode()))):
+                temporary_path_filenames.append(path_filename + temporary_suffix)
+                with open(path_filename + temporary_suffix, 'wb') as cache_file:
+                    write(cache_file)
+            # the arrays are in place before the metadata referencing them
+            for path_filename in (self.__arrays_path_filename, self.__metadata_path_filename):
+                os.replace(path_filename + temporary_suffix, path_filename)
+        except (OSError, TypeError, ValueError):
+            for temporary_path_filename in temporary_path_filenames:
+                try:
+                    os.remove(temporary_path_filename)
+                except OSError:
+                    pass
+            return False
+
+        if previous_arrays_path_filename and not previous_arrays_path_filename == self.__arrays_path_filename:
+            try:
+                # NOTE: the processes having it memory-mapped keep reading it
+                os.remove(previous_arrays_path_filename)
+            except OSError:
+                pass
+        return True
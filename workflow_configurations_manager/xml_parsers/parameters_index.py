@@ -0,0 +1,114 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import mmap
+import re
+from xml.parsers import expat
+
+# Start tag of an empty element, e.g. <weights datatype="ARRAY" src="weights.npy"/>
+_EMPTY_ELEMENT_TAG_FULLMATCH = re.compile(
+    rb'<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*/>').fullmatch
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+class ParametersIndex(object):
+    """
+        Byte offsets of the top-level parameters of a scientific parameters XML file, i.e. the elements
+        having a datatype or model attribute which are not inside another parameter, found by a single
+        expat pass (no tree, no text is decoded).
+
+        Each parameter could then be decoded on its own from its bytes, see read_fragment
+    """
+
+    def __init__(self, xml_path_filename):
+        self.__xml_path_filename = xml_path_filename
+        # tag -> (start, end) byte offsets, following the file order
+        self.__offsets_dict = {}
+        self.__xml_declaration = b''
+        self.__build()
+
+    def __build(self):
+        with open(self.__xml_path_filename, 'rb') as xml_file:
+            with mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:len(_UTF8_BOM)] == _UTF8_BOM:
+                    declaration_start = len(_UTF8_BOM)
+                else:
+                    declaration_start = 0
+                if data[declaration_start:declaration_start + 5] == b'<?xml':
+                    # kept for the fragments, since it declares the encoding of the offsets
+                    self.__xml_declaration = data[:data.find(b'?>') + 2]
+
+                parser = expat.ParserCreate()
+                # depth inside the current top-level parameter, 0 when outside
+                entry_depth = 0
+                entry_tag = None
+                entry_start = None
+
+                def start_element(tag, attributes):
+                    nonlocal entry_depth, entry_tag, entry_start
+                    if entry_depth:
+                        entry_depth += 1
+                    elif attributes.get('datatype') or attributes.get('model'):
+                        entry_depth = 1
+                        entry_tag = tag
+                        entry_start = parser.CurrentByteIndex
+
+                def end_element(tag):
+                    nonlocal entry_depth
+                    if not entry_depth:
+                        return
+                    entry_depth -= 1
+                    if entry_depth:
+                        return
+                    position = parser.CurrentByteIndex
+                    if _EMPTY_ELEMENT_TAG_FULLMATCH(data, entry_start, position):
+                        # NOTE: for empty elements, the position is right after the element
+                        entry_end = position
+                    else:
+                        # the position is at the end tag, e.g. </weights >
+                        entry_end = data.find(b'>', position) + 1
+                    # as when the whole file is parsed, the last occurrence prevails
+                    # but the position of the first one is kept
+                    self.__offsets_dict[entry_tag] = (entry_start, entry_end)
+
+                parser.StartElementHandler = start_element
+                parser.EndElementHandler = end_element
+                xml_file.seek(0)
+                parser.ParseFile(xml_file)
+
+    def get_tags(self):
+        """
+        :return: List of the top-level parameter tags, following the file order
+        """
+        return list(self.__offsets_dict)
+
+    def get_offsets(self, tag):
+        """
+        :return: (start, end) byte offsets of the parameter
+        """
+        return self.__offsets_dict[tag]
+
+    def read_fragment(self, tag):
+        """
+            Reads the bytes of a parameter, preceded by the XML declaration of the file (if any),
+            i.e. a well-formed XML document whose root is the parameter element
+
+        :param tag: The parameter tag
+        :return:
+            bytes
+        """
+        start, end = self.__offsets_dict[tag]
+        with open(self.__xml_path_filename, 'rb') as xml_file:
+            xml_file.seek(start)
+            return self.__xml_declaration + xml_file.read(end - start)
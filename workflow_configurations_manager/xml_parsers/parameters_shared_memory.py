@@ -0,0 +1,288 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import atexit
+import json
+import os
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Co-Sim's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.utils import compute_file_digest
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.parameters_cache \
+    import decode_parameters, encode_parameters
+
+# Seconds waited for the publisher before parsing the XML file privately
+SHARED_PARAMETERS_TIMEOUT = 300
+SHARED_PARAMETERS_POLLING_INTERVAL = 0.01
+
+# State of the publication, first byte of the control segment
+_PUBLICATION_PENDING = 0
+_PUBLICATION_READY = 1
+_PUBLICATION_FAILED = 2
+
+# Control segment: state (1 byte) + manifest segment size (8 bytes)
+_CONTROL_SEGMENT_SIZE = 9
+
+# Segments of the current process by prefix, (segment, PID of its creator process or None when
+# it was attached or already unlinked), kept alive as long as their arrays could be used,
+# i.e. closing a segment while an array still refers to its buffer raises BufferError
+_segments_dict = {}
+_segments_lock = threading.Lock()
+
+
+def get_segments_prefix(digest):
+    """
+        Names of the shared memory segments of an XML file, derived from its content digest,
+        short enough for the platforms limiting the segment names (e.g. 31 characters on macOS)
+
+            <prefix>_c: control segment, its creator is the publisher
+            <prefix>_m: manifest, JSON description of the parameters dictionary
+            <prefix>_<n>: n-th array
+    """
+    return 'cosim_{}'.format(digest[:16])
+
+
+def _attach_segment(name):
+    """
+        Attaches to an existing segment without registering it in the resource tracker,
+        otherwise the tracker would unlink it when this process exits, although it is still
+        used by the others (Python < 3.13, see bpo-39959).
+
+        NOTE: unregistering it afterwards is not an option, since the processes started by the
+        same parent share its tracker, i.e. the registration of the publisher would be dropped.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13, no track parameter
+        pass
+
+    with _segments_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda resource_name, resource_type: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _keep_segments(segments_prefix, segments, created):
+    creator_pid = os.getpid() if created else None
+    with _segments_lock:
+        _segments_dict.setdefault(segments_prefix, []).extend((segment, creator_pid) for segment in segments)
+
+
+def _unlink_created_segments(segments_prefixes):
+    """
+        Unlinks (only once) the segments created by the current process, e.g. not the ones inherited
+        by a forked process, they are still kept since their arrays could be in use
+    """
+    current_pid = os.getpid()
+    with _segments_lock:
+        for segments_prefix in segments_prefixes:
+            segments = _segments_dict.get(segments_prefix, [])
+            for index, (segment, creator_pid) in enumerate(segments):
+                if not creator_pid == current_pid:
+                    continue
+                # NOTE: a segment with the same name could be created afterwards by another publisher
+                segments[index] = (segment, None)
+                try:
+                    segment.unlink()
+                except FileNotFoundError:
+                    # already unlinked
+                    pass
+
+
+@atexit.register
+def _unlink_all_created_segments():
+    """
+        The processes started by multiprocessing share the resource tracker of their parent,
+        which unlinks the segments left only when the parent exits, hence the publisher
+        unlinks its segments on its own when it exits
+    """
+    _unlink_created_segments(list(_segments_dict))
+
+
+def _discard_segments(segments):
+    """
+        Closes and unlinks the segments of an unfinished publication, nobody could have attached
+        to them, provided that no array refers to their buffers anymore
+    """
+    for segment in segments:
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _publish(segments_prefix, control_segment, params_dict):
+    """
+        Copies the arrays of the parameters dictionary into shared memory segments and writes
+        the manifest, then it flags the publication as ready
+
+    :return:
+        The parameters dictionary whose arrays are the published ones (read-only)
+    """
+    arrays_dict = {}
+    encoded_parameters = encode_parameters(params_dict, arrays_dict)
+
+    segments = []
+    published_arrays_dict = {}
+    arrays_manifest_dict = {}
+    try:
+        for index, (member_name, array) in enumerate(arrays_dict.items()):
+            segment_name = '{}_{}'.format(segments_prefix, index)
+            # NOTE: zero-sized segments are not allowed
+            segment = shared_memory.SharedMemory(name=segment_name, create=True, size=max(array.nbytes, 1))
+            segments.append(segment)
+            published_array = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+            published_array[...] = array
+            published_array.flags.writeable = False
+            published_arrays_dict[member_name] = published_array
+            arrays_manifest_dict[member_name] = {'segment': segment_name,
+                                                 'dtype': array.dtype.str,
+                                                 'shape': list(array.shape)}
+
+        manifest = json.dumps({'arrays': arrays_manifest_dict,
+                               'parameters': encoded_parameters}).encode()
+        manifest_segment = shared_memory.SharedMemory(name=segments_prefix + '_m', create=True,
+                                                      size=len(manifest))
+        segments.append(manifest_segment)
+        manifest_segment.buf[:len(manifest)] = manifest
+    except BaseException:
+        # e.g. FileExistsError, a segment left by a publisher which crashed
+        published_array = None
+        published_arrays_dict.clear()
+        _discard_segments(segments)
+        raise
+
+    control_segment.buf[1:_CONTROL_SEGMENT_SIZE] = len(manifest).to_bytes(8, 'little')
+    # the state is written last, the attachers wait for it
+    control_segment.buf[0] = _PUBLICATION_READY
+    _keep_segments(segments_prefix, segments, created=True)
+    return decode_parameters(encoded_parameters, published_arrays_dict)
+
+
+def _attach(segments_prefix, control_segment):
+    """
+        Attaches to the arrays published by another process
+
+    :return:
+        The parameters dictionary whose arrays are the published ones (read-only)
+    """
+    manifest_size = int.from_bytes(bytes(control_segment.buf[1:_CONTROL_SEGMENT_SIZE]), 'little')
+    manifest_segment = _attach_segment(segments_prefix + '_m')
+    try:
+        manifest_dict = json.loads(bytes(manifest_segment.buf[:manifest_size]))
+    finally:
+        manifest_segment.close()
+
+    segments = []
+    published_arrays_dict = {}
+    for member_name, array_manifest_dict in manifest_dict['arrays'].items():
+        segment = _attach_segment(array_manifest_dict['segment'])
+        segments.append(segment)
+        published_array = np.ndarray(tuple(array_manifest_dict['shape']),
+                                     dtype=np.dtype(array_manifest_dict['dtype']),
+                                     buffer=segment.buf)
+        published_array.flags.writeable = False
+        published_arrays_dict[member_name] = published_array
+
+    _keep_segments(segments_prefix, segments, created=False)
+    return decode_parameters(manifest_dict['parameters'], published_arrays_dict)
+
+
+def load_shared_parameters(xml_path_filename, parse_function, timeout=SHARED_PARAMETERS_TIMEOUT, logger=None):
+    """
+        Loads the parameters dictionary of an XML file shared by the processes of the node:
+        the first process parses the XML file and publishes its arrays in shared memory segments,
+        the others attach to such arrays read-only, i.e. one copy per node instead of per process.
+        The arrays memory-mapped from external payloads are not copied, they are mapped again
+        from their files by every process (i.e. shared through the page cache).
+
+        The publisher process owns the segments, they are unlinked when it exits (atexit hook)
+        or when release_shared_parameters is called, the processes already attached keep using them.
+        NOTE: When the publisher is killed, its resource tracker unlinks them, but the processes
+              started by multiprocessing share the tracker of their parent, i.e. in such a case
+              the segments are unlinked only when the parent process exits.
+
+    :param xml_path_filename: The scientific parameters XML file
+    :param parse_function: Function returning the parameters dictionary parsed from the XML file
+    :param timeout: Seconds waited for the publisher before parsing the XML file privately
+    :param logger: Logger, optional
+
+    :return:
+        The parameters dictionary, its arrays are read-only
+    """
+    digest = compute_file_digest(xml_path_filename)
+    if digest is None:
+        return parse_function()
+    segments_prefix = get_segments_prefix(digest)
+
+    try:
+        control_segment = shared_memory.SharedMemory(name=segments_prefix + '_c', create=True,
+                                                     size=_CONTROL_SEGMENT_SIZE)
+    except FileExistsError:
+        control_segment = None
+
+    if control_segment is not None:
+        # publisher
+        _keep_segments(segments_prefix, [control_segment], created=True)
+        try:
+            params_dict = parse_function()
+        except BaseException:
+            # the attachers parse it privately (and report the problem) instead of waiting
+            control_segment.buf[0] = _PUBLICATION_FAILED
+            raise
+        try:
+            return _publish(segments_prefix, control_segment, params_dict)
+        except (OSError, TypeError, ValueError) as error:
+            control_segment.buf[0] = _PUBLICATION_FAILED
+            if logger:
+                logger.warning('{} parameters cannot be published: {}'.format(xml_path_filename, error))
+            return params_dict
+
+    # attacher
+    try:
+        control_segment = _attach_segment(segments_prefix + '_c')
+        _keep_segments(segments_prefix, [control_segment], created=False)
+        deadline = time.monotonic() + timeout
+        while control_segment.buf[0] == _PUBLICATION_PENDING and time.monotonic() < deadline:
+            time.sleep(SHARED_PARAMETERS_POLLING_INTERVAL)
+        if control_segment.buf[0] == _PUBLICATION_READY:
+            return _attach(segments_prefix, control_segment)
+    except (OSError, KeyError, ValueError) as error:
+        # e.g. the publisher exited meanwhile and its segments were unlinked
+        if logger:
+            logger.warning('{} shared parameters cannot be attached: {}'.format(xml_path_filename, error))
+
+    if logger:
+        logger.warning('{} parameters are not shared, parsing them privately'.format(xml_path_filename))
+    return parse_function()
+
+
+def release_shared_parameters(xml_path_filename):
+    """
+        Unlinks the segments published by the current process for the XML file,
+        the arrays already attached by any process remain valid
+    """
+    digest = compute_file_digest(xml_path_filename)
+    if digest is None:
+        return
+    _unlink_created_segments([get_segments_prefix(digest)])
@@ -0,0 +1,150 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import dataclasses
+import keyword
+import re
+import threading
+import typing
+
+import numpy as np
+
+# Default name of the generated type of a whole parameters file
+PARAMETERS_TYPE_NAME = 'Parameters'
+
+# generated types by schema signature, i.e. parameters files sharing a schema share their types
+_types_dict = {}
+_types_lock = threading.Lock()
+
+
+def _type_name_from(name):
+    """
+    :return: CamelCase type name, e.g. iaf_psc_alpha -> IafPscAlpha
+    """
+    words = re.split(r'[^0-9A-Za-z]+', str(name))
+    type_name = ''.join(word[:1].upper() + word[1:] for word in words)
+    if not type_name or type_name[0].isdigit():
+        type_name = 'Model' + type_name
+    return type_name
+
+
+def _is_model(value):
+    return isinstance(value, dict) and 'model' in value
+
+
+def _field_type_of(value):
+    """
+    :return: Annotation of the field holding the value, except for models
+    """
+    if value is None:
+        return typing.Any
+    if isinstance(value, np.ndarray):
+        return np.ndarray
+    return type(value)
+
+
+def _schema_signature(type_name, params_dict):
+    """
+    :return: Hashable description of the fields (names and types) of the parameters dictionary
+    """
+    fields_signature = []
+    for key, value in params_dict.items():
+        if _is_model(value):
+            fields_signature.append((key, _schema_signature(_type_name_from(value['model']), value)))
+        else:
+            fields_signature.append((key, _field_type_of(value)))
+    return type_name, tuple(fields_signature)
+
+
+def _is_parameters_object(value):
+    return getattr(type(value), '__reduce__', None) is _reduce_parameters_object
+
+
+def _to_params_dict(parameters_object):
+    """
+    :return: The dictionary the parameters object was created from, the models included
+    """
+    params_dict = {}
+    for field in dataclasses.fields(parameters_object):
+        value = getattr(parameters_object, field.name)
+        params_dict[field.name] = _to_params_dict(value) if _is_parameters_object(value) else value
+    return params_dict
+
+
+def _reduce_parameters_object(parameters_object):
+    """
+        Pickles the parameters object by means of its dictionary, since the generated types are not
+        importable, hence it is rebuilt (i.e. its type generated again) by the unpickling process
+    """
+    return create_parameters_object, (_to_params_dict(parameters_object), type(parameters_object).__name__)
+
+
+def _make_type(type_name, params_dict):
+    fields = []
+    for key, value in params_dict.items():
+        if not key.isidentifier() or keyword.iskeyword(key):
+            raise ValueError('<{}> is not a valid field name of {}'.format(key, type_name))
+        if _is_model(value):
+            field_type = get_parameters_type(value, type_name=_type_name_from(value['model']))
+        else:
+            field_type = _field_type_of(value)
+        fields.append((key, field_type))
+
+    # NOTE: eq=False, the arrays are not comparable as a whole
+    return dataclasses.make_dataclass(type_name,
+                                      fields,
+                                      namespace={'__slots__': tuple(key for key, _ in fields),
+                                                 '__reduce__': _reduce_parameters_object},
+                                      eq=False,
+                                      frozen=True)
+
+
+def get_parameters_type(params_dict, type_name=PARAMETERS_TYPE_NAME):
+    """
+        Gets the frozen dataclass type, with __slots__ instead of an instance dictionary,
+        whose fields are the parameters of a dictionary parsed by Xml2ClassParser. The fields
+        are typed after the values, and the models are fields typed as their own generated type.
+
+        The types are generated once per schema, i.e. per field names and types.
+        Their instances could be pickled, e.g. sent to other processes, see _reduce_parameters_object
+
+    :param params_dict: The dictionary parsed by Xml2ClassParser
+    :param type_name: Name of the generated type
+    :return:
+        The dataclass type
+    """
+    signature = _schema_signature(type_name, params_dict)
+    try:
+        return _types_dict[signature]
+    except KeyError:
+        pass
+
+    parameters_type = _make_type(type_name, params_dict)
+    with _types_lock:
+        return _types_dict.setdefault(signature, parameters_type)
+
+
+def create_parameters_object(params_dict, type_name=PARAMETERS_TYPE_NAME):
+    """
+        Creates the immutable typed object holding the parameters, see get_parameters_type,
+        e.g. parameters.model_0.weights instead of parameters_dict['model_0']['weights']
+
+    :param params_dict: The dictionary parsed by Xml2ClassParser
+    :param type_name: Name of the generated type
+    :return:
+        Instance of the generated dataclass type, the arrays are kept as they are (no copy)
+    """
+    parameters_type = get_parameters_type(params_dict, type_name=type_name)
+    return parameters_type(**{key: create_parameters_object(value, type_name=_type_name_from(value['model']))
+                              if _is_model(value) else value
+                              for key, value in params_dict.items()})
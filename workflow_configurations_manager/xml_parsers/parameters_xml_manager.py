@@ -13,10 +13,10 @@
 # ------------------------------------------------------------------------------
 
 # Co-Simulator's import
-from EBRAINS_ConfigManager.workflow_configuraitons_manager.xml_parsers import enums
-from EBRAINS_ConfigManager.workflow_configuraitons_manager.xml_parsers import xml_tags
-from EBRAINS_ConfigManager.workflow_configuraitons_manager.xml_parsers import constants
-from EBRAINS_ConfigManager.workflow_configuraitons_manager.xml_parsers.xml_manager import XmlManager
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_manager import XmlManager
 
 
 class ParametersXmlManager(XmlManager):
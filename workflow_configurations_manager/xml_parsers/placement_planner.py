@@ -0,0 +1,315 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import itertools
+import os
+import re
+
+# Co-Simulator Imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import hostlist
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import variables
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
+
+_slurm_count_regex = re.compile(constants.CO_SIM_REGEX_SLURM_COUNT)
+
+
+def expand_slurm_counts(expression):
+    """
+        Expands the SLURM compressed counts, e.g. SLURM_JOB_CPUS_PER_NODE or SLURM_TASKS_PER_NODE
+
+        e.g. 4(x2),8 -> [4, 4, 8]
+
+    :param expression: SLURM compressed counts
+    :return: list of counts, one per node
+    :raise ValueError: the expression is not well-formed
+    """
+    counts = []
+    for count_expression in expression.split(','):
+        match = _slurm_count_regex.match(count_expression.strip())
+        if not match:
+            raise ValueError(f'{expression} is not a valid SLURM counts expression')
+        count, repetitions = match.groups()
+        counts.extend([int(count)] * int(repetitions or 1))
+    return counts
+
+
+def compress_slurm_counts(counts):
+    """
+        Builds the SLURM compressed counts, i.e. the inverse of expand_slurm_counts
+
+        e.g. [4, 4, 8] -> 4(x2),8
+
+    :param counts: list of counts, one per node
+    :return: SLURM compressed counts
+    """
+    count_expressions = []
+    for count, repeated_counts in itertools.groupby(counts):
+        repetitions = len(list(repeated_counts))
+        count_expressions.append(f'{count}(x{repetitions})' if repetitions > 1 else str(count))
+    return ','.join(count_expressions)
+
+
+class _NodeResources(object):
+    """
+        Free resources on an allocated node
+    """
+    __slots__ = ('hostname', 'free_cpus', 'free_tasks')
+
+    def __init__(self, hostname, free_cpus, free_tasks=None):
+        self.hostname = hostname
+        self.free_cpus = free_cpus
+        # None means the amount of tasks is only limited by the CPUs
+        self.free_tasks = free_tasks
+
+    def capacity(self, cpus_per_task):
+        """
+        :return: Amount of tasks of cpus_per_task CPUs that could be placed on the node
+        """
+        n_tasks = self.free_cpus // cpus_per_task
+        if self.free_tasks is not None:
+            n_tasks = min(n_tasks, self.free_tasks)
+        return n_tasks
+
+    def take(self, n_tasks, cpus_per_task):
+        self.free_cpus -= n_tasks * cpus_per_task
+        if self.free_tasks is not None:
+            self.free_tasks -= n_tasks
+
+
+class PlacementPlanner(object):
+    """
+        Places the actions of the action plan onto the allocated resources (nodes and CPUs)
+        by goal, i.e. simulations are spread over the nodes with more free CPUs and
+        interscale hubs and the rest of actions are packed onto the remaining CPUs.
+
+        The resources are taken from the SLURM allocation on a cluster,
+            SLURM_NODELIST (via the variables manager), SLURM_JOB_CPUS_PER_NODE and SLURM_TASKS_PER_NODE
+        or from the local host otherwise.
+
+        Each action requests <action_ntasks> tasks with <action_cpus_per_task> CPUs each (1 by default)
+        and the result is published as CO_SIM_PLACEMENT_<ACTION_ID>_* variables, e.g.
+            CO_SIM_PLACEMENT_ACTION_000_NODELIST -> jwc[01-02]
+            CO_SIM_PLACEMENT_ACTION_000_NNODES -> 2
+            CO_SIM_PLACEMENT_ACTION_000_NTASKS -> 96
+            CO_SIM_PLACEMENT_ACTION_000_TASKS_PER_NODE -> 48(x2)
+            CO_SIM_PLACEMENT_ACTION_000_CPUS_PER_TASK -> 1
+    """
+
+    def __init__(self, log_settings, configurations_manager, variables_manager, action_plan):
+        self.__log_settings = log_settings
+        self.__configurations_manager = configurations_manager
+        self.__logger = self.__configurations_manager.load_log_configurations(
+            name=__name__,
+            log_configurations=self.__log_settings)
+        self.__variables_manager = variables_manager
+        self.__action_plan = action_plan
+
+        # action_NNN -> {'nodes': [(hostname, n_tasks), ...], 'ntasks': ..., 'cpus_per_task': ...}
+        self.__placement_dict = {}
+
+    def __gather_nodes_resources(self):
+        """
+            Builds the list of the allocated nodes with their CPUs and tasks slots
+
+        :return:
+            RESOURCES_NOT_FOUND: There is no information about the allocated resources
+            VALUE_ERROR: The SLURM_* variables are not well-formed or do not match
+            PLACEMENT_OK: The nodes list
+        """
+        environment_snapshot = self.__variables_manager.get_environment_snapshot()
+        slurm_hostlist = self.__variables_manager.get_slurm_hostlist()
+
+        if slurm_hostlist is None:
+            # local execution, all the actions are placed on the local host
+            return enums.PlacementReturnCodes.PLACEMENT_OK, [_NodeResources(hostname='localhost',
+                                                                            free_cpus=os.cpu_count() or 1)]
+
+        try:
+            cpus_per_node = expand_slurm_counts(environment_snapshot['SLURM_JOB_CPUS_PER_NODE'])
+        except KeyError:
+            self.__logger.error('SLURM_JOB_CPUS_PER_NODE environment variable has not been set yet, use "salloc"')
+            return enums.PlacementReturnCodes.RESOURCES_NOT_FOUND, None
+        except ValueError as value_error:
+            self.__logger.error(value_error)
+            return enums.PlacementReturnCodes.VALUE_ERROR, None
+
+        tasks_per_node = [None] * len(slurm_hostlist)
+        if 'SLURM_TASKS_PER_NODE' in environment_snapshot:
+            try:
+                tasks_per_node = expand_slurm_counts(environment_snapshot['SLURM_TASKS_PER_NODE'])
+            except ValueError as value_error:
+                self.__logger.error(value_error)
+                return enums.PlacementReturnCodes.VALUE_ERROR, None
+
+        if not len(cpus_per_node) == len(slurm_hostlist) or not len(tasks_per_node) == len(slurm_hostlist):
+            self.__logger.error('SLURM_JOB_CPUS_PER_NODE/SLURM_TASKS_PER_NODE do not match with SLURM_NODELIST')
+            return enums.PlacementReturnCodes.VALUE_ERROR, None
+
+        return enums.PlacementReturnCodes.PLACEMENT_OK, [
+            _NodeResources(hostname=hpc_node_name, free_cpus=n_cpus, free_tasks=n_tasks)
+            for hpc_node_name, n_cpus, n_tasks in zip(slurm_hostlist, cpus_per_node, tasks_per_node)]
+
+    def __gather_actions_requests(self):
+        """
+            Gets the resources requested by each action, sorted by the goal priority
+            and by the action plan order
+
+        :return:
+            VALUE_ERROR: The requested resources are not positive integers
+            PLACEMENT_OK: list of (action_id, goal, ntasks, cpus_per_task)
+        """
+        actions_requests = []
+        for action_id, action in self.__action_plan.items():
+            if not action[xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE] == constants.CO_SIM_ACTION:
+                continue
+
+            try:
+                n_tasks = int(action.get(xml_tags.CO_SIM_XML_PLAN_ACTION_NTASKS, 1))
+                cpus_per_task = int(action.get(xml_tags.CO_SIM_XML_PLAN_ACTION_CPUS_PER_TASK, 1))
+            except (TypeError, ValueError):
+                n_tasks = cpus_per_task = 0
+
+            if n_tasks < 1 or cpus_per_task < 1:
+                self.__logger.error('{} requests wrong resources, <{}> and <{}> must be positive integers'.format(
+                    action_id,
+                    xml_tags.CO_SIM_XML_PLAN_ACTION_NTASKS,
+                    xml_tags.CO_SIM_XML_PLAN_ACTION_CPUS_PER_TASK))
+                return enums.PlacementReturnCodes.VALUE_ERROR, None
+
+            action_goal = action.get(xml_tags.CO_SIM_XML_PLAN_ACTION_GOAL, constants.CO_SIM_UNSPECIFIED_GOAL)
+            actions_requests.append((action_id, action_goal, n_tasks, cpus_per_task))
+
+        def goal_priority(action_request):
+            try:
+                return constants.CO_SIM_PLACEMENT_GOALS_PRIORITY_TUPLE.index(action_request[1])
+            except ValueError:
+                return len(constants.CO_SIM_PLACEMENT_GOALS_PRIORITY_TUPLE)
+
+        # sorted() is stable, the action plan order is kept among the actions with the same goal
+        return enums.PlacementReturnCodes.PLACEMENT_OK, sorted(actions_requests, key=goal_priority)
+
+    @staticmethod
+    def __place_action(nodes, n_tasks, cpus_per_task, spread):
+        """
+            Places the tasks of an action on a single node when possible,
+            otherwise the tasks are distributed over the nodes with more room
+
+        :return:
+            list of (node, n_tasks) following the nodes order, or None when there are not enough free resources
+        """
+        capacities = [node.capacity(cpus_per_task) for node in nodes]
+        fitting_nodes = [index for index, capacity in enumerate(capacities) if capacity >= n_tasks]
+        if fitting_nodes:
+            if spread:
+                # the node with more free CPUs, the first one on a tie
+                chosen_node = max(fitting_nodes, key=lambda index: (nodes[index].free_cpus, -index))
+            else:
+                # the node which fits best, the first one on a tie
+                chosen_node = min(fitting_nodes, key=lambda index: (capacities[index], index))
+            return [(nodes[chosen_node], n_tasks)]
+
+        # the action does not fit on a single node
+        if sum(capacities) < n_tasks:
+            return None
+
+        tasks_by_node_index = {}
+        pending_tasks = n_tasks
+        for index in sorted(range(len(nodes)), key=lambda index: (-capacities[index], index)):
+            if pending_tasks == 0:
+                break
+            node_tasks = min(capacities[index], pending_tasks)
+            if node_tasks:
+                tasks_by_node_index[index] = node_tasks
+                pending_tasks -= node_tasks
+
+        # NOTE: SLURM assigns the tasks per node following the nodes order of the allocation
+        return [(nodes[index], tasks_by_node_index[index]) for index in sorted(tasks_by_node_index)]
+
+    def plan(self):
+        """
+            Places the actions onto the allocated resources
+
+        :return:
+            RESOURCES_NOT_FOUND: There is no information about the allocated resources
+            VALUE_ERROR: Wrong resources information or requests
+            OVERSUBSCRIPTION: The allocated resources are not enough to place all the actions
+            PLACEMENT_OK: The placement dictionary has been built
+        """
+        self.__placement_dict = {}
+
+        return_value, nodes = self.__gather_nodes_resources()
+        if not return_value == enums.PlacementReturnCodes.PLACEMENT_OK:
+            return return_value
+
+        return_value, actions_requests = self.__gather_actions_requests()
+        if not return_value == enums.PlacementReturnCodes.PLACEMENT_OK:
+            return return_value
+
+        for action_id, action_goal, n_tasks, cpus_per_task in actions_requests:
+            assignments = self.__place_action(nodes=nodes,
+                                              n_tasks=n_tasks,
+                                              cpus_per_task=cpus_per_task,
+                                              spread=action_goal in constants.CO_SIM_PLACEMENT_SPREAD_GOALS_TUPLE)
+            if assignments is None:
+                self.__logger.error('{} ({}) requesting {} task(s) of {} CPU(s) does not fit on the '
+                                    'allocated resources'.format(action_id, action_goal, n_tasks, cpus_per_task))
+                return enums.PlacementReturnCodes.OVERSUBSCRIPTION
+
+            for node, node_tasks in assignments:
+                node.take(node_tasks, cpus_per_task)
+
+            self.__placement_dict[action_id] = {
+                'nodes': [(node.hostname, node_tasks) for node, node_tasks in assignments],
+                'ntasks': n_tasks,
+                'cpus_per_task': cpus_per_task}
+
+        # keeping the action plan order
+        self.__placement_dict = {action_id: self.__placement_dict[action_id]
+                                 for action_id in self.__action_plan if action_id in self.__placement_dict}
+
+        return enums.PlacementReturnCodes.PLACEMENT_OK
+
+    def publish(self):
+        """
+            Creates the CO_SIM_PLACEMENT_<ACTION_ID>_* variables on the variables manager
+
+        :return:
+            VARIABLE_NOT_FOUND: The variables could not be created
+            PARAMETER_OK: The placement variables have been created
+        """
+        placement_variables_dict = {}
+        for action_id, placement in self.__placement_dict.items():
+            variable_prefix = f'{variables.CO_SIM_PLACEMENT_PREFIX}{action_id.upper()}'
+            placement_variables_dict[variable_prefix + variables.CO_SIM_PLACEMENT_NODELIST_SUFFIX] = \
+                hostlist.compress_hostnames(hostname for hostname, _ in placement['nodes'])
+            placement_variables_dict[variable_prefix + variables.CO_SIM_PLACEMENT_NNODES_SUFFIX] = \
+                str(len(placement['nodes']))
+            placement_variables_dict[variable_prefix + variables.CO_SIM_PLACEMENT_NTASKS_SUFFIX] = \
+                str(placement['ntasks'])
+            # SLURM compressed counts following the NODELIST order, e.g. 3,1 when the tasks are not even
+            placement_variables_dict[variable_prefix + variables.CO_SIM_PLACEMENT_TASKS_PER_NODE_SUFFIX] = \
+                compress_slurm_counts(node_tasks for _, node_tasks in placement['nodes'])
+            placement_variables_dict[variable_prefix + variables.CO_SIM_PLACEMENT_CPUS_PER_TASK_SUFFIX] = \
+                str(placement['cpus_per_task'])
+
+        return self.__variables_manager.create_variables_from_parameters_dict(
+            input_dictionary=placement_variables_dict)
+
+    def get_placement_dict(self):
+        """
+        :return:
+            Dictionary containing the nodes and tasks assigned to each action keyed by action ID
+        """
+        return self.__placement_dict
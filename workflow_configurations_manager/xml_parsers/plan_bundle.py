@@ -0,0 +1,285 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import json
+import os
+
+# Co-Simulator's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.arranger import Arranger
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.comm_settings_xml_manager \
+    import CommunicationSettingsXmlManager
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.dissection_workspace import DissectionWorkspace
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.parameters_xml_manager \
+    import ParametersXmlManager
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.services_deployment_xml_manager \
+    import ServicesDeploymentXmlManager
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.utils import compute_file_digest
+
+
+def load_plan_bundle(bundle_path_filename):
+    """
+        Loads a compiled plan bundle by means of a single read, e.g. by the launcher or by each rank
+
+    :param bundle_path_filename: The plan bundle PATH+FILENAME
+    :return:
+        A tuple (return code, dictionary representing the plan bundle)
+    """
+    try:
+        with open(bundle_path_filename, 'r') as bundle_file:
+            bundle_dict = json.load(bundle_file)
+    except FileNotFoundError:
+        return enums.PlanBundleReturnCodes.BUNDLE_FILE_NOT_FOUND, None
+    except (OSError, ValueError):
+        return enums.PlanBundleReturnCodes.BUNDLE_FORMAT_ERROR, None
+
+    if not isinstance(bundle_dict, dict):
+        return enums.PlanBundleReturnCodes.BUNDLE_FORMAT_ERROR, None
+
+    if not bundle_dict.get(constants.CO_SIM_PLAN_BUNDLE_VERSION_KEY) == constants.CO_SIM_PLAN_BUNDLE_VERSION:
+        return enums.PlanBundleReturnCodes.BUNDLE_VERSION_ERROR, None
+
+    return enums.PlanBundleReturnCodes.BUNDLE_OK, bundle_dict
+
+
+def find_stale_inputs(bundle_dict, environ=None):
+    """
+        Compares the inputs recorded on the plan bundle with their current state
+
+    :param bundle_dict: Dictionary representing the plan bundle
+    :param environ: Mapping with the current environment variables, os.environ by default
+    :return:
+        List containing the PATH+FILENAME of the input files whose content changed (or cannot be read)
+        and the names of the referenced environment variables whose value changed
+    """
+    if environ is None:
+        environ = os.environ
+
+    stale_inputs = [path_filename
+                    for path_filename, digest in bundle_dict[constants.CO_SIM_PLAN_BUNDLE_INPUTS].items()
+                    if not compute_file_digest(path_filename) == digest]
+    stale_inputs.extend(variable_name
+                        for variable_name, value in bundle_dict[constants.CO_SIM_PLAN_BUNDLE_ENVIRONMENT].items()
+                        if not environ.get(variable_name) == value)
+    return stale_inputs
+
+
+def load_up_to_date_plan_bundle(bundle_path_filename, environ=None):
+    """
+        Loads a compiled plan bundle only when it is not stale
+
+    :return:
+        A tuple (return code, dictionary representing the plan bundle)
+        BUNDLE_STALE: At least one of the inputs changed since the bundle was compiled
+    """
+    return_value, bundle_dict = load_plan_bundle(bundle_path_filename)
+    if not return_value == enums.PlanBundleReturnCodes.BUNDLE_OK:
+        return return_value, None
+
+    if find_stale_inputs(bundle_dict, environ=environ):
+        return enums.PlanBundleReturnCodes.BUNDLE_STALE, None
+
+    return enums.PlanBundleReturnCodes.BUNDLE_OK, bundle_dict
+
+
+class PlanBundleCompiler(object):
+    """
+        Compiles the whole dissection pipeline into a single versioned (JSON) bundle containing
+        every resolved launch input:
+            - the Popen arguments of each action, and its Scientific Parameters XML file (loaded by
+              Xml2ClassParser on each rank) along with the content digest of such file,
+            - the directory plan (the arrangement is not performed, only resolved),
+            - the srun options and deployment settings of the Co-Sim services,
+            - the communication settings,
+            - the Co-Simulation parameters.
+
+        The content digests of the input files, and the values of the environment variables
+        referenced while dissecting them, are recorded as well in order to detect stale bundles.
+    """
+
+    def __init__(self, log_settings, configurations_manager, variables_manager, plan_xml_path_filename,
+                 services_deployment_xml_path_filename=None, comm_settings_xml_path_filename=None,
+                 parameters_xml_path_filename=None,
+                 dissection_mode=constants.CO_SIM_DISSECTION_SEQUENTIAL, max_workers=None):
+        self.__log_settings = log_settings
+        self.__configurations_manager = configurations_manager
+        self.__logger = self.__configurations_manager.load_log_configurations(
+            name=__name__,
+            log_configurations=self.__log_settings)
+        self.__services_deployment_xml_path_filename = services_deployment_xml_path_filename
+        self.__comm_settings_xml_path_filename = comm_settings_xml_path_filename
+        # Co-Simulation parameters XML file, i.e. <co_simulation_parameters>
+        self.__parameters_xml_path_filename = parameters_xml_path_filename
+
+        self.__dissection_workspace = DissectionWorkspace(log_settings=log_settings,
+                                                          configurations_manager=configurations_manager,
+                                                          variables_manager=variables_manager,
+                                                          plan_xml_path_filename=plan_xml_path_filename,
+                                                          dissection_mode=dissection_mode,
+                                                          max_workers=max_workers)
+        self.__bundle_dict = None
+
+    def __add_input_file(self, inputs_dict, path_filename):
+        inputs_dict[os.path.realpath(path_filename)] = compute_file_digest(path_filename)
+
+    def __compile_co_sim_params(self, inputs_dict):
+        """
+        :return:
+            A tuple (return code, dictionary containing the Co-Simulation parameters to be dumped as JSON)
+        """
+        if self.__parameters_xml_path_filename is None:
+            return enums.XmlManagerReturnCodes.XML_OK, None
+
+        parameters_xml_manager = ParametersXmlManager(
+            log_settings=self.__log_settings,
+            configurations_manager=self.__configurations_manager,
+            xml_filename=self.__parameters_xml_path_filename,
+            name='ParametersXmlManager',
+            environment_snapshot=self.__dissection_workspace.get_variables_manager().get_environment_snapshot())
+        return_value = parameters_xml_manager.dissect()
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            self.__logger.error('Error found dissecting {}'.format(self.__parameters_xml_path_filename))
+            return return_value, None
+
+        self.__add_input_file(inputs_dict, self.__parameters_xml_path_filename)
+        return enums.XmlManagerReturnCodes.XML_OK, parameters_xml_manager.get_parameter_for_json_dict()
+
+    def compile(self):
+        """
+            Runs the whole dissection pipeline and builds the plan bundle dictionary
+
+        :return:
+            BUNDLE_OK: The plan bundle dictionary was built properly
+            BUNDLE_NOT_OK: Error found dissecting the XML files or resolving the directory plan
+        """
+        self.__bundle_dict = None
+
+        # STEP 1 - Action Plan and Actions XML files
+        if not self.__dissection_workspace.refresh() == enums.XmlManagerReturnCodes.XML_OK:
+            return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+
+        plan_xml_manager = self.__dissection_workspace.get_plan_xml_manager()
+        variables_manager = self.__dissection_workspace.get_variables_manager()
+        inputs_dict = self.__dissection_workspace.get_files_digests_dict()
+
+        # STEP 2 - Scientific Parameters XML files, they are not parsed here (see Xml2ClassParser)
+        actions_sci_params_xml_files_dict = self.__dissection_workspace.get_actions_sci_params_xml_files_dict()
+        actions_dict = {}
+        for action_id, popen_arguments_list in \
+                self.__dissection_workspace.get_actions_popen_arguments_dict().items():
+            sci_params_xml_path_filename = actions_sci_params_xml_files_dict[action_id]
+            sci_params_digest = None
+            if sci_params_xml_path_filename:
+                self.__add_input_file(inputs_dict, sci_params_xml_path_filename)
+                sci_params_digest = inputs_dict[os.path.realpath(sci_params_xml_path_filename)]
+            actions_dict[action_id] = {
+                constants.CO_SIM_PLAN_BUNDLE_POPEN_ARGUMENTS: popen_arguments_list,
+                constants.CO_SIM_PLAN_BUNDLE_SCI_PARAMS_XML: sci_params_xml_path_filename,
+                constants.CO_SIM_PLAN_BUNDLE_SCI_PARAMS_DIGEST: sci_params_digest}
+
+        # STEP 3 - directory plan
+        arranger = Arranger(log_settings=self.__log_settings,
+                            configurations_manager=self.__configurations_manager,
+                            variables_manager=variables_manager,
+                            items_to_be_arranged_dict=plan_xml_manager.get_items_to_be_arranged_dict())
+        return_value, arrangement_plan = arranger.get_arrangement_plan()
+        if not return_value == enums.ArrangerReturnCodes.OK:
+            self.__logger.error('Error found resolving the items to be arranged')
+            return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+
+        # STEP 4 - Co-Sim services deployment
+        services_deployment_dict = None
+        if self.__services_deployment_xml_path_filename is not None:
+            services_deployment_xml_manager = ServicesDeploymentXmlManager(
+                log_settings=self.__log_settings,
+                configurations_manager=self.__configurations_manager,
+                variables_manager=variables_manager,
+                xml_filename=self.__services_deployment_xml_path_filename,
+                name='ServicesDeploymentXmlManager')
+            if not services_deployment_xml_manager.dissect() == enums.XmlManagerReturnCodes.XML_OK:
+                self.__logger.error('Error found dissecting {}'.format(self.__services_deployment_xml_path_filename))
+                return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+            services_deployment_dict = services_deployment_xml_manager.get_services_deployment_dict()
+            self.__add_input_file(inputs_dict, self.__services_deployment_xml_path_filename)
+
+        # STEP 5 - communication settings
+        comm_settings_dict = None
+        if self.__comm_settings_xml_path_filename is not None:
+            comm_settings_xml_manager = CommunicationSettingsXmlManager(
+                log_settings=self.__log_settings,
+                configurations_manager=self.__configurations_manager,
+                xml_filename=self.__comm_settings_xml_path_filename,
+                name='CommunicationSettingsXmlManager',
+                environment_snapshot=variables_manager.get_environment_snapshot())
+            if not comm_settings_xml_manager.dissect() == enums.XmlManagerReturnCodes.XML_OK:
+                self.__logger.error('Error found dissecting {}'.format(self.__comm_settings_xml_path_filename))
+                return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+            comm_settings_dict = comm_settings_xml_manager.get_communication_settings_dict()
+            self.__add_input_file(inputs_dict, self.__comm_settings_xml_path_filename)
+
+        # STEP 6 - Co-Simulation parameters
+        return_value, co_sim_params_dict = self.__compile_co_sim_params(inputs_dict)
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+
+        self.__bundle_dict = {
+            constants.CO_SIM_PLAN_BUNDLE_VERSION_KEY: constants.CO_SIM_PLAN_BUNDLE_VERSION,
+            constants.CO_SIM_PLAN_BUNDLE_INPUTS: inputs_dict,
+            constants.CO_SIM_PLAN_BUNDLE_ENVIRONMENT:
+                dict(variables_manager.get_environment_snapshot().get_captured_variables()),
+            constants.CO_SIM_PLAN_BUNDLE_VARIABLES: dict(variables_manager.snapshot()),
+            constants.CO_SIM_PLAN_BUNDLE_ACTIONS: actions_dict,
+            constants.CO_SIM_PLAN_BUNDLE_ARRANGEMENT: arrangement_plan,
+            constants.CO_SIM_PLAN_BUNDLE_SERVICES_DEPLOYMENT: services_deployment_dict,
+            constants.CO_SIM_PLAN_BUNDLE_COMM_SETTINGS: comm_settings_dict,
+            constants.CO_SIM_PLAN_BUNDLE_CO_SIM_PARAMS: co_sim_params_dict,
+        }
+
+        return enums.PlanBundleReturnCodes.BUNDLE_OK
+
+    def write(self, bundle_path_filename):
+        """
+            Writes the compiled plan bundle, the file is replaced atomically
+            hence the readers never see a partially written bundle
+
+        :param bundle_path_filename: The plan bundle PATH+FILENAME
+        :return:
+            BUNDLE_OK: The plan bundle was written properly
+            BUNDLE_NOT_OK: The plan bundle has not been compiled or it could not be written
+        """
+        if self.__bundle_dict is None:
+            self.__logger.error('the plan bundle has not been compiled yet')
+            return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+
+        temporary_path_filename = '{}.{}.tmp'.format(bundle_path_filename, os.getpid())
+        try:
+            with open(temporary_path_filename, 'w') as bundle_file:
+                json.dump(self.__bundle_dict, bundle_file, separators=(',', ':'))
+            os.replace(temporary_path_filename, bundle_path_filename)
+        except (OSError, TypeError, ValueError) as error:
+            self.__logger.error('{} cannot be written: {}'.format(bundle_path_filename, error))
+            try:
+                os.remove(temporary_path_filename)
+            except OSError:
+                pass
+            return enums.PlanBundleReturnCodes.BUNDLE_NOT_OK
+
+        return enums.PlanBundleReturnCodes.BUNDLE_OK
+
+    def get_bundle_dict(self):
+        """
+        :return: Dictionary representing the compiled plan bundle, None when not compiled yet
+        """
+        return self.__bundle_dict
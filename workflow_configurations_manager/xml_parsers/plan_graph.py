@@ -0,0 +1,238 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import collections
+
+# Co-Simulator's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
+
+
+# Action or event of the action plan, dependencies is a tuple of node IDs following the action plan order
+PlanNode = collections.namedtuple('PlanNode', ['node_id',
+                                               'action_type',
+                                               'launch_method',
+                                               'event',
+                                               'dependencies'])
+
+
+class ActionPlanGraph(object):
+    """
+        Compiles the action plan into an explicit dependency graph (DAG) of actions and events,
+        where an edge means that a node cannot start until its dependency has finished:
+
+            - CO_SIM_SEQUENTIAL_ACTION: depends on the last barrier (sequential action or event),
+                                        and it becomes the barrier for the nodes after it.
+            - CO_SIM_CONCURRENT_ACTION: depends on the last barrier,
+                                        and it remains outstanding until a
+                                        CO_SIM_WAIT_FOR_CONCURRENT_ACTIONS event.
+            - CO_SIM_WAIT_FOR_CONCURRENT_ACTIONS: depends on the last barrier and on the
+                                        outstanding concurrent actions, and it becomes the barrier.
+            - CO_SIM_WAIT_FOR_SEQUENTIAL_ACTIONS: depends on the last barrier, and it becomes the barrier.
+
+        Hence, all the actions whose dependencies have finished could be started at once,
+        instead of following the sequential order of the action plan keys.
+    """
+
+    def __init__(self, log_settings, configurations_manager, action_plan):
+        self.__log_settings = log_settings
+        self.__configurations_manager = configurations_manager
+        self.__logger = self.__configurations_manager.load_log_configurations(
+            name=__name__,
+            log_configurations=self.__log_settings)
+        self.__action_plan = action_plan
+
+        # node ID -> PlanNode, following the action plan order
+        self.__nodes_dict = {}
+        # node ID -> tuple of node IDs depending on it
+        self.__dependents_dict = {}
+        self.__max_concurrency = 0
+
+    def build(self):
+        """
+            Builds the dependency graph from the action plan dictionary
+
+        :return:
+            XML_TAG_ERROR: An action has no <action_launch_method> or an event has no <action_event>
+            XML_VALUE_ERROR: Unknown launch method or event
+            XML_OK: The dependency graph was built properly
+        """
+        self.__nodes_dict = {}
+        self.__max_concurrency = 0
+
+        last_barrier_id = None
+        outstanding_concurrent_ids = []
+        for node_id, action_dict in self.__action_plan.items():
+            action_type = action_dict[xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE]
+            barrier_dependencies = () if last_barrier_id is None else (last_barrier_id,)
+
+            if action_type == constants.CO_SIM_ACTION:
+                try:
+                    launch_method = action_dict[xml_tags.CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD]
+                except KeyError:
+                    self.__logger.error('{} has no <{}>'.format(node_id,
+                                                                xml_tags.CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD))
+                    return enums.XmlManagerReturnCodes.XML_TAG_ERROR
+
+                if launch_method == constants.CO_SIM_SEQUENTIAL_ACTION:
+                    # the outstanding concurrent actions could be running meanwhile
+                    self.__max_concurrency = max(self.__max_concurrency, len(outstanding_concurrent_ids) + 1)
+                    last_barrier_id = node_id
+                elif launch_method == constants.CO_SIM_CONCURRENT_ACTION:
+                    outstanding_concurrent_ids.append(node_id)
+                    self.__max_concurrency = max(self.__max_concurrency, len(outstanding_concurrent_ids))
+                else:
+                    self.__logger.error('{} has <{}> a wrong value {}'.format(
+                        node_id, xml_tags.CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD, launch_method))
+                    return enums.XmlManagerReturnCodes.XML_VALUE_ERROR
+
+                self.__nodes_dict[node_id] = PlanNode(node_id=node_id,
+                                                      action_type=action_type,
+                                                      launch_method=launch_method,
+                                                      event=None,
+                                                      dependencies=barrier_dependencies)
+                continue
+
+            # CO_SIM_EVENT
+            try:
+                event = action_dict[xml_tags.CO_SIM_XML_PLAN_ACTION_EVENT]
+            except KeyError:
+                self.__logger.error('{} has no <{}>'.format(node_id, xml_tags.CO_SIM_XML_PLAN_ACTION_EVENT))
+                return enums.XmlManagerReturnCodes.XML_TAG_ERROR
+
+            if event == constants.CO_SIM_WAIT_FOR_CONCURRENT_ACTIONS:
+                dependencies = barrier_dependencies + tuple(outstanding_concurrent_ids)
+                outstanding_concurrent_ids = []
+            elif event == constants.CO_SIM_WAIT_FOR_SEQUENTIAL_ACTIONS:
+                # the sequential actions are already awaited by the barrier
+                dependencies = barrier_dependencies
+            else:
+                self.__logger.error('{} has <{}> a wrong value {}'.format(
+                    node_id, xml_tags.CO_SIM_XML_PLAN_ACTION_EVENT, event))
+                return enums.XmlManagerReturnCodes.XML_VALUE_ERROR
+
+            self.__nodes_dict[node_id] = PlanNode(node_id=node_id,
+                                                  action_type=action_type,
+                                                  launch_method=None,
+                                                  event=event,
+                                                  dependencies=dependencies)
+            last_barrier_id = node_id
+
+        if outstanding_concurrent_ids:
+            self.__logger.warning('{} are not awaited by any {} event'.format(
+                outstanding_concurrent_ids, constants.CO_SIM_WAIT_FOR_CONCURRENT_ACTIONS))
+
+        dependents_dict = {node_id: [] for node_id in self.__nodes_dict}
+        for node in self.__nodes_dict.values():
+            for dependency_id in node.dependencies:
+                dependents_dict[dependency_id].append(node.node_id)
+        self.__dependents_dict = {node_id: tuple(dependents) for node_id, dependents in dependents_dict.items()}
+
+        return enums.XmlManagerReturnCodes.XML_OK
+
+    def __is_action(self, node_id):
+        return self.__nodes_dict[node_id].action_type == constants.CO_SIM_ACTION
+
+    def get_nodes_dict(self):
+        """
+        :return: Dictionary containing the PlanNode by node ID, following the action plan order
+        """
+        return self.__nodes_dict
+
+    def get_dependents(self, node_id):
+        """
+        :return: Tuple containing the IDs of the nodes depending on node_id
+        """
+        return self.__dependents_dict[node_id]
+
+    def get_ready_nodes(self, finished_node_ids=(), started_node_ids=()):
+        """
+            Gathers the nodes able to be started, i.e. whose dependencies have finished,
+            in order to start them at once
+
+        :param finished_node_ids: IDs of the nodes already finished
+        :param started_node_ids: IDs of the nodes already started (running or finished)
+        :return:
+            List containing the IDs of the nodes ready to be started, following the action plan order
+        """
+        finished_node_ids = set(finished_node_ids)
+        started_node_ids = set(started_node_ids) | finished_node_ids
+        return [node.node_id for node in self.__nodes_dict.values()
+                if node.node_id not in started_node_ids and finished_node_ids.issuperset(node.dependencies)]
+
+    def get_waves(self):
+        """
+            Groups the actions into waves, each wave contains the actions able to be started at once
+            as soon as the previous waves have finished. The events take no time, hence they do not
+            introduce waves by themselves.
+
+        :return:
+            List of lists containing action IDs
+        """
+        # node ID -> wave where it finishes
+        finishing_wave_dict = {}
+        waves = []
+        # the action plan order is a topological order of the graph
+        for node in self.__nodes_dict.values():
+            starting_wave = max((finishing_wave_dict[dependency_id] for dependency_id in node.dependencies),
+                                default=0)
+            if self.__is_action(node.node_id):
+                if starting_wave == len(waves):
+                    waves.append([])
+                waves[starting_wave].append(node.node_id)
+                finishing_wave_dict[node.node_id] = starting_wave + 1
+            else:
+                finishing_wave_dict[node.node_id] = starting_wave
+
+        return waves
+
+    def get_critical_path(self, durations_dict=None):
+        """
+            Finds the longest chain of dependent nodes, which bounds the makespan of the action plan
+
+        :param durations_dict: Estimated duration by action ID, by default each action lasts 1 unit
+                               and the events take no time
+        :return:
+            A tuple (length of the critical path, list of the node IDs on it)
+        """
+        if durations_dict is None:
+            durations_dict = {}
+
+        # node ID -> (finishing time, predecessor on the longest path)
+        finishing_times_dict = {}
+        for node in self.__nodes_dict.values():
+            starting_time, predecessor_id = 0, None
+            for dependency_id in node.dependencies:
+                if finishing_times_dict[dependency_id][0] > starting_time or predecessor_id is None:
+                    starting_time, predecessor_id = finishing_times_dict[dependency_id][0], dependency_id
+            duration = durations_dict.get(node.node_id, 1 if self.__is_action(node.node_id) else 0)
+            finishing_times_dict[node.node_id] = (starting_time + duration, predecessor_id)
+
+        if not finishing_times_dict:
+            return 0, []
+
+        node_id = max(finishing_times_dict, key=lambda current_id: finishing_times_dict[current_id][0])
+        critical_path_length = finishing_times_dict[node_id][0]
+        critical_path = []
+        while node_id is not None:
+            critical_path.append(node_id)
+            node_id = finishing_times_dict[node_id][1]
+
+        return critical_path_length, critical_path[::-1]
+
+    def get_max_concurrency(self):
+        """
+        :return: The maximum number of actions that could be running at the same time
+        """
+        return self.__max_concurrency
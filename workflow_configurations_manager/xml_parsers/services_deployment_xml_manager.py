@@ -29,8 +29,12 @@ class ServicesDeploymentXmlManager(XmlManager):
              on local systems where multiple cores could be used.
     """
 
-    def __init__(self, log_settings, configurations_manager, variables_manager, xml_filename, name):
-        super().__init__(log_settings, configurations_manager, xml_filename, name)
+    def __init__(self, log_settings, configurations_manager, variables_manager, xml_filename, name,
+                 environment_snapshot=None):
+        if environment_snapshot is None:
+            environment_snapshot = variables_manager.get_environment_snapshot()
+        super().__init__(log_settings, configurations_manager, xml_filename, name,
+                         environment_snapshot=environment_snapshot)
 
         self.__services_deployment_dict = None
         self.__variables_manager = variables_manager
@@ -11,6 +11,7 @@
 #       Team: Multi-scale Simulation and Design
 #
 # ------------------------------------------------------------------------------
+import hashlib
 import os
 import re
 
@@ -71,17 +72,42 @@ def transform_co_simulation_variables_into_values(variables_manager=None, functi
     return transformed_variable_value
 
 
-def transform_environment_variables_into_values(functional_variable_value=None):
+def find_co_simulation_variables_references(functional_variable_value=None):
+    """
+        Gathers the names of the {CO_SIM_<something>} references without transforming them
+
+    :param
+        functional_variable_value: String containing reference(s) to CO_SIM_* variable(s)
+
+    :return:
+        Set containing the referenced CO_SIM_* variables names
+    """
+    referenced_variables_names = set()
+
+    split_variable_list = re.split(constants.CO_SIM_REGEX_CO_SIM_VARIABLE, functional_variable_value)
+    for previous_piece, current_piece in zip(split_variable_list, split_variable_list[1:]):
+        if previous_piece == '{CO_SIM_':
+            referenced_variables_names.add('CO_SIM_' + current_piece)
+
+    return referenced_variables_names
+
+
+def transform_environment_variables_into_values(functional_variable_value=None, environment=None):
     """
         Replaces the ${ENV_VAR_NAME} references into the run-time values of such variables
 
     :param
         functional_variable_value: String containing reference to environment variables
+        environment: Mapping where the values are taken from, e.g. an EnvironmentSnapshot,
+                    os.environ is used when it is not passed
 
     :return:
         transformed_variable_value: Transformed string containing
                                 the run-time values of the referenced environment variables
     """
+    if environment is None:
+        environment = os.environ
+
     transformed_variable_value = ''
 
     # finding environment variables
@@ -99,7 +125,7 @@ def transform_environment_variables_into_values(functional_variable_value=None):
             next_piece_is_the_closing_curly_brace = True  # after processing the environment variable a '}' is expected
             try:
                 # getting the environment variable value from the running system
-                transformed_variable_value += os.environ[current_piece]
+                transformed_variable_value += environment[current_piece]
             except KeyError:
                 transformed_variable_value = ''
                 raise exceptions.EnvironmentVariableNotSet(current_piece)
@@ -113,3 +139,22 @@ def transform_environment_variables_into_values(functional_variable_value=None):
             transformed_variable_value += current_piece
 
     return transformed_variable_value
+
+
+def compute_file_digest(path_filename, chunk_size=1 << 16):
+    """
+        Computes the SHA-256 digest of the content of a file
+
+    :param path_filename: The file PATH+FILENAME
+    :param chunk_size: Amount of bytes read at once
+    :return:
+        The hexadecimal digest, or None when the file cannot be read
+    """
+    file_hash = hashlib.sha256()
+    try:
+        with open(path_filename, 'rb') as file_object:
+            for chunk in iter(lambda: file_object.read(chunk_size), b''):
+                file_hash.update(chunk)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
@@ -29,9 +29,20 @@ CO_SIM_MODULES_ROOT_PATH = 'CO_SIM_MODULES_ROOT_PATH'  # mutilscale-cosim/EBRAIN
 
 # SLURM's SLURM_NNODES equivalent
 # in order to have the base amount of allocated resources
-# IMPORTANT: CO_SIM_SLURM_NODE_?? are created dynamically
-#            based on the allocated resources
+# IMPORTANT: CO_SIM_SLURM_NODE_??? are created dynamically (on demand, when they are referenced)
+#            based on the allocated resources, e.g. CO_SIM_SLURM_NODE_000, CO_SIM_SLURM_NODE_001
 CO_SIM_SLURM_NNODES = 'CO_SIM_SLURM_NNODES'
+CO_SIM_SLURM_NODE_PREFIX = 'CO_SIM_SLURM_NODE_'
+
+# Placement of the actions onto the allocated resources
+# IMPORTANT: CO_SIM_PLACEMENT_<ACTION_ID>_* are created dynamically by the placement planner,
+#            e.g. CO_SIM_PLACEMENT_ACTION_000_NODELIST, CO_SIM_PLACEMENT_ACTION_000_NTASKS
+CO_SIM_PLACEMENT_PREFIX = 'CO_SIM_PLACEMENT_'
+CO_SIM_PLACEMENT_NODELIST_SUFFIX = '_NODELIST'
+CO_SIM_PLACEMENT_NNODES_SUFFIX = '_NNODES'
+CO_SIM_PLACEMENT_NTASKS_SUFFIX = '_NTASKS'
+CO_SIM_PLACEMENT_TASKS_PER_NODE_SUFFIX = '_TASKS_PER_NODE'
+CO_SIM_PLACEMENT_CPUS_PER_TASK_SUFFIX = '_CPUS_PER_TASK'
 
 
 # The RESULTS path must be assigned on run-time gathered by means of the configuration manager
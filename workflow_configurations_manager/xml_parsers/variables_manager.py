@@ -11,46 +11,134 @@
 #       Team: Multi-scale Simulation and Design
 #
 # ------------------------------------------------------------------------------
-import os
+import collections
 import re
+import sys
+import types
 
 # Co-Simulator Imports
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import enums
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import variables
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import hostlist
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import utils
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.environment_snapshot import EnvironmentSnapshot
 
 
 class VariablesManager(object):
     """
         Manages the variables related to the run-time environment
+
+        NOTE: The variables are stored per instance on a compact layout,
+              the values are kept in one flat dictionary and the descriptions
+              (interned strings) in another one, both keyed by variable name.
     """
-    __logger = None
-    __dict = {}
+    __slurm_node_variable_regex = re.compile(constants.CO_SIM_REGEX_SLURM_NODE_VARIABLE)
 
-    def __init__(self, log_settings, configurations_manager):
+    def __init__(self, log_settings, configurations_manager, environment_snapshot=None):
         self.__log_settings = log_settings
         self.__configurations_manager = configurations_manager
         self.__logger = self.__configurations_manager.load_log_configurations(
             name=__name__,
             log_configurations=self.__log_settings)
+        # environment variables (e.g. SLURM_*) seen by the whole dissection process
+        if environment_snapshot is None:
+            environment_snapshot = EnvironmentSnapshot()
+        self.__environment_snapshot = environment_snapshot
+
+        # variable name -> variable value
+        self.__values = {}
+        # variable name -> variable description
+        self.__descriptions = {}
+        # compressed allocated nodes, the CO_SIM_SLURM_NODE_NNN variables
+        # are materialized from it only when they are referenced
+        self.__slurm_hostlist = None
 
         for curr_co_sim_variable in variables.CO_SIM_VARIABLES_TUPLE:
-            self.__dict.update({curr_co_sim_variable: {constants.CO_SIM_VARIABLE_DESCRIPTION: '',
-                                                       constants.CO_SIM_VARIABLE_VALUE: None}})
+            self.__declare(curr_co_sim_variable, description='', value=None)
 
         # CO_SIM_EMPTY is used as a "None" value for CO_SIM_<variable>,
         # hence an EMPTY string is assigned as a value to it
-        self.__dict.update({'CO_SIM_EMPTY': {constants.CO_SIM_VARIABLE_DESCRIPTION: '',
-                                             constants.CO_SIM_VARIABLE_VALUE: ''}})
+        self.__declare(variables.CO_SIM_EMPTY, description='', value='')
+
+    def __declare(self, variable_name, description, value):
+        """
+            Creates (or overwrites) a variable on the store
+
+        :param variable_name: The CO_SIM_* variable name
+        :param description: Text describing the variable, it will be interned
+        :param value: The run-time value of the variable
+        """
+        self.__values[variable_name] = value
+        self.__descriptions[variable_name] = sys.intern(description)
+
+    def __materialize_slurm_node_variable(self, variable_name):
+        """
+            Creates the CO_SIM_SLURM_NODE_NNN variable from the allocated nodes
+            the first time it is referenced
+
+        :param variable_name: The CO_SIM_* variable name not found on the store
+        :return: The hostname assigned to the variable
+        :raise KeyError: variable_name is not a CO_SIM_SLURM_NODE_NNN of the allocated nodes
+        """
+        match = self.__slurm_node_variable_regex.match(variable_name)
+        if self.__slurm_hostlist is None or not match:
+            raise KeyError(variable_name)
+
+        n_correlative = int(match.group(1))
+        # only the canonical names are valid, e.g. CO_SIM_SLURM_NODE_007 but not CO_SIM_SLURM_NODE_0007
+        if n_correlative >= len(self.__slurm_hostlist) or \
+                not variable_name == f'{variables.CO_SIM_SLURM_NODE_PREFIX}{n_correlative:0>3d}':
+            raise KeyError(variable_name)
+
+        hpc_node_name = self.__slurm_hostlist[n_correlative]
+        self.__declare(variable_name,
+                       description=f'SLURM compute node hostname {n_correlative:0>3d}',
+                       value=hpc_node_name)
+        return hpc_node_name
 
     def get_value(self, variable_name):
         """
         :param variable_name: The environment variable name which the value is being gotten (requested)
         :return: The value of the passed variable name
         """
-        return self.__dict[variable_name][constants.CO_SIM_VARIABLE_VALUE]
+        try:
+            return self.__values[variable_name]
+        except KeyError:
+            return self.__materialize_slurm_node_variable(variable_name)
+
+    def get_description(self, variable_name):
+        """
+        :param variable_name: The CO_SIM_* variable name which the description is being requested
+        :return: The description of the passed variable name
+        """
+        if variable_name not in self.__descriptions:
+            self.__materialize_slurm_node_variable(variable_name)
+        return self.__descriptions[variable_name]
+
+    def get_slurm_hostlist(self):
+        """
+        :return: HostList with the allocated nodes, None when no SLURM allocation has been processed
+        """
+        return self.__slurm_hostlist
+
+    def get_slurm_nodes_count(self):
+        """
+        :return: Amount of allocated nodes, i.e. amount of CO_SIM_SLURM_NODE_NNN variables
+        """
+        return 0 if self.__slurm_hostlist is None else len(self.__slurm_hostlist)
+
+    def iter_slurm_node_variables(self):
+        """
+            Goes through the CO_SIM_SLURM_NODE_NNN variables without materializing them
+
+        :return: Generator of (variable name, hostname) tuples
+        """
+        if self.__slurm_hostlist is None:
+            return
+        for n_correlative, hpc_node_name in enumerate(self.__slurm_hostlist):
+            yield f'{variables.CO_SIM_SLURM_NODE_PREFIX}{n_correlative:0>3d}', hpc_node_name
 
     def set_value(self, variable_name, variable_value):
         """
@@ -58,15 +146,82 @@ class VariablesManager(object):
         :param variable_value:
         :param variable_name:
         :return:
+            Dictionary with the description and the value of the variable
         """
         try:
-            self.__dict[variable_name][constants.CO_SIM_VARIABLE_VALUE] = variable_value
+            self.get_value(variable_name)
         except KeyError:
             # TODO handle exception here
             self.__logger.error('{} has not been declared in the variable manager yet'.format(variable_name))
             raise exceptions.CoSimVariableNotFound(co_sim_variable_name=variable_name)
 
-        return self.__dict[variable_name]
+        self.__values[variable_name] = variable_value
+
+        return {constants.CO_SIM_VARIABLE_DESCRIPTION: self.__descriptions[variable_name],
+                constants.CO_SIM_VARIABLE_VALUE: variable_value}
+
+    def get_environment_snapshot(self):
+        """
+        :return: The environment snapshot used to resolve the run-time variables
+        """
+        return self.__environment_snapshot
+
+    def snapshot(self):
+        """
+            Takes a read-only copy of the current variables' values
+
+        :return:
+            Read-only mapping (variable name -> value) which is not affected
+            by further changes on the variables manager
+        """
+        # NOTE: the CO_SIM_SLURM_NODE_NNN variables not referenced yet are not included
+        return types.MappingProxyType(dict(self.__values))
+
+    def fork(self):
+        """
+            Creates an independent copy of the variables manager, sharing the logger
+            and the configurations manager but not the variables store, hence changes
+            on the forked instance are not seen by this one and vice versa.
+
+        :return:
+            A new VariablesManager instance with a copy of the current variables
+        """
+        forked_variables_manager = self.__class__.__new__(self.__class__)
+        forked_variables_manager.__log_settings = self.__log_settings
+        forked_variables_manager.__configurations_manager = self.__configurations_manager
+        forked_variables_manager.__logger = self.__logger
+        forked_variables_manager.__environment_snapshot = self.__environment_snapshot
+        forked_variables_manager.__slurm_hostlist = self.__slurm_hostlist
+        # shallow copies, the values are immutable objects (strings, integers)
+        # NOTE: dict() flattens the layers when the instance is a scope (see create_scope)
+        forked_variables_manager.__values = dict(self.__values)
+        forked_variables_manager.__descriptions = dict(self.__descriptions)
+
+        return forked_variables_manager
+
+    def create_scope(self):
+        """
+            Creates a variables scope layered on top of the current one, e.g.
+                global variables <- plan variables <- action variables
+
+            The lookups fall through the layers (ChainMap), meanwhile the
+            variables created or set on the scope are only visible on it,
+            the underlying variables remains untouched. Creating a scope
+            does not copy the variables, it costs O(1).
+
+        :return:
+            A new VariablesManager instance representing the overlay scope
+        """
+        scoped_variables_manager = self.__class__.__new__(self.__class__)
+        scoped_variables_manager.__log_settings = self.__log_settings
+        scoped_variables_manager.__configurations_manager = self.__configurations_manager
+        scoped_variables_manager.__logger = self.__logger
+        scoped_variables_manager.__environment_snapshot = self.__environment_snapshot
+        scoped_variables_manager.__slurm_hostlist = self.__slurm_hostlist
+        scoped_variables_manager.__values = collections.ChainMap({}, self.__values)
+        scoped_variables_manager.__descriptions = collections.ChainMap({}, self.__descriptions)
+
+        return scoped_variables_manager
 
     def set_co_sim_variable_values_from_variables_dict(self, variables_dictionary_source):
         """
@@ -76,19 +231,19 @@ class VariablesManager(object):
 
         """
         for key, value in variables_dictionary_source.items():
-            try:
-                self.__dict[key][constants.CO_SIM_VARIABLE_VALUE] = value
-            except KeyError:
+            if key not in self.__values:
                 self.__logger.error('{} is not a defined Co-Simulator variable'.format(key))
                 return enums.VariablesReturnCodes.VARIABLE_NOT_OK
 
+            self.__values[key] = value
+
             # In this point, key is a recognized (defined) CO_SIM_ variable
             # hence, the value to assigned to it could be another CO_SIM variable
             # IMPORTANT: The order how the CO_SIM variables are referenced is relevant
             #            for the proper processing (conversion into values).
             run_time_value = utils.transform_co_simulation_variables_into_values(variables_manager=self,
                                                                                  functional_variable_value=value)
-            self.__dict[key][constants.CO_SIM_VARIABLE_VALUE] = run_time_value
+            self.__values[key] = run_time_value
 
         return enums.VariablesReturnCodes.VARIABLE_OK
 
@@ -136,8 +291,7 @@ class VariablesManager(object):
                 return enums.ParametersReturnCodes.VARIABLE_NOT_FOUND
 
             # creating the new CO_SIM_ variable
-            self.__dict[key] = {constants.CO_SIM_VARIABLE_DESCRIPTION: 'created on run time',
-                                constants.CO_SIM_VARIABLE_VALUE: runtime_variable_value}
+            self.__declare(key, description='created on run time', value=runtime_variable_value)
         return enums.ParametersReturnCodes.PARAMETER_OK
 
     def create_co_sim_run_time_variables(self):
@@ -150,20 +304,19 @@ class VariablesManager(object):
         """
         # CO_SIM_LAUNCHER
         try:
-            execution_environment = \
-                self.__dict[variables.CO_SIM_EXECUTION_ENVIRONMENT][constants.CO_SIM_VARIABLE_VALUE]
+            execution_environment = self.__values[variables.CO_SIM_EXECUTION_ENVIRONMENT]
         except KeyError:
             self.__logger.error('{} has not been set yet'.format(variables.CO_SIM_EXECUTION_ENVIRONMENT))
             return enums.VariablesReturnCodes.VARIABLE_NOT_OK
         else:
             if execution_environment.upper() == 'LOCAL':
-                self.__dict[variables.CO_SIM_LAUNCHER] = \
-                    {constants.CO_SIM_VARIABLE_DESCRIPTION: 'launcher created on run time',
-                     constants.CO_SIM_VARIABLE_VALUE: 'mpirun'}
+                self.__declare(variables.CO_SIM_LAUNCHER,
+                               description='launcher created on run time',
+                               value='mpirun')
             elif execution_environment.upper() == 'CLUSTER':
-                self.__dict[variables.CO_SIM_LAUNCHER] = \
-                    {constants.CO_SIM_VARIABLE_DESCRIPTION: 'launcher created on run time',
-                     constants.CO_SIM_VARIABLE_VALUE: 'srun'}
+                self.__declare(variables.CO_SIM_LAUNCHER,
+                               description='launcher created on run time',
+                               value='srun')
 
                 # In this point of execution, it is clear that the run-time environment is a HPC cluster,
                 #  assumed that the SLURM's resources have been allocated by means
@@ -189,10 +342,8 @@ class VariablesManager(object):
 
         # No. of requested HPC nodes
         try:
-            n_nodes = int(os.environ['SLURM_NNODES'])
-            self.__dict[variables.CO_SIM_SLURM_NNODES] = \
-                {constants.CO_SIM_VARIABLE_DESCRIPTION: 'SLURM_NNODES',
-                 constants.CO_SIM_VARIABLE_VALUE: n_nodes}
+            n_nodes = int(self.__environment_snapshot['SLURM_NNODES'])
+            self.__declare(variables.CO_SIM_SLURM_NNODES, description='SLURM_NNODES', value=n_nodes)
         except KeyError:
             self.__logger.error('SLURM_NNODES environment variable has not been set yet, use "salloc"')
             return enums.VariablesReturnCodes.VARIABLE_NOT_FOUND
@@ -204,53 +355,22 @@ class VariablesManager(object):
         #   SLURM_NNODES=3
         #   SLURM_JOB_NODELIST=jwc00n[001-002,004]
         #   SLURM_NODELIST=jwc00n[001-002,004]
-        slurm_node_list_prefix_and_range = re.split('\[|\]', os.environ['SLURM_NODELIST'])
-        node_range_length = len(slurm_node_list_prefix_and_range)
-        if 0 == node_range_length:
+        #   SLURM_NODELIST=jwc[01-02],jwb[10-12]  -> 5 Nodes from different partitions
+        try:
+            slurm_hostlist = hostlist.parse_hostlist(self.__environment_snapshot['SLURM_NODELIST'])
+        except KeyError:
             self.__logger.error('SLURM_NODELIST environment variable has not been set yet, use "salloc"')
             return enums.VariablesReturnCodes.VALUE_NOT_SET
-        elif 1 == node_range_length and node_range_length != n_nodes:
-            # There is no match between SLURM_NNODES and SLURM_NODELIST
-            self.__logger.error('SLURM_NODELIST does not match with SLURM_NODELIST, it might be "salloc" failed')
+        except exceptions.SlurmHostlistFormatError as SlurmHostlistFormatError:
+            self.__logger.error(SlurmHostlistFormatError)
             return enums.VariablesReturnCodes.VARIABLE_NOT_OK
-        elif 1 == node_range_length:
-            # only one HPC node is being used
-            #
-            # This is a wrong assignment: self.__dict['CO_SIM_SLURM_NODE_000'] = slurm_node_list_prefix_and_range[0]
-            #
-            self.__dict['CO_SIM_SLURM_NODE_000'] = \
-                {constants.CO_SIM_VARIABLE_DESCRIPTION: 'SLURM compute node hostname',
-                 constants.CO_SIM_VARIABLE_VALUE: slurm_node_list_prefix_and_range[0]}
-        else:
-            # two or more HPC nodes have been allocated
-            hpc_nodes_name_prefix = slurm_node_list_prefix_and_range[0]
-            # getting suffix node range(s), e.g. 012-014; and suffix node ID, e.g. 004 per se
-            hpc_nodes_name_suffix_groups_list = re.split(r',', slurm_node_list_prefix_and_range[1])
 
-            n_correlative = 0   # CO_SIM_SLURM_NODE_<n_correlative>
-            for curr_hpc_nodes_suffix_group in hpc_nodes_name_suffix_groups_list:
-
-                hpc_nodes_suffix_range_limits_list = [None, None]
-                hpc_nodes_suffix_range_limits_index = 0
-                hpc_nodes_suffix_range_list = re.split(r'-', curr_hpc_nodes_suffix_group)
-
-                for curr_hpc_nodes_suffix_limit in hpc_nodes_suffix_range_list:
-                    hpc_nodes_suffix_range_limits_list[hpc_nodes_suffix_range_limits_index] = \
-                        int(curr_hpc_nodes_suffix_limit)
-                    hpc_nodes_suffix_range_limits_index = 1
-
-                if hpc_nodes_suffix_range_limits_list[1] is None:
-                    # there is no upper limit, meaning there is only one node on the group
-                    hpc_nodes_suffix_range_limits_list[1] = int(hpc_nodes_suffix_range_limits_list[0])
-
-                for curr_n_node_name_suffix in range(hpc_nodes_suffix_range_limits_list[0],
-                                                     hpc_nodes_suffix_range_limits_list[1] + 1):
-                    co_sim_slurm_node_variable_name = f'CO_SIM_SLURM_NODE_{n_correlative:0>3d}'
-
-                    self.__dict[co_sim_slurm_node_variable_name] = \
-                        {constants.CO_SIM_VARIABLE_DESCRIPTION: f'SLURM compute node hostname {n_correlative:0>3d}',
-                         constants.CO_SIM_VARIABLE_VALUE: f'{hpc_nodes_name_prefix}{curr_n_node_name_suffix:0>3d}'}
+        if not len(slurm_hostlist) == n_nodes:
+            # There is no match between SLURM_NNODES and SLURM_NODELIST
+            self.__logger.error('SLURM_NODELIST does not match with SLURM_NNODES, it might be "salloc" failed')
+            return enums.VariablesReturnCodes.VARIABLE_NOT_OK
 
-                    n_correlative += 1
+        # CO_SIM_SLURM_NODE_<n_correlative> variables will be materialized when they are referenced
+        self.__slurm_hostlist = slurm_hostlist
 
         return enums.VariablesReturnCodes.VARIABLE_OK
@@ -12,15 +12,59 @@
 #
 # ------------------------------------------------------------------------------
 
+import io
+import os
+import threading
 from xml.etree.ElementTree import iterparse
-import numpy as np
 
 
 # Co-Sim's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import array_payloads
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import parameters_shared_memory
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import parameters_types
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.parameters_cache import ParametersCache
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.parameters_index import ParametersIndex
+
+
+# text values of the BOOL nodes, compared in lower case
+_BOOLEAN_VALUES_DICT = {'true': True, '1': True, 'yes': True, 'on': True,
+                        'false': False, '0': False, 'no': False, 'off': False}
+
+
+def _convert_integers(texts):
+    return list(map(int, texts))
+
+
+def _convert_floats(texts):
+    return list(map(float, texts))
+
+
+def _convert_strings(texts):
+    return list(texts)  # assigned as they are on the XML file
+
+
+def _convert_booleans(texts):
+    return [_BOOLEAN_VALUES_DICT[text.strip().lower()] for text in texts]
+
+
+def _convert_complexes(texts):
+    return [complex(text.strip()) for text in texts]
+
 
 class ConvertXmlNodeTextToDatatype(object):
     """
         XML's Node Data Conversion
+
+        The datatype attribute is looked up in a dispatch table of bulk converters, i.e. functions
+        converting a list of node texts at once, hence consecutive scalar siblings of the same datatype
+        are converted together:
+
+            INT, INTEGER, FLOAT, STR, STRING, BOOL, BOOLEAN (true/false, 1/0, yes/no, on/off), COMPLEX
+
+        LIST and TUPLE nodes without sub-elements hold homogeneous sequences in their text,
+        separated by the sep attribute (comma by default) and converted into item_datatype, e.g.
+            <delays datatype="TUPLE" item_datatype="FLOAT">1.0, 1.5, 2.0</delays>
     """
 
     #
@@ -29,8 +73,82 @@ class ConvertXmlNodeTextToDatatype(object):
     #             going to parse it out.
     #
     def __init__(self):
-        self.__integer_labels_list = ['INT', 'INTEGER']
-        self.__string_labels_list = ['STR', 'STRING']
+        # datatype label -> bulk converter, the labels as written on the XML files are added on demand
+        self.__bulk_converters_dict = {
+            'INT': _convert_integers,
+            'INTEGER': _convert_integers,
+            'FLOAT': _convert_floats,
+            'STR': _convert_strings,
+            'STRING': _convert_strings,
+            'BOOL': _convert_booleans,
+            'BOOLEAN': _convert_booleans,
+            'COMPLEX': _convert_complexes,
+        }
+        # datatype label -> sequence type
+        self.__sequence_types_dict = {'LIST': list, 'TUPLE': tuple}
+
+    def get_bulk_converter(self, datatype):
+        """
+        :param datatype: The datatype attribute as written on the XML file, e.g. 'int'
+        :return: The function converting a list of texts into such datatype, None for unknown datatypes
+        """
+        try:
+            return self.__bulk_converters_dict[datatype]
+        except KeyError:
+            pass
+        bulk_converter = self.__bulk_converters_dict.get(datatype.upper())
+        if bulk_converter is not None:
+            self.__bulk_converters_dict[datatype] = bulk_converter
+        return bulk_converter
+
+    def get_sequence_type(self, datatype):
+        """
+        :return: list or tuple for the LIST or TUPLE datatypes, None otherwise
+        """
+        return self.__sequence_types_dict.get(datatype.upper())
+
+    def convert_texts(self, bulk_converter, texts, node_tags):
+        """
+            Converts the texts of several nodes at once
+
+        :param bulk_converter: See get_bulk_converter
+        :param texts: List of node texts
+        :param node_tags: List of the node tags, for reporting
+        :return:
+            List of the converted values
+        """
+        try:
+            return bulk_converter(texts)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+
+        # finding the wrong one
+        for text, node_tag in zip(texts, node_tags):
+            try:
+                bulk_converter([text])
+            except (AttributeError, KeyError, TypeError, ValueError):
+                raise exceptions.XmlDatatypeError(node_tag, 'wrong value {!r}'.format(text))
+        raise exceptions.XmlDatatypeError(node_tags, 'wrong values')
+
+    def sequence_text_to_datatype(self, node, sequence_type):
+        """
+            Converts the text of a LIST or TUPLE node without sub-elements into a homogeneous sequence
+
+        :param node: XML's node, its item_datatype attribute is STR by default
+        :param sequence_type: list or tuple
+        :return:
+            The sequence
+        """
+        item_datatype = node.attrib.get('item_datatype', 'STR')
+        bulk_converter = self.get_bulk_converter(item_datatype)
+        if bulk_converter is None:
+            raise exceptions.XmlDatatypeError(node.tag, 'unknown item_datatype {}'.format(item_datatype))
+        separator = node.attrib.get('sep', ',')
+        texts = [text.strip() for text in (node.text or '').split(separator)]
+        if texts and not texts[-1]:
+            # trailing separator
+            texts.pop()
+        return sequence_type(self.convert_texts(bulk_converter, texts, [node.tag] * len(texts)))
 
     def node_text_to_datatype(self, node=None):
         """
@@ -39,41 +157,149 @@ class ConvertXmlNodeTextToDatatype(object):
         :param node:
             XML's node containing data to be transformed
         :return:
-            The data converted as Python's data type
+            The data converted as Python's data type, None when the node has no datatype
         """
         l_node_datatype = node.attrib.get('datatype')
-        if l_node_datatype:
-            l_node_datatype = l_node_datatype.upper()
-
-            if l_node_datatype in self.__integer_labels_list:
-                return int(node.text)
-            elif 'FLOAT' == l_node_datatype:
-                return float(node.text)
-            elif l_node_datatype in self.__string_labels_list:
-                return node.text  # assigned as it is on the XML file
-            else:
-                return None
+        if not l_node_datatype:
+            return None
+
+        bulk_converter = self.get_bulk_converter(l_node_datatype)
+        if bulk_converter is not None:
+            return self.convert_texts(bulk_converter, [node.text], [node.tag])[0]
+
+        sequence_type = self.get_sequence_type(l_node_datatype)
+        if sequence_type is not None:
+            return self.sequence_text_to_datatype(node, sequence_type)
+
+        raise exceptions.XmlDatatypeError(node.tag, 'unknown datatype {}'.format(l_node_datatype))
+
+
+class _ScalarSiblingsBatch(object):
+    """
+        Consecutive scalar siblings of the same datatype, converted at once when the batch is flushed
+    """
+    __slots__ = ('container', 'bulk_converter', 'node_tags', 'texts')
+
+    def __init__(self):
+        self.container = None
+        self.bulk_converter = None
+        self.node_tags = []
+        self.texts = []
+
+    def is_continued_by(self, container, bulk_converter):
+        return container is self.container and bulk_converter is self.bulk_converter
+
+    def start(self, container, bulk_converter):
+        self.container = container
+        self.bulk_converter = bulk_converter
+
+    def flush(self, convert_xml_node_text_to_datatype):
+        """
+            Converts the texts and places the values into their container
+        """
+        if not self.texts:
+            return
+        values = convert_xml_node_text_to_datatype.convert_texts(self.bulk_converter, self.texts, self.node_tags)
+        if isinstance(self.container, list):
+            self.container.extend(values)
+        else:
+            self.container.update(zip(self.node_tags, values))
+        self.container = None
+        self.bulk_converter = None
+        self.node_tags = []
+        self.texts = []
 
 
 class Xml2ClassParser:
     """
         XML Parser to create a class based on the passed XML PATH+FILENAME
-    """
 
-    #
-    # TO BE DONE: Support for Python's list, tuples among others.
-    #
+        ARRAY nodes are either decoded from their text (see array_payloads.decode_text_array),
+        from their base64 encoded bytes (see array_payloads.decode_encoded_array),
+        or memory-mapped from an external file given by the src attribute, e.g.
+            <rates datatype="ARRAY" sep="," shape="2,2">1.0, 2.0,
+                                                        3.0, 4.0</rates>
+            <weights datatype="ARRAY" src="weights.npy"/>
+            <delays datatype="ARRAY" src="delays.bin" dtype="float32" shape="1000,1000"/>
 
-    def __init__(self, input_xml_path_filename=None, logger=None):
+        Models, DICT, LIST and TUPLE nodes could be nested at any depth, e.g.
+            <neurons model="iaf_psc_alpha">
+                <synapses datatype="LIST">
+                    <synapse datatype="DICT"><weight datatype="FLOAT">1.5</weight></synapse>
+                </synapses>
+            </neurons>
+
+        In lazy mode, the byte offsets of the top-level parameters are indexed first, and each
+        parameter is decoded from its own bytes when its attribute is first accessed.
+    """
+
+    def __init__(self, input_xml_path_filename=None, logger=None, use_cache=False, cache_directory=None,
+                 use_shared_memory=False, lazy=False):
+        """
+        :param input_xml_path_filename: The scientific parameters XML file
+        :param logger: Logger, optional
+        :param use_cache: Whether the parsed dictionary is loaded from (or stored into) a sidecar cache,
+                          see parameters_cache.ParametersCache
+        :param cache_directory: Where the cache files are placed, the XML file directory by default
+        :param use_shared_memory: Whether the arrays are shared (read-only) by the processes of the node
+                                  loading the same XML file, see parameters_shared_memory
+        :param lazy: Whether each top-level parameter is decoded when its attribute is first accessed,
+                     instead of parsing the whole XML file up front, see parameters_index.ParametersIndex.
+                     Ignored when use_cache or use_shared_memory is set
+        """
         self.__dictionary_labels_list = ['DICT', 'DICTIONARY']
         self.__array_labels_list = ['ARR', 'ARRAY']  # numpy.array
         self.__convert_xml_node_text_to_datatype = ConvertXmlNodeTextToDatatype()
         self.__params_dict = None
         self.__input_xml_path_filename = input_xml_path_filename
+        # relative src attributes of the ARRAY nodes are taken from the XML file location
+        self.__xml_base_path = os.path.dirname(os.path.abspath(input_xml_path_filename)) \
+            if isinstance(input_xml_path_filename, str) else None
         self.__logger = logger
-        self.__parse_xml_and_create_dict()
+        self.__parameters_index = None
+        if lazy and not (use_cache or use_shared_memory):
+            self.__parameters_index = ParametersIndex(self.__input_xml_path_filename)
+            self.__params_dict = {}
+            # the class provides the parameters as attributes decoded on first access
+            self.__class__ = _get_lazy_parser_type(tuple(self.__parameters_index.get_tags()))
+            return
+
+        if use_shared_memory:
+            self.__params_dict = parameters_shared_memory.load_shared_parameters(
+                self.__input_xml_path_filename,
+                parse_function=lambda: self.__load_params_dict(use_cache, cache_directory),
+                logger=self.__logger)
+        else:
+            self.__load_params_dict(use_cache, cache_directory)
         self.__create_attributes_from_dict()
 
+    def __load_params_dict(self, use_cache, cache_directory):
+        """
+            Fills up the attributes' dictionary, either by parsing the XML file or from the cache
+        :return:
+            The attributes' dictionary
+        """
+        if use_cache:
+            self.__load_or_parse_with_cache(cache_directory)
+        else:
+            self.__parse_xml_and_create_dict()
+        return self.__params_dict
+
+    def __load_or_parse_with_cache(self, cache_directory):
+        """
+            Loads the attributes' dictionary from the cache when the XML file has not changed,
+            otherwise, parses the XML file and stores the dictionary into the cache
+        :return:
+        """
+        parameters_cache = ParametersCache(self.__input_xml_path_filename, cache_directory=cache_directory)
+        self.__params_dict = parameters_cache.load()
+        if self.__params_dict is not None:
+            return
+
+        self.__parse_xml_and_create_dict()
+        if not parameters_cache.store(self.__params_dict) and self.__logger:
+            self.__logger.warning('{} cannot be written'.format(parameters_cache.get_metadata_path_filename()))
+
     def __create_attributes_from_dict(self):
         """
             Creates the class (object) attributes from the dictionary,
@@ -84,93 +310,237 @@ class Xml2ClassParser:
         for key in self.__params_dict:
             setattr(self, key, self.__params_dict[key])
 
-    def __parse_xml_and_create_dict(self):
+    def __iterparse_releasing_elements(self, source):
         """
-            Fills up the attributes' dictionary by parsing the parameters XML file
+            Streams the parsing events of the XML file, the subtree of each element
+            is released as soon as its 'end' event has been processed, hence only the
+            extracted values are kept in memory instead of the whole XML tree
         :return:
+            Generator of (event, node) tuples, as iterparse yields them
         """
-        self.__params_dict = {}
-        model_dict = {}
-        dictionary_dict = {}
-
-        processing_model = False
-        processing_dictionary = False
-        processing_element = False
+        open_elements_stack = []
         for (event, node) in iterparse(
-                source=self.__input_xml_path_filename,
+                source=source,
                 events=['start', 'end'],
         ):
+            if event == 'start':
+                open_elements_stack.append(node)
+                yield event, node
+                continue
+
+            open_elements_stack.pop()
+            yield event, node
+            # the node has been processed when the next event is requested
+            node.clear()
+            if open_elements_stack:
+                # NOTE: the previous siblings were already removed, i.e. the node is the first child
+                open_elements_stack[-1].remove(node)
+
+    def __new_container(self, node):
+        """
+            Creates the value filled up by the sub-elements of the node, if any
+        :return:
+            A tuple (container, sequence type):
+                (dictionary, None) for models and DICT nodes,
+                (list, list or tuple) for LIST and TUPLE nodes,
+                (None, None) otherwise
+        """
+        model_name = node.attrib.get('model')
+        if model_name:
+            return {'model': model_name}, None  # NOTE: model_name contains the name of the model per se
+
+        datatype = node.attrib.get('datatype')
+        if datatype:
+            if datatype.upper() in self.__dictionary_labels_list:
+                return {}, None
+            sequence_type = self.__convert_xml_node_text_to_datatype.get_sequence_type(datatype)
+            if sequence_type is not None:
+                return [], sequence_type
+        return None, None
+
+    def __convert_array_node(self, node):
+        """
+            Loads the numpy array of an ARRAY node
+        :return:
+            numpy array
+        """
+        array_dtype = node.attrib.get('dtype')
+        array_shape = array_payloads.parse_shape(node.attrib.get('shape'))
+        array_order = node.attrib.get('order', 'C')
+        array_source = node.attrib.get('src')
+        if array_source:
+            # external payload (.npy or raw binary file), memory-mapped read-only
+            return array_payloads.load_external_array(
+                array_source,
+                dtype=array_dtype,
+                shape=array_shape,
+                offset=int(node.attrib.get('offset', 0)),
+                order=array_order,
+                base_path=self.__xml_base_path)
+
+        if node.attrib.get('encoding'):
+            # binary payload, base64 encoded and optionally compressed
+            return array_payloads.decode_encoded_array(
+                node.text,
+                encoding=node.attrib.get('encoding'),
+                compression=node.attrib.get('compression'),
+                dtype=array_dtype,
+                shape=array_shape,
+                order=array_order)
+
+        # default dtype float64
+        return array_payloads.decode_text_array(
+            node.text,
+            sep=node.attrib.get('sep'),
+            dtype=array_dtype,
+            shape=array_shape,
+            order=array_order)
+
+    def __parse_xml_and_create_dict(self):
+        """
+            Fills up the attributes' dictionary by parsing the parameters XML file
+        :return:
+        """
+        self.__params_dict = self.__build_params_dict(self.__input_xml_path_filename)
+
+    def __build_params_dict(self, source):
+        """
+            Builds the attributes' dictionary by parsing the parameters XML source,
+            each element is handled once, when its 'start' and 'end' events are streamed:
+
+                - models, DICT, LIST and TUPLE nodes are containers (dictionaries or lists) pushed
+                  on a stack, hence they could be nested at any depth
+                - ARRAY nodes are converted and placed into the innermost container
+                - consecutive scalar siblings of the same datatype are converted at once,
+                  before anything else is placed into their container
+                - unknown datatypes raise XmlDatatypeError
+                - the elements having neither datatype nor model (e.g. the root) are transparent,
+                  their sub-elements are placed into the innermost container
+        :param source: The XML file PATH+FILENAME, or a file object
+        :return:
+            The attributes' dictionary
+        """
+        params_dict = {}
+        # containers being filled up, the innermost one on top
+        containers_stack = [params_dict]
+        # for each open element, whether it pushed a container and its sequence type (if any)
+        open_elements_stack = []
+        scalar_siblings_batch = _ScalarSiblingsBatch()
+        for (event, node) in self.__iterparse_releasing_elements(source):
 
             if event == 'start':
+                container, sequence_type = self.__new_container(node)
+                if container is not None:
+                    containers_stack.append(container)
+                open_elements_stack.append((container is not None, sequence_type))
+                continue
 
-                is_model = node.attrib.get('model')
-                if is_model:
-                    processing_model = True
-                    # model_element_id = id(node)
-                    model_dict = {'model': is_model}  # NOTE: is_model contains the name of the model per se
+            # end event
+            is_container, sequence_type = open_elements_stack.pop()
+            if is_container:
+                # the scalars of the container are placed before it is closed
+                scalar_siblings_batch.flush(self.__convert_xml_node_text_to_datatype)
+                value = containers_stack.pop()
+                if sequence_type is not None:
+                    if not value and (node.text or '').strip():
+                        # homogeneous sequence written as text
+                        value = self.__convert_xml_node_text_to_datatype.sequence_text_to_datatype(
+                            node, sequence_type)
+                    elif sequence_type is tuple:
+                        value = tuple(value)
+            else:
+                datatype = node.attrib.get('datatype')
+                if not datatype:
                     continue
 
-                has_datatype = node.attrib.get('datatype')
-                if not has_datatype:
-                    pass
-                else:
-                    if has_datatype.upper() in self.__dictionary_labels_list:
-                        processing_dictionary = True
-                        dictionary_dict = {}
-                    elif has_datatype.upper() in self.__array_labels_list:
-                        processing_array = True
-                        #  numpy_array = np.empty([1])
-                    processing_element = True
+                bulk_converter = self.__convert_xml_node_text_to_datatype.get_bulk_converter(datatype)
+                if bulk_converter is not None:
+                    # scalar, converted together with its consecutive siblings of the same datatype
+                    container = containers_stack[-1]
+                    if not scalar_siblings_batch.is_continued_by(container, bulk_converter):
+                        scalar_siblings_batch.flush(self.__convert_xml_node_text_to_datatype)
+                        scalar_siblings_batch.start(container, bulk_converter)
+                    scalar_siblings_batch.node_tags.append(node.tag)
+                    scalar_siblings_batch.texts.append(node.text)
                     continue
 
-            if event == 'end':
-                is_model = node.attrib.get('model')
-                if is_model:
-                    # all elements will be added as a dictionary
-                    self.__params_dict[node.tag] = model_dict
-                    processing_model = False
-                    continue
+                if not datatype.upper() in self.__array_labels_list:
+                    raise exceptions.XmlDatatypeError(node.tag, 'unknown datatype {}'.format(datatype))
+                value = self.__convert_array_node(node)
+
+            # assigning the value to the proper "level", after the scalars preceding it
+            scalar_siblings_batch.flush(self.__convert_xml_node_text_to_datatype)
+            container = containers_stack[-1]
+            if isinstance(container, list):
+                container.append(value)
+            else:
+                container[node.tag] = value
 
-                has_datatype = node.attrib.get('datatype')
-                if has_datatype:
-                    if has_datatype.upper() in self.__dictionary_labels_list:
-                        processing_dictionary = False
-                        if processing_model:
-                            model_dict[node.tag] = dictionary_dict
-                            continue
-                        self.__params_dict[node.tag] = dictionary_dict
-                        continue
-                    elif has_datatype.upper() in self.__array_labels_list:
-                        processing_array = False
-                        array_sep = node.attrib.get('sep')
-                        array_dtype = node.attrib.get('dtype')
-                        if array_dtype:
-                            tmp_np_array = np.fromstring(node.text, sep=array_sep, dtype=array_dtype)
-                        else:
-                            # default dtype float64
-                            tmp_np_array = np.fromstring(node.text, sep=array_sep, dtype='float')
-
-                        # assigning the numpy array to the proper "level"
-                        if processing_model:
-                            model_dict[node.tag] = tmp_np_array
-                            continue
-                        self.__params_dict[node.tag] = tmp_np_array
-                        continue
-
-                # individual element
-                if processing_element:
-                    processing_element = False
-                    if processing_dictionary:
-                        dictionary_dict[node.tag] = self.__convert_xml_node_text_to_datatype.node_text_to_datatype(
-                            node=node)
-                        continue
-
-                    if processing_model:
-                        model_dict[node.tag] = self.__convert_xml_node_text_to_datatype.node_text_to_datatype(node=node)
-                        continue
-
-                    self.__params_dict[node.tag] = self.__convert_xml_node_text_to_datatype.node_text_to_datatype(
-                        node=node)
+        scalar_siblings_batch.flush(self.__convert_xml_node_text_to_datatype)
+        return params_dict
+
+    def get_parameter(self, tag):
+        """
+            Gets a top-level parameter, in lazy mode it is decoded from its own bytes on first request
+
+        :param tag: The parameter tag, i.e. the attribute name
+        :return:
+            The parameter value
+        """
+        if self.__parameters_index is not None and tag not in self.__params_dict:
+            fragment = self.__parameters_index.read_fragment(tag)
+            self.__params_dict.update(self.__build_params_dict(io.BytesIO(fragment)))
+        return self.__params_dict[tag]
 
     def get_parameters_dict(self):
+        if self.__parameters_index is not None:
+            # lazy mode, the parameters not decoded yet are decoded, following the file order
+            self.__params_dict = {tag: self.get_parameter(tag) for tag in self.__parameters_index.get_tags()}
         return self.__params_dict
+
+    def get_parameters_object(self, type_name=parameters_types.PARAMETERS_TYPE_NAME):
+        """
+            Gets the parameters as an immutable typed object, whose type is generated once per
+            parameters schema (see parameters_types), instead of the dynamic attributes of this parser
+
+        :param type_name: Name of the generated type
+        :return:
+            Instance of a frozen dataclass with __slots__, the models are nested instances
+        """
+        return parameters_types.create_parameters_object(self.get_parameters_dict(), type_name=type_name)
+
+
+class _LazyParameter(object):
+    """
+        Non-data descriptor decoding a top-level parameter on first access, the value is then
+        stored in the instance dictionary, which takes precedence over the descriptor afterwards
+    """
+
+    def __init__(self, tag):
+        self.__tag = tag
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.get_parameter(self.__tag)
+        instance.__dict__[self.__tag] = value
+        return value
+
+
+# lazy parser types by tuple of parameter tags
+_lazy_parser_types_dict = {}
+_lazy_parser_types_lock = threading.Lock()
+
+
+def _get_lazy_parser_type(tags):
+    """
+    :return: Subclass of Xml2ClassParser providing the parameters as _LazyParameter attributes
+    """
+    try:
+        return _lazy_parser_types_dict[tags]
+    except KeyError:
+        pass
+
+    lazy_parser_type = type('LazyXml2ClassParser', (Xml2ClassParser,), {tag: _LazyParameter(tag) for tag in tags})
+    with _lazy_parser_types_lock:
+        return _lazy_parser_types_dict.setdefault(tags, lazy_parser_type)
@@ -0,0 +1,136 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+from xml.etree import ElementTree
+
+import numpy as np
+
+# Co-Sim's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import array_payloads
+
+# Tag of the items of the LIST and TUPLE nodes, the parser ignores it
+LIST_ITEM_TAG = 'item'
+
+# dtype kinds written as separated values (booleans as 0 and 1), e.g. not the strings
+_TEXT_DTYPE_KINDS = 'biufc'
+
+
+def array_to_xml_element(tag, array, encoding=array_payloads.BASE64_ENCODING, compression=None):
+    """
+        Creates the ARRAY node of a numpy array, as Xml2ClassParser loads it
+
+    :param tag: The node tag, i.e. the attribute name
+    :param array: numpy array
+    :param encoding: base64 (binary payload), None for whitespace-separated text,
+                     the non-numeric arrays (e.g. strings) are always base64 encoded
+    :param compression: See array_payloads.COMPRESSIONS_DICT, None for no compression
+    :return:
+        ElementTree.Element
+
+    :raises TypeError: The array holds Python objects
+    """
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        raise TypeError('{}: arrays of Python objects are not supported'.format(tag))
+    if not encoding and array.dtype.kind not in _TEXT_DTYPE_KINDS:
+        encoding = array_payloads.BASE64_ENCODING
+
+    xml_element = ElementTree.Element(tag, datatype='ARRAY')
+    if encoding:
+        # explicit byte order, hence the file can be read on any platform
+        xml_element.set('dtype', array.dtype.str)
+        xml_element.set('encoding', encoding)
+        if compression:
+            xml_element.set('compression', compression)
+        xml_element.text = array_payloads.encode_array(array, compression=compression)
+    else:
+        xml_element.set('dtype', array.dtype.name)
+        xml_element.set('sep', ' ')
+        if array.dtype.kind == 'b':
+            # the parser reads the booleans as integers
+            array = array.astype(np.int8)
+        xml_element.text = ' '.join(str(value) for value in array.ravel())
+    if not array.ndim == 1:
+        xml_element.set('shape', ','.join(str(dimension) for dimension in array.shape))
+    return xml_element
+
+
+def _scalar_to_xml_element(tag, value):
+    if isinstance(value, (bool, np.bool_)):
+        datatype, text = 'BOOL', str(bool(value)).lower()
+    elif isinstance(value, (int, np.integer)):
+        datatype, text = 'INT', str(value)
+    elif isinstance(value, (float, np.floating)):
+        datatype, text = 'FLOAT', repr(float(value))
+    elif isinstance(value, (complex, np.complexfloating)):
+        datatype, text = 'COMPLEX', repr(complex(value)).strip('()')
+    elif isinstance(value, str):
+        if not value:
+            # NOTE: an empty STR node is read as None
+            raise TypeError('{}: empty strings cannot be read back'.format(tag))
+        datatype, text = 'STR', value
+    else:
+        raise TypeError('{}: {} values are not supported'.format(tag, type(value).__name__))
+    xml_element = ElementTree.Element(tag, datatype=datatype)
+    xml_element.text = text
+    return xml_element
+
+
+def _value_to_xml_element(tag, value, encoding, compression):
+    if isinstance(value, np.ndarray):
+        return array_to_xml_element(tag, value, encoding=encoding, compression=compression)
+
+    if isinstance(value, dict):
+        if 'model' in value:
+            # model node, its values are nested elements
+            xml_element = ElementTree.Element(tag, model=value['model'])
+            items = ((key, item) for key, item in value.items() if not key == 'model')
+            for key, item in items:
+                xml_element.append(_value_to_xml_element(key, item, encoding, compression))
+            return xml_element
+
+        xml_element = ElementTree.Element(tag, datatype='DICT')
+        for key, item in value.items():
+            xml_element.append(_value_to_xml_element(key, item, encoding, compression))
+        return xml_element
+
+    if isinstance(value, (list, tuple)):
+        xml_element = ElementTree.Element(tag, datatype='LIST' if isinstance(value, list) else 'TUPLE')
+        for item in value:
+            xml_element.append(_value_to_xml_element(LIST_ITEM_TAG, item, encoding, compression))
+        return xml_element
+
+    return _scalar_to_xml_element(tag, value)
+
+
+def write_parameters_xml(xml_path_filename, params_dict, root_tag='parameters',
+                         encoding=array_payloads.BASE64_ENCODING, compression=None):
+    """
+        Writes a scientific parameters XML file to be loaded by Xml2ClassParser,
+        i.e. Xml2ClassParser(xml_path_filename).get_parameters_dict() == params_dict
+
+    :param xml_path_filename: The XML file to be written
+    :param params_dict: Dictionary containing numpy arrays, int, float, bool, complex or str values,
+                        and (nested) lists, tuples, dictionaries and models, i.e. dictionaries
+                        having a 'model' key with the model name
+    :param root_tag: The root tag of the XML file
+    :param encoding: base64 (binary payload), None for whitespace-separated text
+    :param compression: See array_payloads.COMPRESSIONS_DICT, None for no compression
+
+    :raises TypeError: A value would not be read back as it is, e.g. an empty string
+    """
+    root = ElementTree.Element(root_tag)
+    for key, value in params_dict.items():
+        root.append(_value_to_xml_element(key, value, encoding, compression))
+    ElementTree.indent(root)
+    ElementTree.ElementTree(root).write(xml_path_filename, encoding='utf-8', xml_declaration=True)
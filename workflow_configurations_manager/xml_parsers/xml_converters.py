@@ -0,0 +1,206 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import re
+import threading
+from xml.etree import ElementTree
+
+# Co-Simulator's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_schemas
+from EBRAINS_ConfigManager.global_configurations_manager.xml_parsers.xml_parser import Parser
+
+
+_generic_parser = Parser()
+
+
+def convert_generically(xml_element):
+    """
+        Generic conversion of an element into a dictionary, i.e. Parser.convert_xml2dict
+    """
+    return _generic_parser.convert_xml2dict(xml_element)
+
+
+def convert_child_generically(xml_child):
+    """
+        Generic conversion of an element as a child of another one, i.e. the value
+        that Parser.convert_xml2dict would assign to its tag in the parent dictionary
+    """
+    wrapper = ElementTree.Element('wrapper')
+    wrapper.append(xml_child)
+    return _generic_parser.convert_xml2dict(wrapper)[xml_child.tag]
+
+
+class _ConverterSourceGenerator(object):
+    """
+        Generates the source code of straight-line converters from a schema (see xml_schema),
+        one function per schema element with children.
+
+        The generated converters return the same dictionaries as Parser.convert_xml2dict does,
+        nonetheless, the repeated-tag and attribute heuristics are only checked where the schema
+        expects nested elements. Any element not following the schema is converted generically.
+    """
+
+    def __init__(self):
+        self.__functions_sources = []
+        self.__namespace = {'convert_generically': convert_generically,
+                            'convert_child_generically': convert_child_generically}
+        self.__counter = 0
+
+    def __new_name(self, prefix):
+        self.__counter += 1
+        return '{}_{}'.format(prefix, self.__counter)
+
+    def __child_assignment_lines(self, child_schema, indentation):
+        """
+        :return: Source lines assigning the converted child (xml_child) to result[tag]
+        """
+        if not child_schema.children:
+            # leaf element, or any content (e.g. <deployment_settings>)
+            return [indentation + 'if len(xml_child) or xml_child.attrib:',
+                    indentation + '    result[tag] = convert_child_generically(xml_child)',
+                    indentation + 'else:',
+                    indentation + '    result[tag] = xml_child.text']
+
+        function_name = self.generate_function(child_schema)
+        return [indentation + 'if len(xml_child) and (len(xml_child) == 1 or not xml_child[0].tag == xml_child[1].tag):',
+                indentation + '    result[tag] = {}(xml_child)'.format(function_name),
+                indentation + 'else:',
+                indentation + '    result[tag] = convert_child_generically(xml_child)']
+
+    def generate_function(self, schema_element):
+        """
+        :return: The name of the generated function converting elements described by schema_element
+        """
+        function_name = self.__new_name('convert_entry' if schema_element.tag_is_pattern
+                                        else 'convert_' + schema_element.tag)
+
+        lines = ['def {}(xml_element):'.format(function_name),
+                 '    if not len(xml_element) or xml_element.attrib:',
+                 '        return convert_generically(xml_element)',
+                 '    result = {}',
+                 '    for xml_child in xml_element:',
+                 '        tag = xml_child.tag']
+
+        keyword = 'if'
+        for child_schema in schema_element.children:
+            if child_schema.tag_is_pattern:
+                continue
+            lines.append('        {} tag == {!r}:'.format(keyword, child_schema.tag))
+            lines.extend(self.__child_assignment_lines(child_schema, ' ' * 12))
+            keyword = 'elif'
+
+        any_entry_schema = None
+        for child_schema in schema_element.children:
+            if not child_schema.tag_is_pattern:
+                continue
+            if child_schema.tag == xml_schemas.ANY_ENTRY_TAG:
+                # it matches any tag, hence no regular expression is evaluated
+                any_entry_schema = child_schema
+                break
+            pattern_name = self.__new_name('match_pattern')
+            self.__namespace[pattern_name] = re.compile(child_schema.tag).fullmatch
+            lines.append('        {} {}(tag):'.format(keyword, pattern_name))
+            lines.extend(self.__child_assignment_lines(child_schema, ' ' * 12))
+            keyword = 'elif'
+
+        if keyword == 'if':
+            indentation = ' ' * 8
+        else:
+            lines.append('        else:')
+            indentation = ' ' * 12
+
+        if any_entry_schema is None:
+            lines.append(indentation + 'result[tag] = convert_child_generically(xml_child)')
+        else:
+            lines.extend(self.__child_assignment_lines(any_entry_schema, indentation))
+        lines.append('    return result')
+
+        self.__functions_sources.append('\n'.join(lines))
+        return function_name
+
+    def get_source(self):
+        return '\n\n\n'.join(self.__functions_sources) + '\n'
+
+    def get_namespace(self):
+        return self.__namespace
+
+
+def generate_converter(schema_element):
+    """
+        Generates and compiles a specialized converter for the XML elements described by the schema
+
+    :param schema_element: xml_schema.SchemaElement describing the component element
+    :return:
+        A tuple (converter function (xml_element) -> dictionary, generated source code)
+    """
+    generator = _ConverterSourceGenerator()
+    function_name = generator.generate_function(schema_element)
+    source = generator.get_source()
+
+    namespace = generator.get_namespace()
+    exec(compile(source, '<converter of {}>'.format(schema_element.tag), 'exec'), namespace)
+    return namespace[function_name], source
+
+
+# converters by component (root) tag, either registered or generated on demand from xml_schemas
+_converters_dict = {}
+_converters_lock = threading.Lock()
+
+
+def register_converter(component_xml_tag, converter):
+    """
+        Registers the converter to be used by XmlManager.load_xml_into_dict for a kind of XML file
+
+    :param component_xml_tag: The component (root) tag of the XML file, e.g. co_simulation_action
+    :param converter: Function (xml_element) -> dictionary, None to use the generic converter
+    """
+    with _converters_lock:
+        _converters_dict[component_xml_tag] = converter
+
+
+def get_converter(component_xml_tag):
+    """
+    :param component_xml_tag: The component (root) tag of the XML file, e.g. co_simulation_action
+    :return:
+        The converter registered for the tag, the one generated from its schema otherwise,
+        None when there is no schema for the tag, i.e. the generic converter should be used
+    """
+    try:
+        return _converters_dict[component_xml_tag]
+    except KeyError:
+        pass
+
+    try:
+        schema_element = xml_schemas.CO_SIM_SCHEMAS_DICT[component_xml_tag]
+    except KeyError:
+        converter = None
+    else:
+        converter, _ = generate_converter(schema_element)
+
+    with _converters_lock:
+        return _converters_dict.setdefault(component_xml_tag, converter)
+
+
+def convert_xml2dict(xml_element):
+    """
+        Converts the component element of a Co-Simulation XML file into a dictionary,
+        by means of its specialized converter if any, the generic one otherwise
+
+    :param xml_element: The component element, e.g. <co_simulation_action_plan>
+    :return:
+        Dictionary, as Parser.convert_xml2dict returns
+    """
+    converter = get_converter(xml_element.tag)
+    if converter is None:
+        return convert_generically(xml_element)
+    return converter(xml_element)
@@ -19,6 +19,11 @@ from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import en
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import utils
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
 from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import exceptions
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_converters
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_schemas
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.environment_snapshot import EnvironmentSnapshot
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_schema import DIAGNOSTIC_VALUE
+from EBRAINS_ConfigManager.global_configurations_manager.xml_parsers.xml_parser import Parser
 
 
 class XmlManager(object):
@@ -26,14 +31,27 @@ class XmlManager(object):
         Template for XML managers
     """
 
-    def __init__(self, log_settings, configurations_manager, xml_filename, name):
+    def __init__(self, log_settings, configurations_manager, xml_filename, name, environment_snapshot=None,
+                 logger=None):
         # getting objects referenced provided when the instance object is created
         self._log_settings = log_settings
         self._configurations_manager = configurations_manager
-        self._logger = self._configurations_manager.load_log_configurations(
-            name=name,
-            log_configurations=self._log_settings)
+        # an already configured logger could be passed, e.g. when several managers share it
+        if logger is None:
+            logger = self._configurations_manager.load_log_configurations(
+                name=name,
+                log_configurations=self._log_settings)
+        self._logger = logger
         self._xml_filename = xml_filename
+        # environment variables used to resolve the ${ENV_VAR} references,
+        # it should be shared by all the XML managers of the same dissection
+        # (see VariablesManager.get_environment_snapshot)
+        if environment_snapshot is None:
+            environment_snapshot = EnvironmentSnapshot()
+        elif not isinstance(environment_snapshot, EnvironmentSnapshot):
+            raise TypeError('{}: environment_snapshot must be an EnvironmentSnapshot, not {}'.format(
+                name, type(environment_snapshot).__name__))
+        self._environment_snapshot = environment_snapshot
 
         # attributes to be set on sub-classes
         self._component_xml_tag = ''  # e.g. co_simulation_action_plan, co_simulation_parameters
@@ -44,6 +62,24 @@ class XmlManager(object):
         self._parameters_dict = {}
         self._variables_dict = {}
         self._whole_xml_dict = {}
+        # problems found validating the XML file against the schema of its kind (see xml_schemas)
+        self._diagnostics = []
+
+    def reset(self, xml_filename):
+        """
+            Gets the XML manager ready to dissect another XML file of the same kind,
+            discarding the state of the previous dissection, hence the same instance
+            could be reused without setting up again the logger or the environment snapshot
+
+        :param xml_filename: The XML PATH+FILENAME to be dissected next
+        """
+        self._xml_filename = xml_filename
+
+        self._main_xml_sections_dicts_dict = {}
+        self._parameters_dict = {}
+        self._variables_dict = {}
+        self._whole_xml_dict = {}
+        self._diagnostics = []
 
     def initialize_xml_elements(self):
         # proper initialization must be implemented in the sub-class
@@ -67,10 +103,21 @@ class XmlManager(object):
             self._logger.error('{} cannot be open, check access permissions'.format(self._xml_filename))
             return enums.XmlManagerReturnCodes.XML_FILE_ACCESS_ERROR
 
+        self._diagnostics = []
+        converter = xml_converters.get_converter(self._component_xml_tag)
         try:
-            self._whole_xml_dict = self._configurations_manager.get_configuration_settings(
-                configuration_file=self._xml_filename,
-                component=self._component_xml_tag)
+            if converter is None:
+                self._whole_xml_dict = self._configurations_manager.get_configuration_settings(
+                    configuration_file=self._xml_filename,
+                    component=self._component_xml_tag)
+            else:
+                # specialized converter generated from the schema of the XML file
+                component_xml = Parser().load_xml(self._xml_filename).getroot().find(self._component_xml_tag)
+                if component_xml is None:
+                    raise LookupError("configuration settings not found!", self._component_xml_tag)
+                # validated while the elements are at hand, the file is loaded only once
+                self._diagnostics = xml_schemas.validate_component(component_xml, self._xml_filename)
+                self._whole_xml_dict = converter(component_xml)
         except xml.etree.ElementTree.ParseError:
             self._logger.error('{} cannot be loaded, check the XML format'.format(self._xml_filename))
             return enums.XmlManagerReturnCodes.XML_FORMAT_ERROR
@@ -83,6 +130,25 @@ class XmlManager(object):
 
         return enums.XmlManagerReturnCodes.XML_OK
 
+    def _report_diagnostics(self):
+        """
+            Logs every problem found validating the XML file against the schema of its kind,
+            instead of stopping at the first one, e.g. to report all of them to the end-user at once
+
+        :return:
+            XML_TAG_ERROR: Missing or unexpected elements
+            XML_VALUE_ERROR: The elements are in place but some values are wrong
+            XML_OK: No problem was found (or there is no schema for this kind of XML file)
+        """
+        for diagnostic in self._diagnostics:
+            self._logger.error('{}:{} {}'.format(diagnostic.xml_filename, diagnostic.element_path, diagnostic.message))
+
+        if not self._diagnostics:
+            return enums.XmlManagerReturnCodes.XML_OK
+        if all(diagnostic.kind == DIAGNOSTIC_VALUE for diagnostic in self._diagnostics):
+            return enums.XmlManagerReturnCodes.XML_VALUE_ERROR
+        return enums.XmlManagerReturnCodes.XML_TAG_ERROR
+
     def split_whole_xml_dict_into_dict_by_sections(self):
         """
             Creates a dictionary of dictionaries based on the main elements
@@ -238,7 +304,8 @@ class XmlManager(object):
 
             try:
                 runtime_variable_value = utils.transform_environment_variables_into_values(
-                    functional_variable_value=functional_variable_value)
+                    functional_variable_value=functional_variable_value,
+                    environment=self._environment_snapshot)
                 # replacing the run-time value of the variable after having been transformed
                 input_dictionary[key] = runtime_variable_value
             except exceptions.EnvironmentVariableNotSet as EnvironmentVariableNotSet:
@@ -273,6 +340,11 @@ class XmlManager(object):
         if not self.load_xml_into_dict() == enums.XmlManagerReturnCodes.XML_OK:
             return enums.XmlManagerReturnCodes.XML_FORMAT_ERROR
 
+        # Step 1.1 - Validating the XML file against the schema of its kind, all the problems are reported
+        return_value = self._report_diagnostics()
+        if not return_value == enums.XmlManagerReturnCodes.XML_OK:
+            return return_value
+
         # Step 2 - Splitting the whole dict into different dicts based on main tags, e.g. variables, parameters, etc
         if not self.split_whole_xml_dict_into_dict_by_sections() == enums.XmlManagerReturnCodes.XML_OK:
             return enums.XmlManagerReturnCodes.XML_TAG_ERROR
@@ -305,6 +377,22 @@ class XmlManager(object):
 
         return enums.XmlManagerReturnCodes.XML_OK
 
+    def get_diagnostics(self):
+        """
+            Getter of the problems found validating the XML file on the last dissection
+
+        :return: List of xml_schema.Diagnostic, empty when no problem was found
+        """
+        return self._diagnostics
+
+    def get_environment_snapshot(self):
+        """
+            Getter of the environment snapshot used to resolve the ${ENV_VAR} references
+
+        :return: _environment_snapshot
+        """
+        return self._environment_snapshot
+
     def get_parameters_dict(self):
         """
             Getter of the dictionary containing the Co-Simulation parameters loaded from the XML file
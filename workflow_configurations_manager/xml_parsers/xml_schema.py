@@ -0,0 +1,176 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import collections
+import re
+
+
+# Kinds of problem, i.e. the structure of the XML file (missing or unexpected elements) or the element values
+DIAGNOSTIC_TAG = 'tag'
+DIAGNOSTIC_VALUE = 'value'
+
+# Problem found validating an XML file
+# e.g. Diagnostic('plan.xml', '/co_simulation_action_plan/action_plan/action_004', 'missing <action_type>', 'tag')
+Diagnostic = collections.namedtuple('Diagnostic', ['xml_filename', 'element_path', 'message', 'kind'],
+                                    defaults=(DIAGNOSTIC_TAG,))
+
+
+class SchemaElement(object):
+    """
+        Declarative description of an XML element of the Co-Simulation XML files
+
+        :param tag: Element tag, or a regular expression when tag_is_pattern is True,
+                    e.g. r'action_\\d+' matching the <action_NNN> entries of the action plan
+        :param children: SchemaElement instances describing the expected sub-elements
+        :param required: Whether the element must be present in its parent. For patterns,
+                         at least one sub-element of the parent must match it
+        :param values: Allowed values of the element text, e.g. constants.CO_SIM_ACTION_TYPES_TUPLE
+        :param text_type: Callable to which the element text must be convertible, e.g. int
+        :param closed: Whether sub-elements not described by children are reported
+        :param variants: Tuple of (discriminating sub-element tag, value, tags of the sub-elements
+                         required when the discriminating sub-element has such value)
+    """
+    __slots__ = ('tag', 'tag_is_pattern', 'children', 'required', 'values', 'text_type', 'closed', 'variants')
+
+    def __init__(self, tag, children=(), required=True, values=None, text_type=None, closed=False, variants=(),
+                 tag_is_pattern=False):
+        self.tag = tag
+        self.tag_is_pattern = tag_is_pattern
+        self.children = tuple(children)
+        self.required = required
+        self.values = values
+        self.text_type = text_type
+        self.closed = closed
+        self.variants = tuple(variants)
+
+
+def element(tag, *children, **kwargs):
+    """
+    :return: SchemaElement describing an element with a fixed tag
+    """
+    return SchemaElement(tag, children=children, **kwargs)
+
+
+def entries(tag_pattern, *children, **kwargs):
+    """
+    :return: SchemaElement describing the (repeated) elements whose tag matches the regular expression,
+             e.g. the <var_NNN> entries of the <variables> section
+    """
+    return SchemaElement(tag_pattern, children=children, tag_is_pattern=True, **kwargs)
+
+
+def _compile_element(schema_element):
+    """
+        Compiles a schema element into a validation function, all the lookups are
+        prepared beforehand, hence the document is walked only once when it is validated
+
+    :return:
+        Function (xml_element, element_path, xml_filename, diagnostics) appending the
+        diagnostics found on the element and its sub-elements to the diagnostics list
+    """
+    fixed_validators = {}
+    pattern_validators = []
+    required_tags = []
+    # (regular expression match function, tag pattern) of the required patterns
+    required_patterns = []
+    for child in schema_element.children:
+        child_validator = _compile_element(child)
+        if child.tag_is_pattern:
+            pattern_match = re.compile(child.tag).fullmatch
+            pattern_validators.append((pattern_match, child_validator))
+            if child.required:
+                required_patterns.append((pattern_match, child.tag))
+        else:
+            fixed_validators[child.tag] = child_validator
+            if child.required:
+                required_tags.append(child.tag)
+
+    allowed_values = None if schema_element.values is None else frozenset(schema_element.values)
+    text_type = schema_element.text_type
+    closed = schema_element.closed
+    variants = schema_element.variants
+
+    def validate(xml_element, element_path, xml_filename, diagnostics):
+        if allowed_values is not None or text_type is not None:
+            text = (xml_element.text or '').strip()
+            if allowed_values is not None and text not in allowed_values:
+                diagnostics.append(Diagnostic(xml_filename, element_path,
+                                              'wrong value {!r}, expected one of {}'.format(
+                                                  text, sorted(allowed_values)),
+                                              DIAGNOSTIC_VALUE))
+            if text_type is not None:
+                try:
+                    text_type(text)
+                except ValueError:
+                    diagnostics.append(Diagnostic(xml_filename, element_path,
+                                                  'wrong value {!r}, {} expected'.format(text, text_type.__name__),
+                                                  DIAGNOSTIC_VALUE))
+
+        found_tags = {}
+        matched_patterns = set()
+        for xml_child in xml_element:
+            child_path = element_path + '/' + xml_child.tag
+            child_validator = fixed_validators.get(xml_child.tag)
+            if child_validator is None:
+                for pattern_match, pattern_validator in pattern_validators:
+                    if pattern_match(xml_child.tag):
+                        matched_patterns.add(pattern_match)
+                        child_validator = pattern_validator
+                        break
+            if child_validator is None:
+                if closed:
+                    diagnostics.append(Diagnostic(xml_filename, child_path, 'unexpected element'))
+                continue
+            found_tags[xml_child.tag] = (xml_child.text or '').strip()
+            child_validator(xml_child, child_path, xml_filename, diagnostics)
+
+        for required_tag in required_tags:
+            if required_tag not in found_tags:
+                diagnostics.append(Diagnostic(xml_filename, element_path,
+                                              'missing <{}>'.format(required_tag)))
+        for pattern_match, tag_pattern in required_patterns:
+            if pattern_match not in matched_patterns:
+                diagnostics.append(Diagnostic(xml_filename, element_path,
+                                              'missing an element matching <{}>'.format(tag_pattern)))
+
+        for discriminating_tag, discriminating_value, variant_required_tags in variants:
+            if found_tags.get(discriminating_tag) == discriminating_value:
+                for required_tag in variant_required_tags:
+                    if required_tag not in found_tags:
+                        diagnostics.append(Diagnostic(
+                            xml_filename, element_path,
+                            'missing <{}>, required when <{}> is {}'.format(required_tag,
+                                                                            discriminating_tag,
+                                                                            discriminating_value)))
+
+    return validate
+
+
+def compile_schema(root_schema_element):
+    """
+        Compiles a schema into a validator walking the whole XML document only once,
+        it is intended to be compiled once per kind of XML file and reused afterwards
+
+    :param root_schema_element: SchemaElement describing the component element,
+                                e.g. <co_simulation_action_plan>
+    :return:
+        Function (xml_element, xml_filename) returning the list of Diagnostic found
+    """
+    root_validator = _compile_element(root_schema_element)
+
+    def validator(xml_element, xml_filename):
+        diagnostics = []
+        root_validator(xml_element, '/' + xml_element.tag, xml_filename, diagnostics)
+        return diagnostics
+
+    return validator
@@ -0,0 +1,176 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2020 Forschungszentrum Jülich GmbH and Aix-Marseille Université
+# "Licensed to the Apache Software Foundation (ASF) under one or more contributor
+#  license agreements; and to You under the Apache License, Version 2.0. "
+#
+# Forschungszentrum Jülich
+#  Institute: Institute for Advanced Simulation (IAS)
+#    Section: Jülich Supercomputing Centre (JSC)
+#   Division: High Performance Computing in Neuroscience
+# Laboratory: Simulation Laboratory Neuroscience
+#       Team: Multi-scale Simulation and Design
+#
+# ------------------------------------------------------------------------------
+import threading
+
+# Co-Simulator's imports
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import constants
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers import xml_tags
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_schema import compile_schema
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_schema import element
+from EBRAINS_ConfigManager.workflow_configurations_manager.xml_parsers.xml_schema import entries
+
+# Tag of the entries of the sections, e.g. <var_000>, <action_004>, <argv_01>
+ANY_ENTRY_TAG = r'.+'
+
+# <title> and <description>, present in any Co-Simulation XML file
+_TITLE_SCHEMA = element(xml_tags.CO_SIM_XML_TITLE, required=False)
+_DESCRIPTION_SCHEMA = element(xml_tags.CO_SIM_XML_DESCRIPTION, required=False)
+
+# <variables><var_NNN><var_name/><var_value/></var_NNN></variables>
+_VARIABLES_SCHEMA = element(
+    xml_tags.CO_SIM_XML_VARIABLES,
+    entries(ANY_ENTRY_TAG,
+            element(xml_tags.CO_SIM_XML_VARIABLE_NAME),
+            element(xml_tags.CO_SIM_XML_VARIABLE_VALUE),
+            required=False))
+
+# <parameters><par_NNN><par_name/><par_value/></par_NNN></parameters>
+_PARAMETERS_SCHEMA = element(
+    xml_tags.CO_SIM_XML_PARAMETERS,
+    entries(ANY_ENTRY_TAG,
+            element(xml_tags.CO_SIM_XML_PARAMETER_NAME),
+            element(xml_tags.CO_SIM_XML_PARAMETER_VALUE),
+            required=False))
+
+# <argv_NN> entries of the Popen arguments
+_ARGUMENTS_ENTRIES_SCHEMA = entries(ANY_ENTRY_TAG, required=False)
+
+CO_SIM_ACTION_PLAN_SCHEMA = element(
+    xml_tags.CO_SIM_XML_PLAN_ROOT_TAG,
+    _TITLE_SCHEMA,
+    _DESCRIPTION_SCHEMA,
+    _VARIABLES_SCHEMA,
+    _PARAMETERS_SCHEMA,
+    element(xml_tags.CO_SIM_XML_PLAN_ARRANGEMENT,
+            entries(ANY_ENTRY_TAG,
+                    element(xml_tags.CO_SIM_XML_ARRANGEMENT_DUTY, values=constants.CO_SIM_ARRANGEMENT_DUTIES_TUPLE),
+                    element(xml_tags.CO_SIM_XML_ARRANGEMENT_WHAT),
+                    required=False)),
+    element(xml_tags.CO_SIM_XML_PLAN_ACTION_PLAN,
+            entries(ANY_ENTRY_TAG,
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE, values=constants.CO_SIM_ACTION_TYPES_TUPLE),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_GOAL, values=constants.CO_SIM_ACTION_GOALS_TUPLE,
+                            required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_LABEL, required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_XML, required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD,
+                            values=constants.CO_SIM_ACTION_LAUNCH_METHODS_TUPLE, required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_EVENT,
+                            values=constants.CO_SIM_ACTION_EVENTS_TUPLE, required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_NTASKS, text_type=int, required=False),
+                    element(xml_tags.CO_SIM_XML_PLAN_ACTION_CPUS_PER_TASK, text_type=int, required=False),
+                    required=False,
+                    variants=((xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE, constants.CO_SIM_ACTION,
+                               (xml_tags.CO_SIM_XML_PLAN_ACTION_XML, xml_tags.CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD)),
+                              (xml_tags.CO_SIM_XML_PLAN_ACTION_TYPE, constants.CO_SIM_EVENT,
+                               (xml_tags.CO_SIM_XML_PLAN_ACTION_EVENT,))))))
+
+CO_SIM_ACTION_SCHEMA = element(
+    xml_tags.CO_SIM_XML_ACTION_ROOT_TAG,
+    _TITLE_SCHEMA,
+    _DESCRIPTION_SCHEMA,
+    _VARIABLES_SCHEMA,
+    _PARAMETERS_SCHEMA,
+    element(xml_tags.CO_SIM_XML_ACTION,
+            element(xml_tags.CO_SIM_XML_ACTION_LAUNCHER,
+                    element(xml_tags.CO_SIM_XML_ACTION_LAUNCHER_COMMAND),
+                    element(xml_tags.CO_SIM_XML_ACTION_LAUNCHER_ARGUMENTS, _ARGUMENTS_ENTRIES_SCHEMA),
+                    closed=True),
+            element(xml_tags.CO_SIM_XML_ACTION_PERFORMER,
+                    element(xml_tags.CO_SIM_XML_ACTION_PERFORMER_BINARY),
+                    element(xml_tags.CO_SIM_XML_ACTION_PERFORMER_ARGUMENTS, _ARGUMENTS_ENTRIES_SCHEMA),
+                    closed=True),
+            element(xml_tags.CO_SIM_XML_ACTION_ROUTINE,
+                    element(xml_tags.CO_SIM_XML_ACTION_ROUTINE_CODE),
+                    element(xml_tags.CO_SIM_XML_ACTION_ROUTINE_ARGUMENTS, _ARGUMENTS_ENTRIES_SCHEMA),
+                    closed=True)))
+
+CO_SIM_PARAMETERS_SCHEMA = element(
+    xml_tags.CO_SIM_XML_CO_SIM_PARAMS_ROOT_TAG,
+    _TITLE_SCHEMA,
+    _DESCRIPTION_SCHEMA,
+    _VARIABLES_SCHEMA,
+    _PARAMETERS_SCHEMA,
+    element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_JSON_FILE,
+            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_FILENAME),
+            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_ROOT_OBJECT),
+            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_PAIRS,
+                    entries(ANY_ENTRY_TAG,
+                            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_PAIR_NAME),
+                            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_PAIR_VALUE),
+                            element(xml_tags.CO_SIM_XML_CO_SIM_PARAMS_PAIR_DATA_TYPE,
+                                    values=constants.CO_SIM_DATA_TYPES_TUPLE),
+                            required=False))))
+
+# e.g. <ORCHESTRATOR><MIN>59100</MIN><MAX>59120</MAX><MAX_TRIES>20</MAX_TRIES></ORCHESTRATOR>
+CO_SIM_COMM_SETTINGS_SCHEMA = element(
+    xml_tags.CO_SIM_XML_CO_SIM_COMM_SETTINGS_ROOT_TAG,
+    entries(ANY_ENTRY_TAG,
+            element('MIN', text_type=int),
+            element('MAX', text_type=int),
+            element('MAX_TRIES', text_type=int),
+            required=False))
+
+CO_SIM_SERVICES_DEPLOYMENT_SCHEMA = element(
+    xml_tags.CO_SIM_XML_CO_SIM_SERVICES_DEPLOYMENT_ROOT_TAG,
+    element(xml_tags.CO_SIM_XML_CO_SIM_SERVICES_DEPLOYMENT_SRUN_OPTIONS),
+    element(xml_tags.CO_SIM_XML_CO_SIM_SERVICES_DEPLOYMENT_SETTINGS))
+
+# Schema by component (root) tag
+CO_SIM_SCHEMAS_DICT = {
+    xml_tags.CO_SIM_XML_PLAN_ROOT_TAG: CO_SIM_ACTION_PLAN_SCHEMA,
+    xml_tags.CO_SIM_XML_ACTION_ROOT_TAG: CO_SIM_ACTION_SCHEMA,
+    xml_tags.CO_SIM_XML_CO_SIM_PARAMS_ROOT_TAG: CO_SIM_PARAMETERS_SCHEMA,
+    xml_tags.CO_SIM_XML_CO_SIM_COMM_SETTINGS_ROOT_TAG: CO_SIM_COMM_SETTINGS_SCHEMA,
+    xml_tags.CO_SIM_XML_CO_SIM_SERVICES_DEPLOYMENT_ROOT_TAG: CO_SIM_SERVICES_DEPLOYMENT_SCHEMA,
+}
+
+# validators compiled on demand, once per component tag
+_compiled_validators_dict = {}
+_compiled_validators_lock = threading.Lock()
+
+
+def get_validator(component_xml_tag):
+    """
+    :param component_xml_tag: The component (root) tag of the XML file, e.g. co_simulation_action_plan
+    :return:
+        The compiled validator (see xml_schema.compile_schema), None when there is no schema for the tag
+    """
+    try:
+        return _compiled_validators_dict[component_xml_tag]
+    except KeyError:
+        pass
+
+    try:
+        schema = CO_SIM_SCHEMAS_DICT[component_xml_tag]
+    except KeyError:
+        return None
+
+    with _compiled_validators_lock:
+        return _compiled_validators_dict.setdefault(component_xml_tag, compile_schema(schema))
+
+
+def validate_component(component_xml, xml_filename):
+    """
+        Validates an already loaded component element against the schema of its kind
+
+    :param component_xml: The component element, e.g. <co_simulation_action_plan>
+    :param xml_filename: The XML PATH+FILENAME, reported on the diagnostics
+    :return:
+        List of xml_schema.Diagnostic, empty when no problem was found or there is no schema for the tag
+    """
+    validator = get_validator(component_xml.tag)
+    if validator is None:
+        return []
+    return validator(component_xml, xml_filename)
@@ -40,6 +40,9 @@ CO_SIM_XML_PLAN_ACTION_REALM = 'action_realm'
 CO_SIM_XML_PLAN_ACTION_LABEL = 'action_label'
 CO_SIM_XML_PLAN_ACTION_XML = 'action_xml'
 CO_SIM_XML_PLAN_ACTION_LAUNCH_METHOD = 'action_launch_method'
+CO_SIM_XML_PLAN_ACTION_EVENT = 'action_event'
+CO_SIM_XML_PLAN_ACTION_NTASKS = 'action_ntasks'
+CO_SIM_XML_PLAN_ACTION_CPUS_PER_TASK = 'action_cpus_per_task'
 
 # XML Tags used to parse Actions XML Files
 CO_SIM_XML_ACTION_ROOT_TAG = 'co_simulation_action'